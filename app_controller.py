@@ -2,6 +2,7 @@ import sys
 import os
 import ctypes
 import traceback
+import multiprocessing
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtGui import QFont, QIcon
 from PyQt6.QtCore import QSharedMemory, QSettings, QObject, QEvent
@@ -106,4 +107,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # 打包后的程序中体检报告解析进程池需要此调用
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
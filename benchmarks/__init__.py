@@ -0,0 +1 @@
+# 性能基准测试脚本（开发用，不随程序发布）
@@ -0,0 +1,253 @@
+"""CheckupReport分析器基准测试
+
+用report_generator生成模拟送测目录，逐阶段测量耗时、峰值RSS和文件吞吐量：
+目录索引、并行预解析、各分析器（在当前进程中解析）、失败用例索引、分片/重试合并，以及完整分析
+（ReportAnalyzer.run所执行的ReportAnalyzerCore.analyze，分别测冷缓存和热缓存）。
+每个阶段在独立子进程中运行，峰值RSS互不影响。
+
+用法（在仓库根目录执行）:
+    python -m benchmarks.bench_checkup_report [--modules 200] [--stage cv --stage other]
+    python -m benchmarks.bench_checkup_report --save baseline.json
+    python -m benchmarks.bench_checkup_report --compare baseline.json --tolerance 0.25
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import importlib
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.report_generator import generate_report_tree, add_generator_arguments, config_from_args
+
+
+def peak_rss_bytes():
+    """当前进程的峰值RSS（字节）"""
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux单位为KB，macOS为字节
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _windows_peak_rss():
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    ctypes.windll.psapi.GetProcessMemoryInfo(
+        ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+    return counters.PeakWorkingSetSize
+
+
+# ============================ 各阶段 ============================
+# 每个阶段函数返回处理的文件数
+
+def stage_index(root, workdir, parse_workers):
+    from pages.CheckupReport.ReportIndex import ReportIndex
+    return ReportIndex(root).file_count
+
+
+def stage_parse(root, workdir, parse_workers):
+    from pages.CheckupReport.ReportIndex import ReportIndex
+    from pages.CheckupReport.ReportAnalyzerCore import ReportAnalyzerCore
+    core = ReportAnalyzerCore(root, parse_workers=parse_workers, use_cache=False)
+    records = core.load_records(ReportIndex(root))
+    return len({path for _, path in records})
+
+
+def stage_apts(root, workdir, parse_workers):
+    from pages.CheckupReport.ReportIndex import ReportIndex, KIND_APTS_XML
+    from pages.CheckupReport.AptsReportAnalyzer import AptsReportAnalyzer
+    report_index = ReportIndex(root)
+    AptsReportAnalyzer().analyze_apts_reports(report_index, [], [])
+    return len(report_index.get_files(KIND_APTS_XML))
+
+
+def stage_cv(root, workdir, parse_workers):
+    from pages.CheckupReport.ReportIndex import ReportIndex, KIND_CV_XML
+    from pages.CheckupReport.CVReportAnalyzer import CVReportAnalyzer
+    report_index = ReportIndex(root)
+    CVReportAnalyzer().analyze_cv_reports(report_index, [], [])
+    return len(report_index.get_files(KIND_CV_XML))
+
+
+def stage_other(root, workdir, parse_workers):
+    from pages.CheckupReport.ReportIndex import ReportIndex, KIND_FAILURES_HTML
+    from pages.CheckupReport.OtherReportAnalyzer import OtherReportAnalyzer
+    report_index = ReportIndex(root)
+    OtherReportAnalyzer().analyze_other_reports(report_index, [], [])
+    return len(report_index.get_files(KIND_FAILURES_HTML))
+
+
+def stage_device_info(root, workdir, parse_workers):
+    from pages.CheckupReport.ReportIndex import ReportIndex
+    from pages.CheckupReport.ReportAnalyzerCore import ReportAnalyzerCore
+    report_index = ReportIndex(root)
+    core = ReportAnalyzerCore(root, use_cache=False)
+    core.extract_and_compare_cts_device_info_versions(report_index)
+    return len(core.get_cts_device_info_files(report_index)[1])
+
+
+def stage_failed_tests(root, workdir, parse_workers):
+    from pages.CheckupReport.ReportIndex import ReportIndex, KIND_RESULT_XML
+    from pages.CheckupReport.FailedTestIndex import FailedTestIndex
+    xml_files = ReportIndex(root).get_files(KIND_RESULT_XML)
+    FailedTestIndex(os.path.join(workdir, "failed_tests.db")).index_reports(xml_files)
+    return len(xml_files)
+
+
+def stage_merge(root, workdir, parse_workers):
+    from pages.CheckupReport.ReportIndex import ReportIndex, KIND_RESULT_XML
+    from pages.CheckupReport.ReportAnalyzerCore import ReportAnalyzerCore
+    report_index = ReportIndex(root)
+    core = ReportAnalyzerCore(root, parse_workers=parse_workers, use_cache=False)
+    core.merge_sharded_results(report_index)
+    return len(report_index.get_files(KIND_RESULT_XML))
+
+
+def stage_full(root, workdir, parse_workers):
+    from pages.CheckupReport.ReportAnalyzerCore import ReportAnalyzerCore
+    core = ReportAnalyzerCore(root, parse_workers=parse_workers, use_cache=False)
+    result = core.analyze()
+    if result.fatal_error:
+        raise RuntimeError(result.fatal_error)
+    return _file_count(root)
+
+
+def stage_full_cached(root, workdir, parse_workers):
+    """热缓存：先完整分析一次填充缓存（不计时部分见run_stage），再计时第二次"""
+    from pages.CheckupReport.ReportAnalyzerCore import ReportAnalyzerCore
+    core = ReportAnalyzerCore(root, parse_workers=parse_workers, cache_path=os.path.join(workdir, "cache.db"))
+    result = core.analyze()
+    if result.fatal_error:
+        raise RuntimeError(result.fatal_error)
+    return _file_count(root)
+
+
+def _file_count(root):
+    from pages.CheckupReport.ReportIndex import ReportIndex
+    return ReportIndex(root).file_count
+
+
+STAGES = {
+    "index": stage_index,
+    "parse": stage_parse,
+    "apts": stage_apts,
+    "cv": stage_cv,
+    "other": stage_other,
+    "device_info": stage_device_info,
+    "failed_tests": stage_failed_tests,
+    "merge": stage_merge,
+    "full": stage_full,
+    "full_cached": stage_full_cached,
+}
+# 需要先执行一次预热的阶段
+WARMUP_STAGES = {"full_cached"}
+
+
+def run_stage(name, root, workdir, parse_workers):
+    """子进程入口：执行一个阶段，返回 (耗时秒, 峰值RSS字节, 文件数)"""
+    func = STAGES[name]
+    # 模块导入不计入阶段耗时
+    importlib.import_module("pages.CheckupReport.ReportAnalyzerCore")
+    importlib.import_module("pages.CheckupReport.FailedTestIndex")
+    if name in WARMUP_STAGES:
+        func(root, workdir, parse_workers)
+    start = time.perf_counter()
+    files = func(root, workdir, parse_workers)
+    elapsed = time.perf_counter() - start
+    return elapsed, peak_rss_bytes(), files
+
+
+def measure_stage(name, root, workdir, parse_workers, repeat):
+    """在独立子进程中重复执行阶段，取最短耗时和最大峰值RSS"""
+    best = None
+    peak = 0
+    files = 0
+    context = multiprocessing.get_context("spawn")
+    for _ in range(repeat):
+        with context.Pool(1) as pool:
+            elapsed, rss, files = pool.apply(run_stage, (name, root, workdir, parse_workers))
+        best = elapsed if best is None else min(best, elapsed)
+        peak = max(peak, rss)
+    return {"seconds": best, "peak_rss_mb": peak / (1024 * 1024), "files": files,
+            "files_per_sec": files / best if best else 0.0}
+
+
+def compare_results(results, baseline, tolerance):
+    """与基线对比，返回耗时超出容差的阶段说明列表"""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("seconds"):
+            continue
+        ratio = stats["seconds"] / base["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {base['seconds'] * 1000:.1f} ms -> {stats['seconds'] * 1000:.1f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CheckupReport分析器基准测试")
+    add_generator_arguments(parser)
+    parser.add_argument("output", nargs="?", help="使用已有的报告目录（不指定则生成到临时目录）")
+    parser.add_argument("--stage", action="append", choices=list(STAGES), help="只运行指定阶段（可重复）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个阶段的重复次数，取最短耗时")
+    parser.add_argument("--parse-workers", type=int, default=None, help="预解析进程数（默认同程序默认值）")
+    parser.add_argument("--save", metavar="FILE", help="将结果保存为JSON基线")
+    parser.add_argument("--compare", metavar="FILE", help="与JSON基线对比，耗时超出容差时返回非零退出码")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许的耗时增幅（默认0.25即25%%）")
+    args = parser.parse_args()
+
+    stages = args.stage or list(STAGES)
+    with tempfile.TemporaryDirectory() as workdir:
+        root = args.output
+        if root is None:
+            root = os.path.join(workdir, "reports")
+            start = time.perf_counter()
+            file_count = generate_report_tree(root, config_from_args(args))
+            print(f"已生成 {file_count} 个文件（{time.perf_counter() - start:.1f} s）: {root}")
+
+        results = {}
+        print(f"{'阶段':<14}{'耗时(ms)':>12}{'峰值RSS(MB)':>14}{'文件数':>10}{'文件/秒':>12}")
+        for name in stages:
+            stats = measure_stage(name, root, workdir, args.parse_workers, args.repeat)
+            results[name] = stats
+            print(f"{name:<14}{stats['seconds'] * 1000:>12.1f}{stats['peak_rss_mb']:>14.1f}"
+                  f"{stats['files']:>10}{stats['files_per_sec']:>12.1f}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"基线已保存: {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ 以下阶段耗时超出基线 {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"与基线相比未发现超过 {args.tolerance:.0%} 的性能回退")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""PackageDeviceInfo版本号提取基准测试
+
+对比整文件json.loads后遍历全部包（旧实现）与
+ReportAnalyzerCore.extract_device_info_versions（流式逐个解码包对象，找齐两个目标包即停止读取）。
+两个目标包随机插入包列表，新实现的耗时取决于后出现的目标包的位置（由--seed决定）。
+
+用法（在仓库根目录执行）:
+    python -m benchmarks.bench_device_info [--packages 3000] [--repeat 5]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.report_generator import GeneratorConfig, write_package_device_info
+from pages.CheckupReport.ReportAnalyzerCore import ReportAnalyzerCore
+
+
+def legacy_extract_versions(file_path):
+    """旧实现：读取全文并json.loads，再走整文件解析逻辑"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return ReportAnalyzerCore._extract_device_info_versions_from_content(file_path, content)
+
+
+def measure(func, path, repeat):
+    """返回 (最短耗时秒, 结果)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PackageDeviceInfo版本号提取基准测试")
+    parser.add_argument("--packages", type=int, default=3000, help="包数量（默认3000，约3MB）")
+    parser.add_argument("--repeat", type=int, default=5, help="每种实现的重复次数，取最短耗时")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（决定两个目标包在列表中的位置）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_file = os.path.join(temp_dir, "PackageDeviceInfo.deviceinfo.json")
+        write_package_device_info(json_file, GeneratorConfig(packages=args.packages), random.Random(args.seed))
+        size_mb = os.path.getsize(json_file) / (1024 * 1024)
+
+        legacy_time, legacy_result = measure(legacy_extract_versions, json_file, args.repeat)
+        new_time, new_result = measure(ReportAnalyzerCore.extract_device_info_versions, json_file, args.repeat)
+
+    if legacy_result != new_result:
+        print("❌ 新旧实现的提取结果不一致:")
+        print(f"  旧: {legacy_result}")
+        print(f"  新: {new_result}")
+        sys.exit(1)
+
+    print(f"文件大小: {size_mb:.1f} MB（{args.packages} 个包）")
+    print(f"旧实现（整文件json.loads）:     {legacy_time * 1000:.2f} ms")
+    print(f"新实现（流式解码，找齐即停止）: {new_time * 1000:.2f} ms")
+    print(f"加速比: {legacy_time / new_time:.1f}x，提取结果一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""test_result_failures_suite.html 摘要提取基准测试
+
+对比旧实现（整文件读取 + 8次未编译的re.findall）与
+OtherReportAnalyzer.extract_summary（单次预编译扫描，读到摘要表结束即停止）。
+
+用法（在仓库根目录执行）:
+    python -m benchmarks.bench_failures_html [--failures 40000] [--repeat 5]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages.CheckupReport.OtherReportAnalyzer import OtherReportAnalyzer, SUMMARY_FIELDS
+
+
+def legacy_extract_summary(html_file):
+    """旧实现：读取全文后对每个字段各执行一次findall"""
+    with open(html_file, 'r', encoding="utf-8") as htmlf:
+        htmlcont = htmlf.read().replace("\\n", "")
+    Suite_Plan_match = re.findall("Suite / Plan</td><td>(.*?)</td>", htmlcont)
+    if not Suite_Plan_match:
+        return None
+    summary = {"Suite / Plan": Suite_Plan_match[0]}
+    for field in SUMMARY_FIELDS[1:]:
+        summary[field] = re.findall(field + "</td><td>(.*?)</td>", htmlcont)[0]
+    return summary
+
+
+def write_failures_page(path, failure_count):
+    """生成带大量失败用例的GTS失败页面"""
+    rows = [
+        ("Suite / Plan", "GTS / gts"),
+        ("Suite / Build", "12.0_r1 / 12345678"),
+        ("Host Info", "lab-host (Linux - 5.15.0)"),
+        ("Start time / End Time", "Mon Oct 12 10:00:00 CST 2026 / Mon Oct 12 18:00:00 CST 2026"),
+        ("Tests Passed", "123456"),
+        ("Tests Failed", str(failure_count)),
+        ("Modules Done", "321"),
+        ("Modules Total", "321"),
+        ("Fingerprint", "google/product/device:14/UP1A.231005.007/123456:user/release-keys"),
+        ("Security Patch", "2026-09-05"),
+        ("Release (SDK)", "14 (34)"),
+        ("ABIs", "arm64-v8a,armeabi-v7a"),
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("<html><head><title>Test Report</title></head><body>\n")
+        f.write("<table class=\"summary\">\n")
+        for title, value in rows:
+            f.write(f"<tr><td class=\"rowtitle\">{title}</td><td>{value}</td></tr>\n")
+        f.write("</table>\n<table class=\"testdetails\">\n")
+        for i in range(failure_count):
+            f.write(
+                f"<tr><td class=\"testname\">com.google.android.gts.Module{i % 97}Test#testCase{i}</td>"
+                f"<td class=\"failed\">fail</td><td class=\"failuredetails\"><div class=\"details\">"
+                f"java.lang.AssertionError: expected:&lt;true&gt; but was:&lt;false&gt; at "
+                f"com.google.android.gts.Module{i % 97}Test.testCase{i}(Module{i % 97}Test.java:{i % 500})"
+                f"</div></td></tr>\n"
+            )
+        f.write("</table></body></html>\n")
+
+
+def measure(func, path, repeat):
+    """返回 (最短耗时秒, 结果)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="failures_suite.html 摘要提取基准测试")
+    parser.add_argument("--failures", type=int, default=40000, help="失败用例行数（默认40000，约10MB）")
+    parser.add_argument("--repeat", type=int, default=5, help="每种实现的重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        html_file = os.path.join(temp_dir, "test_result_failures_suite.html")
+        write_failures_page(html_file, args.failures)
+        size_mb = os.path.getsize(html_file) / (1024 * 1024)
+
+        legacy_time, legacy_result = measure(legacy_extract_summary, html_file, args.repeat)
+        new_time, new_result = measure(OtherReportAnalyzer.extract_summary, html_file, args.repeat)
+
+    if legacy_result != new_result:
+        print("❌ 新旧实现的提取结果不一致:")
+        print(f"  旧: {legacy_result}")
+        print(f"  新: {new_result}")
+        sys.exit(1)
+
+    print(f"页面大小: {size_mb:.1f} MB（{args.failures} 条失败用例）")
+    print(f"旧实现（全文读取 + 8次findall）: {legacy_time * 1000:.2f} ms")
+    print(f"新实现（单次扫描 + 提前停止）:   {new_time * 1000:.2f} ms")
+    print(f"加速比: {legacy_time / new_time:.1f}x，提取结果一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""SmartFeatureComparator映射构建基准测试
+
+对比旧实现（第二阶段对每个未匹配旧项扫描全部新项，第三阶段对每个剩余候选都计算difflib相似度和差异）与
+SmartFeatureComparator._build_mapping（名称索引 + 按类型/可用性分桶的上界剪枝，差异只对胜出候选计算）。
+
+用法（在仓库根目录执行）:
+    python -m benchmarks.bench_smart_feature [--features 5000] [--drift 0.1] [--repeat 3]
+"""
+import os
+import sys
+import time
+import random
+import difflib
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pages.SMRComparison.data_models import data_modelsChangeType, FeatureItem, FeatureChange
+from pages.SMRComparison.smart_comparator import SmartFeatureComparator
+
+NAME_PREFIXES = ["android.hardware", "android.software", "com.google.android.feature", "com.vendor.feature"]
+NAME_WORDS = ["camera", "sensor", "wifi", "bluetooth", "nfc", "audio", "telephony", "location", "vulkan",
+              "biometrics", "display", "usb", "touchscreen", "gamepad", "ram", "backup", "print", "ims"]
+
+
+class LegacySmartFeatureComparator(SmartFeatureComparator):
+    """旧实现（逐项扫描的第二、三阶段）"""
+
+    def _legacy_similarity(self, item1, item2):
+        score = 0.0
+        score += difflib.SequenceMatcher(None, item1.name, item2.name).ratio() * 0.3
+        if item1.get('type') == item2.get('type'):
+            score += 0.2
+        if item1.get('available') == item2.get('available'):
+            score += 0.2
+        for key in set(item1.data.keys()) & set(item2.data.keys()):
+            if key not in ['name', 'type', 'available']:
+                if self._compare_values(item1.data[key], item2.data[key]):
+                    score += 0.1
+        return min(score, 1.0)
+
+    def _find_best_match(self, old_item, new_items, matched_new_indices, candidate_index=None):
+        best_match = None
+        best_score = -1
+        for j, new_item in enumerate(new_items):
+            if j in matched_new_indices:
+                continue
+            if old_item.name == new_item.name:
+                return (j, self._compare_items(old_item, new_item))
+            score = self._legacy_similarity(old_item, new_item)
+            if score > best_score:
+                best_score = score
+                best_match = (j, self._compare_items(old_item, new_item))
+        if best_score > 0.5:
+            return best_match
+        return None
+
+    def _build_mapping(self, old_items, new_items):
+        changes = []
+        matched_old_indices = set()
+        matched_new_indices = set()
+        for i in range(min(len(old_items), len(new_items))):
+            if old_items[i].name == new_items[i].name and not self._compare_items(old_items[i], new_items[i]):
+                changes.append(FeatureChange(data_modelsChangeType.SAME, old_items[i], new_items[i]))
+                matched_old_indices.add(i)
+                matched_new_indices.add(i)
+        for i, old_item in enumerate(old_items):
+            if i in matched_old_indices:
+                continue
+            for j, new_item in enumerate(new_items):
+                if j in matched_new_indices:
+                    continue
+                if old_item.name == new_item.name:
+                    diff = self._compare_items(old_item, new_item)
+                    change_type = data_modelsChangeType.MODIFIED if diff else data_modelsChangeType.MOVED
+                    changes.append(FeatureChange(change_type, old_item, new_item, changes=diff))
+                    matched_old_indices.add(i)
+                    matched_new_indices.add(j)
+                    break
+        for i, old_item in enumerate(old_items):
+            if i in matched_old_indices:
+                continue
+            best_match = self._find_best_match(old_item, new_items, matched_new_indices)
+            if best_match:
+                j, diff = best_match
+                change_type = data_modelsChangeType.MODIFIED if diff else data_modelsChangeType.MOVED
+                changes.append(FeatureChange(change_type, old_item, new_items[j], changes=diff))
+                matched_old_indices.add(i)
+                matched_new_indices.add(j)
+        for i, old_item in enumerate(old_items):
+            if i not in matched_old_indices:
+                changes.append(FeatureChange(data_modelsChangeType.REMOVED, old_item, None))
+        for j, new_item in enumerate(new_items):
+            if j not in matched_new_indices:
+                changes.append(FeatureChange(data_modelsChangeType.ADDED, None, new_item))
+        return changes
+
+
+def random_feature(rng, serial):
+    feature = {
+        "name": f"{rng.choice(NAME_PREFIXES)}.{rng.choice(NAME_WORDS)}.{rng.choice(NAME_WORDS)}_{serial}",
+        "available": rng.random() < 0.9,
+    }
+    if rng.random() < 0.6:
+        feature["version"] = rng.randint(0, 5)
+    if rng.random() < 0.3:
+        feature["type"] = rng.choice(["hardware", "software"])
+    return feature
+
+
+def build_feature_data(feature_count, drift, rng):
+    """生成MR/SMR两份FeatureDeviceInfo数据：SMR在MR基础上按drift比例改名、修改、删除、新增并打乱部分顺序"""
+    mr_features = [random_feature(rng, i) for i in range(feature_count)]
+    smr_features = []
+    for feature in mr_features:
+        feature = dict(feature)
+        roll = rng.random()
+        if roll < drift * 0.3:
+            # 改名（供第三阶段相似匹配）
+            feature["name"] = feature["name"].replace("_", "-v2_", 1)
+        elif roll < drift * 0.6:
+            feature["version"] = feature.get("version", 0) + 1
+        elif roll < drift * 0.8:
+            continue
+        smr_features.append(feature)
+    for i in range(int(feature_count * drift * 0.2)):
+        smr_features.insert(rng.randrange(len(smr_features) + 1), random_feature(rng, feature_count + i))
+    # 打乱若干片段的顺序（移动）
+    for _ in range(int(feature_count * drift * 0.1)):
+        start = rng.randrange(len(smr_features))
+        segment = smr_features[start:start + rng.randint(1, 5)]
+        del smr_features[start:start + len(segment)]
+        position = rng.randrange(len(smr_features) + 1)
+        smr_features[position:position] = segment
+    return {"feature": mr_features}, {"feature": smr_features}
+
+
+def mapping_signature(changes):
+    return [(change.change_type, change.old_index, change.new_index, change.changes) for change in changes]
+
+
+def measure(comparator, mr_items, smr_items, repeat):
+    """返回 (最短耗时秒, 映射结果)"""
+    best = None
+    changes = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        changes = comparator._build_mapping(mr_items, smr_items)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SmartFeatureComparator映射构建基准测试")
+    parser.add_argument("--features", type=int, default=5000, help="每份文件的feature数量（默认5000）")
+    parser.add_argument("--drift", type=float, default=0.1, help="SMR相对MR发生变化的比例（默认0.1）")
+    parser.add_argument("--repeat", type=int, default=3, help="每种实现的重复次数，取最短耗时")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    mr_data, smr_data = build_feature_data(args.features, args.drift, random.Random(args.seed))
+    mr_items = [FeatureItem(index=i, name=f["name"], data=f) for i, f in enumerate(mr_data["feature"])]
+    smr_items = [FeatureItem(index=i, name=f["name"], data=f) for i, f in enumerate(smr_data["feature"])]
+
+    legacy_time, legacy_changes = measure(LegacySmartFeatureComparator(), mr_items, smr_items, args.repeat)
+    new_time, new_changes = measure(SmartFeatureComparator(), mr_items, smr_items, args.repeat)
+
+    if mapping_signature(legacy_changes) != mapping_signature(new_changes):
+        print("❌ 新旧实现的映射结果不一致")
+        sys.exit(1)
+
+    counts = {}
+    for change in new_changes:
+        counts[change.change_type.value] = counts.get(change.change_type.value, 0) + 1
+    print(f"Feature数量: MR {len(mr_items)} / SMR {len(smr_items)}，变更统计: {counts}")
+    print(f"旧实现（逐项扫描）:           {legacy_time * 1000:.1f} ms")
+    print(f"新实现（名称索引 + 上界剪枝）: {new_time * 1000:.1f} ms")
+    print(f"加速比: {legacy_time / new_time:.1f}x，映射结果一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""模拟送测报告目录生成器
+
+按tradefed的结果目录结构生成CTS/GTS/STS/VTS/APTS/CTS_VERIFIER报告：
+test_result.xml、test_result_failures_suite.html、PackageDeviceInfo.deviceinfo.json，
+以及模块日志等噪声文件，模块数/用例数/失败数/噪声文件数均可配置。
+
+用法（在仓库根目录执行）:
+    python -m benchmarks.report_generator OUTPUT_DIR [--modules 200] [--tests 50] [--cts-shards 4]
+"""
+import os
+import json
+import random
+import argparse
+import datetime
+from dataclasses import dataclass
+from xml.sax.saxutils import quoteattr, escape
+
+FINGERPRINT = "google/bench_product/bench_device:14/UP1A.231005.007/{build}:user/release-keys"
+GO_PACKAGE = "com.google.mainline.go.primary"
+MAINLINE_PACKAGE = "com.google.android.modulemetadata"
+
+
+@dataclass
+class GeneratorConfig:
+    """生成参数"""
+    modules: int = 200              # 每份XML报告的模块数
+    testcases: int = 5              # 每个模块的TestCase数
+    tests: int = 50                 # 每个TestCase的Test数
+    failure_rate: float = 0.001     # 失败用例比例
+    html_failures: int = 2000       # 每个失败页面的失败用例行数
+    cts_shards: int = 4             # CTS分片（结果目录）数
+    packages: int = 800             # PackageDeviceInfo中的包数量
+    extra_device_info: int = 20     # 每个CTS分片中其他deviceinfo.json的数量
+    noise_files: int = 2000         # logs目录下的日志文件数
+    noise_size: int = 4096          # 每个日志文件的字节数
+    build: str = "10001"            # Fingerprint中的构建号
+    seed: int = 0
+
+
+# (目录, 套件名, 计划, 工具版本, 工具构建号)
+SUITES = (
+    ("GTS", "GTS", "gts", "12.0_r1", "12345"),
+    ("STS", "STS", "sts-dynamic-full", "sts-r56", "13579"),
+    ("VTS", "VTS", "vts", "14_r5", "11223"),
+)
+
+
+def _timestamp(offset_hours=0):
+    moment = datetime.datetime.now() - datetime.timedelta(hours=offset_hours)
+    return moment.strftime("%Y.%m.%d_%H.%M.%S")
+
+
+def _security_patch():
+    """取当月5日（必要时回退到上月），保证不触发安全补丁过期检查"""
+    today = datetime.date.today()
+    patch = today.replace(day=5)
+    if patch > today:
+        patch = (patch - datetime.timedelta(days=28)).replace(day=5)
+    return patch.isoformat()
+
+
+def write_result_xml(path, config, rng, suite_name, suite_plan, suite_version, build_number, fingerprint, security_patch):
+    """生成test_result.xml，返回 (PASS数, FAIL数)"""
+    passed = 0
+    failed = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("<?xml version='1.0' encoding='UTF-8' standalone='no' ?>\n")
+        f.write(f'<Result start="1700000000000" end="1700003600000" suite_name={quoteattr(suite_name)} '
+                f'suite_plan={quoteattr(suite_plan)} suite_version={quoteattr(suite_version)} '
+                f'suite_build_number={quoteattr(build_number)} devices="BENCH0001">\n')
+        f.write(f'  <Build build_fingerprint={quoteattr(fingerprint)} '
+                f'build_version_security_patch="{security_patch}" build_product="bench_product" />\n')
+        # Summary位于Module之前，先占位，写完后回填
+        summary_pos = f.tell()
+        f.write(" " * 160 + "\n")
+        for m in range(config.modules):
+            f.write(f'  <Module name="{suite_name}Module{m}" abi="arm64-v8a" runtime="1000" done="true">\n')
+            for c in range(config.testcases):
+                f.write(f'    <TestCase name="com.android.{suite_name.lower()}.module{m}.Case{c}Test">\n')
+                for t in range(config.tests):
+                    if rng.random() < config.failure_rate:
+                        failed += 1
+                        f.write(f'      <Test result="fail" name="test{t}">'
+                                f'<Failure message="expected:&lt;true&gt; but was:&lt;false&gt;">'
+                                f'<StackTrace>java.lang.AssertionError: expected:&lt;true&gt; but was:&lt;false&gt;\n'
+                                f'\tat com.android.{suite_name.lower()}.module{m}.Case{c}Test.test{t}(Case{c}Test.java:{t + 10})'
+                                f'</StackTrace></Failure></Test>\n')
+                    else:
+                        passed += 1
+                        f.write(f'      <Test result="pass" name="test{t}" />\n')
+                f.write('    </TestCase>\n')
+            f.write('  </Module>\n')
+        f.write('</Result>\n')
+        f.seek(summary_pos)
+        f.write(f'  <Summary pass="{passed}" failed="{failed}" warning="0" '
+                f'modules_done="{config.modules}" modules_total="{config.modules}" />')
+    return passed, failed
+
+
+def write_failures_html(path, config, suite_plan, suite_build, passed, failed, fingerprint, security_patch):
+    """生成test_result_failures_suite.html"""
+    rows = [
+        ("Suite / Plan", suite_plan),
+        ("Suite / Build", suite_build),
+        ("Host Info", "bench-host (Linux - 5.15.0)"),
+        ("Start time / End Time", "Mon Oct 12 10:00:00 CST 2026 / Mon Oct 12 18:00:00 CST 2026"),
+        ("Tests Passed", str(passed)),
+        ("Tests Failed", str(failed)),
+        ("Modules Done", str(config.modules)),
+        ("Modules Total", str(config.modules)),
+        ("Fingerprint", fingerprint),
+        ("Security Patch", security_patch),
+        ("Release (SDK)", "14 (34)"),
+        ("ABIs", "arm64-v8a,armeabi-v7a"),
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("<html><head><title>Test Report</title></head><body>\n<table class=\"summary\">\n")
+        for title, value in rows:
+            f.write(f"<tr><td class=\"rowtitle\">{title}</td><td>{escape(value)}</td></tr>\n")
+        f.write("</table>\n<table class=\"testdetails\">\n")
+        for i in range(config.html_failures):
+            f.write(f"<tr><td class=\"testname\">com.android.Module{i % 97}Test#testCase{i}</td>"
+                    f"<td class=\"failed\">fail</td><td class=\"failuredetails\"><div class=\"details\">"
+                    f"java.lang.AssertionError: expected:&lt;true&gt; but was:&lt;false&gt;</div></td></tr>\n")
+        f.write("</table></body></html>\n")
+
+
+def write_package_device_info(path, config, rng):
+    """生成PackageDeviceInfo.deviceinfo.json（两个目标包随机分布在列表中）"""
+    packages = []
+    for i in range(config.packages):
+        packages.append({
+            "name": f"com.vendor.app{i}",
+            "version_name": f"{rng.randint(1, 30)}.{rng.randint(0, 99)}",
+            "version_code": rng.randint(1, 10 ** 9),
+            "system_priv": rng.random() < 0.2,
+            "shared_install_packages": [],
+            "requested_permissions": [{"name": f"android.permission.P{p}", "granted": True} for p in range(5)],
+        })
+    packages.insert(rng.randrange(len(packages) + 1), {"name": GO_PACKAGE, "version_name": "340000000"})
+    packages.insert(rng.randrange(len(packages) + 1), {"name": MAINLINE_PACKAGE, "version_name": "350000000"})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"package": packages}, f, indent=2)
+
+
+def write_extra_device_info(device_info_dir, count):
+    """生成其他deviceinfo.json（GenericDeviceInfo等，宽泛匹配时才会用到）"""
+    for i in range(count):
+        with open(os.path.join(device_info_dir, f"Extra{i}DeviceInfo.deviceinfo.json"), 'w', encoding='utf-8') as f:
+            json.dump({"entries": [{"key": f"k{j}", "value": j} for j in range(20)]}, f)
+
+
+def write_noise_logs(log_dir, config, rng, count):
+    """生成模块日志等噪声文件"""
+    line = "01-01 00:00:00.000  1000  1000 I bench: noise log line for directory walk benchmark\n"
+    content = (line * (config.noise_size // len(line) + 1))[:config.noise_size]
+    for i in range(count):
+        module_dir = os.path.join(log_dir, f"module{i % 50}")
+        os.makedirs(module_dir, exist_ok=True)
+        with open(os.path.join(module_dir, f"host_log_{i}.txt"), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def _result_dir(*parts):
+    path = os.path.join(*parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def generate_report_tree(root, config=None):
+    """在root下生成一套完整的送测报告目录，返回生成的文件数"""
+    config = config or GeneratorConfig()
+    rng = random.Random(config.seed)
+    fingerprint = FINGERPRINT.format(build=config.build)
+    security_patch = _security_patch()
+    noise_per_suite = config.noise_files // (len(SUITES) + 1)
+    file_count = 0
+
+    # CTS分片：每个分片都带PackageDeviceInfo
+    for shard in range(config.cts_shards):
+        timestamp = _timestamp(shard + 1)
+        result_dir = _result_dir(root, "CTS", "android-cts", "results", timestamp)
+        passed, failed = write_result_xml(os.path.join(result_dir, "test_result.xml"), config, rng,
+                                          "CTS", "cts", "14_r5", "11788443", fingerprint, security_patch)
+        write_failures_html(os.path.join(result_dir, "test_result_failures_suite.html"), config,
+                            "CTS / cts", "14_r5 / 11788443", passed, failed, fingerprint, security_patch)
+        device_info_dir = _result_dir(result_dir, "device-info-files")
+        write_package_device_info(os.path.join(device_info_dir, "PackageDeviceInfo.deviceinfo.json"), config, rng)
+        write_extra_device_info(device_info_dir, config.extra_device_info)
+        file_count += 3 + config.extra_device_info
+    write_noise_logs(_result_dir(root, "CTS", "android-cts", "logs", _timestamp(1)), config, rng, noise_per_suite)
+    file_count += noise_per_suite
+
+    for directory, suite_name, suite_plan, version, build_number in SUITES:
+        result_dir = _result_dir(root, directory, f"android-{directory.lower()}", "results", _timestamp(2))
+        passed, failed = write_result_xml(os.path.join(result_dir, "test_result.xml"), config, rng,
+                                          suite_name, suite_plan, version, build_number, fingerprint, security_patch)
+        write_failures_html(os.path.join(result_dir, "test_result_failures_suite.html"), config,
+                            f"{suite_name} / {suite_plan}", f"{version} / {build_number}",
+                            passed, failed, fingerprint, security_patch)
+        write_noise_logs(_result_dir(root, directory, f"android-{directory.lower()}", "logs", _timestamp(2)),
+                         config, rng, noise_per_suite)
+        file_count += 2 + noise_per_suite
+
+    # 新版APTS（GTS / apts）与旧版XML格式APTS
+    result_dir = _result_dir(root, "GTS", "android-gts", "results", _timestamp(3))
+    write_failures_html(os.path.join(result_dir, "test_result_failures_suite.html"), config,
+                        "GTS / apts", "12.0_r1 / 12340", 1000, 0, fingerprint, security_patch)
+    result_dir = _result_dir(root, "APTS", "test_approval", "results", _timestamp(4))
+    write_result_xml(os.path.join(result_dir, "test_result.xml"), config, rng,
+                     "APTS", "apts", "2.0", "1", fingerprint, security_patch)
+    with open(os.path.join(result_dir, "summary.txt"), 'w', encoding='utf-8') as f:
+        f.write("APTS Version : 2.0 (777)\n")
+    file_count += 3
+
+    # CTS_VERIFIER（目录名中的导出时间需在5天内）
+    result_dir = _result_dir(root, "CV", f"{_timestamp(5)}-CTS_VERIFIER-bench")
+    write_result_xml(os.path.join(result_dir, "test_result.xml"), config, rng,
+                     "CTS_VERIFIER", "verifier", "14_r5", "11788443", fingerprint, security_patch)
+    file_count += 1
+    return file_count
+
+
+def add_generator_arguments(parser):
+    """添加生成参数（供基准测试脚本复用）"""
+    defaults = GeneratorConfig()
+    parser.add_argument("--modules", type=int, default=defaults.modules, help="每份XML报告的模块数")
+    parser.add_argument("--testcases", type=int, default=defaults.testcases, help="每个模块的TestCase数")
+    parser.add_argument("--tests", type=int, default=defaults.tests, help="每个TestCase的Test数")
+    parser.add_argument("--failure-rate", type=float, default=defaults.failure_rate, help="失败用例比例")
+    parser.add_argument("--html-failures", type=int, default=defaults.html_failures, help="每个失败页面的失败用例行数")
+    parser.add_argument("--cts-shards", type=int, default=defaults.cts_shards, help="CTS分片数")
+    parser.add_argument("--packages", type=int, default=defaults.packages, help="PackageDeviceInfo中的包数量")
+    parser.add_argument("--extra-device-info", type=int, default=defaults.extra_device_info,
+                        help="每个CTS分片中其他deviceinfo.json的数量")
+    parser.add_argument("--noise-files", type=int, default=defaults.noise_files, help="日志噪声文件数")
+    parser.add_argument("--noise-size", type=int, default=defaults.noise_size, help="每个日志文件的字节数")
+    parser.add_argument("--build", default=defaults.build, help="Fingerprint中的构建号")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="随机种子")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="生成模拟送测报告目录")
+    parser.add_argument("output", help="输出目录")
+    add_generator_arguments(parser)
+    return parser
+
+
+def config_from_args(args):
+    return GeneratorConfig(
+        modules=args.modules, testcases=args.testcases, tests=args.tests, failure_rate=args.failure_rate,
+        html_failures=args.html_failures, cts_shards=args.cts_shards, packages=args.packages,
+        extra_device_info=args.extra_device_info,
+        noise_files=args.noise_files, noise_size=args.noise_size, build=args.build, seed=args.seed,
+    )
+
+
+def main():
+    args = build_parser().parse_args()
+    file_count = generate_report_tree(args.output, config_from_args(args))
+    print(f"已生成 {file_count} 个文件: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
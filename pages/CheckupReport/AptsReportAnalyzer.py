@@ -1,7 +1,11 @@
-import os
 import re
 import xml.etree.ElementTree as ET
 
+from .ReportIndex import KIND_APTS_XML
+from .ReportParsePool import get_record_data
+from .ReportArchive import report_exists, sibling_path
+from .DocumentCache import read_report_text, get_document_view
+
 class AptsReportAnalyzer:
     """APTS报告分析器（仅处理旧版XML格式）"""
     
@@ -11,21 +15,25 @@ class AptsReportAnalyzer:
         self.Fingerprint_comparison = []
         self.Security_Patch_comparison = []
         self.tool_versions = []
+        self.suite_summaries = []  # 各报告的结构化摘要（写入历史记录）
         self.ReportDelimiter = "=" * 100
     
-    def analyze_apts_reports(self, pathnames, output_lines, output_error):
-        """分析APTS报告（仅XML格式）"""
+    def analyze_apts_reports(self, report_index, output_lines, output_error, records=None):
+        """分析APTS报告（仅XML格式）
+        
+        Args:
+            records: 预解析记录 {(报告类型, 文件路径): 记录}，为None时在当前线程中解析
+        """
         # 清空列表
         self.apts_result_path.clear()
         self.Suite_Plan_comparison.clear()
         self.Fingerprint_comparison.clear()
         self.Security_Patch_comparison.clear()
         self.tool_versions.clear()
+        self.suite_summaries.clear()
 
         # 仅查找标准的XML格式APTS报告（路径含test_approval，文件名test_result.xml）
-        for path in pathnames:
-            if "test_approval" in path and "test_result.xml" in path:
-                self.apts_result_path.append(path)
+        self.apts_result_path.extend(report_index.get_files(KIND_APTS_XML))
 
         if not self.apts_result_path:
             output_error.append("❌ 未找到APTS报告 请确认目录中是否包含APTS测试结果文件")
@@ -33,36 +41,30 @@ class AptsReportAnalyzer:
         # 处理XML报告
         for file_path in self.apts_result_path:
             try:
-                self._parse_xml_apts_report(file_path, output_lines, output_error)
+                self._parse_xml_apts_report(file_path, output_lines, output_error, records)
             except Exception as e:
                 output_error.append(f"❌ 处理APTS报告文件时出错 {file_path}: {str(e)}请确认文件格式是否正确")
         
         return output_lines, output_error
     
-    def _parse_xml_apts_report(self, xml_file, output_lines, output_error):
+    def _parse_xml_apts_report(self, xml_file, output_lines, output_error, records=None):
         """解析XML格式的APTS报告"""
-        with open(xml_file, 'r', encoding="utf-8") as xmlf:
-            xml_content = xmlf.read()
-        
-        root = ET.fromstring(xml_content)
+        record = get_record_data(records, KIND_APTS_XML, xml_file, self.extract_apts_record)
         
-        suite_name = root.get('suite_name', '')
-        suite_plan = root.get('suite_plan', '')
-        suite_version = root.get('suite_version', '')
-        Suite_Plan = f"{suite_name} / {suite_plan}"
+        suite_plan = record["suite_plan"]
+        suite_version = record["suite_version"]
+        Suite_Plan = f"{record['suite_name']} / {suite_plan}"
         self.Suite_Plan_comparison.append(Suite_Plan)
         
-        summary = root.find('Summary')
-        Tests_Passed = summary.get('pass', '0') if summary is not None else '0'
-        Tests_Failed = summary.get('failed', '0') if summary is not None else '0'
-        Warning_Count = summary.get('warning', '0') if summary is not None else '0'
-        Modules_Done = summary.get('modules_done', '0') if summary is not None else '0'
-        Modules_Total = summary.get('modules_total', '0') if summary is not None else '0'
+        Tests_Passed = record["pass"]
+        Tests_Failed = record["failed"]
+        Warning_Count = record["warning"]
+        Modules_Done = record["modules_done"]
+        Modules_Total = record["modules_total"]
         
-        build = root.find('Build')
-        Fingerprint = build.get('build_fingerprint', '') if build is not None else ''
+        Fingerprint = record["build_fingerprint"]
         self.Fingerprint_comparison.append(Fingerprint)
-        Security_Patch = build.get('build_version_security_patch', '') if build is not None else ''
+        Security_Patch = record["build_version_security_patch"]
         self.Security_Patch_comparison.append(Security_Patch)
         
         apts_version = self.extract_apts_version_from_summary(xml_file)
@@ -82,6 +84,16 @@ class AptsReportAnalyzer:
         version_num = apts_version if apts_version else suite_version
         build_num = self.extract_build_number_from_version(version_num)
         self.tool_versions.append((tool_type, tool_name, version_num, build_num))
+        self.suite_summaries.append({
+            "suite_plan": Suite_Plan,
+            "tool_version": version_num,
+            "passed": Tests_Passed,
+            "failed": Tests_Failed,
+            "modules_done": Modules_Done,
+            "modules_total": Modules_Total,
+            "fingerprint": Fingerprint,
+            "security_patch": Security_Patch,
+        })
         
         try:
             failed_count = int(Tests_Failed)
@@ -102,15 +114,32 @@ class AptsReportAnalyzer:
         
         output_lines.append(self.ReportDelimiter)
     
-    def extract_apts_version_from_summary(self, xml_file_path):
+    @staticmethod
+    def extract_apts_record(xml_file):
+        """提取APTS XML报告中分析所需的字段（工具版本来自summary.txt，不在此记录中）"""
+        root = get_document_view(xml_file, "xml_root", ET.fromstring)
+        summary = root.find('Summary')
+        build = root.find('Build')
+        
+        record = {
+            "suite_name": root.get('suite_name', ''),
+            "suite_plan": root.get('suite_plan', ''),
+            "suite_version": root.get('suite_version', ''),
+        }
+        for key in ("pass", "failed", "warning", "modules_done", "modules_total"):
+            record[key] = summary.get(key, '0') if summary is not None else '0'
+        for key in ("build_fingerprint", "build_version_security_patch"):
+            record[key] = build.get(key, '') if build is not None else ''
+        return record
+    
+    @staticmethod
+    def extract_apts_version_from_summary(xml_file_path):
         """从同目录的summary.txt文件中提取APTS版本信息"""
         try:
-            xml_dir = os.path.dirname(xml_file_path)
-            summary_file_path = os.path.join(xml_dir, "summary.txt")
-            if not os.path.exists(summary_file_path):
+            summary_file_path = sibling_path(xml_file_path, "summary.txt")
+            if not report_exists(summary_file_path):
                 return None
-            with open(summary_file_path, 'r', encoding='utf-8') as f:
-                summary_content = f.read()
+            summary_content = read_report_text(summary_file_path)
             apts_version_pattern = r"APTS Version\s*:\s*(.+)"
             match = re.search(apts_version_pattern, summary_content)
             return match.group(1).strip() if match else None
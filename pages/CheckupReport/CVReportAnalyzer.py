@@ -1,6 +1,15 @@
 import os
 import re
 import datetime
+import xml.etree.ElementTree as ET
+
+from .ReportIndex import KIND_CV_XML
+from .ReportParsePool import get_record_data
+from .DocumentCache import open_document
+from ..common.CancellationToken import check_cancelled
+
+# test_result.xml中CV报告分析所需的头部元素（均位于<Module>之前）
+HEADER_ELEMENTS = ("Result", "Build", "Summary")
 
 # ============================ CV报告分析器 ============================
 
@@ -14,15 +23,21 @@ class CVReportAnalyzer:
         self.Security_Patch_comparison = []
         # 新增：存储工具版本信息
         self.tool_versions = []  # 格式: (工具类型, 工具名称, 版本号, 构建号)
+        self.suite_summaries = []  # 各报告的结构化摘要（写入历史记录）
     
-    def analyze_cv_reports(self, pathnames, output_lines, output_error):
-        """分析CV报告"""
+    def analyze_cv_reports(self, report_index, output_lines, output_error, records=None):
+        """分析CV报告
+        
+        Args:
+            records: 预解析记录 {(报告类型, 文件路径): 记录}，为None时在当前线程中解析
+        """
         # ========== 新增：清空所有实例列表，防止累积 ==========
         self.cv_test_result.clear()
         self.Suite_Plan_comparison.clear()
         self.Fingerprint_comparison.clear()
         self.Security_Patch_comparison.clear()
         self.tool_versions.clear()
+        self.suite_summaries.clear()
         # ===================================================
 
         cv_status = False
@@ -30,22 +45,20 @@ class CVReportAnalyzer:
         cv_timeout_reports = []
         
         # 检测CV报告
-        for j in pathnames:
-            if "CTS_VERIFIER" in j:
-                cv_time_match = re.findall("(.*?)-CTS_VERIFIER", j)
-                if cv_time_match and len(cv_time_match[0]) >= 19:
-                    cv_time = cv_time_match[0][-19:]
-                    if "test_result.xml" in j:
-                        cv_status = True
-                        self.cv_test_result.append(str(j))
-                        output_lines.append(f"CV报告导出时间：{cv_time}")
-                        
-                        # 检查报告时间是否超过5天
-                        CVTime = (re.findall("(.*?)_", cv_time))[0].replace(".", "-")
-                        CVTime = datetime.datetime.strptime(CVTime, "%Y-%m-%d")
-                        TimeDiffer = (datetime.datetime.now() - CVTime).days
-                        if TimeDiffer > 5:
-                            cv_timeout_reports.append(cv_time)
+        for j in report_index.get_files(KIND_CV_XML):
+            cv_time_match = re.findall("(.*?)-CTS_VERIFIER", j)
+            if cv_time_match and len(cv_time_match[0]) >= 19:
+                cv_time = cv_time_match[0][-19:]
+                cv_status = True
+                self.cv_test_result.append(str(j))
+                output_lines.append(f"CV报告导出时间：{cv_time}")
+                
+                # 检查报告时间是否超过5天
+                CVTime = (re.findall("(.*?)_", cv_time))[0].replace(".", "-")
+                CVTime = datetime.datetime.strptime(CVTime, "%Y-%m-%d")
+                TimeDiffer = (datetime.datetime.now() - CVTime).days
+                if TimeDiffer > 5:
+                    cv_timeout_reports.append(cv_time)
         
         # 如果有超时的报告，只输出一次错误信息
         if cv_timeout_reports:
@@ -59,25 +72,27 @@ class CVReportAnalyzer:
         # 访问CV报告路径test_result
         for i in self.cv_test_result:
             try:
-                with open(i, 'r', encoding="utf-8") as htmlf:
-                    htmlcont = htmlf.read().replace("\\n", "")
+                header = get_record_data(records, KIND_CV_XML, i, self.read_result_header)
+                result_attrs = header["Result"]
+                build_attrs = header["Build"]
+                summary_attrs = header["Summary"]
                 
-                suite_name = re.findall('suite_name="(.*?)"', htmlcont)
-                suite_plan = re.findall('suite_plan="(.*?)"', htmlcont)
+                suite_name = result_attrs.get("suite_name")
+                suite_plan = result_attrs.get("suite_plan")
                 
                 if suite_name and suite_plan:
-                    Suite_Plan = suite_name[0] + " / " + suite_plan[0]
+                    Suite_Plan = suite_name + " / " + suite_plan
                     self.Suite_Plan_comparison.append(Suite_Plan)
                     
-                    suite_version = re.findall('suite_version="(.*?)"', htmlcont)[0]
-                    suite_build_number = re.findall('suite_build_number="(.*?)"', htmlcont)
-                    Summary_pass = re.findall('Summary pass="(.*?)"', htmlcont)[0]
-                    Failed = re.findall('failed="(.*?)"', htmlcont)[0]
-                    modules_done = re.findall('modules_done="(.*?)"', htmlcont)[0]
-                    modules_total = re.findall('modules_total="(.*?)"', htmlcont)[0]
-                    build_fingerprint = re.findall('build_fingerprint="(.*?)"', htmlcont)[0]
+                    suite_version = result_attrs["suite_version"]
+                    suite_build_number = result_attrs.get("suite_build_number")
+                    Summary_pass = summary_attrs["pass"]
+                    Failed = summary_attrs["failed"]
+                    modules_done = summary_attrs["modules_done"]
+                    modules_total = summary_attrs["modules_total"]
+                    build_fingerprint = build_attrs["build_fingerprint"]
                     self.Fingerprint_comparison.append(build_fingerprint)
-                    build_version_security_patch = re.findall('build_version_security_patch="(.*?)"', htmlcont)[0]
+                    build_version_security_patch = build_attrs["build_version_security_patch"]
                     self.Security_Patch_comparison.append(build_version_security_patch)
                     
                     # 使用制表符对齐
@@ -86,7 +101,7 @@ class CVReportAnalyzer:
                     # 处理工具版本显示 - 总是显示完整版本信息
                     if suite_build_number:
                         # 总是显示版本号/构建号，即使构建号为0
-                        tool_version_display = f"{suite_version} / {suite_build_number[0]}"
+                        tool_version_display = f"{suite_version} / {suite_build_number}"
                     else:
                         # 如果没有构建号，只显示版本号
                         tool_version_display = suite_version
@@ -101,13 +116,23 @@ class CVReportAnalyzer:
                     
                     # 新增：收集CTS_VERIFIER版本信息
                     tool_type = "CTS_VERIFIER"  # 单独的工具类型
-                    tool_name = suite_plan[0]
+                    tool_name = suite_plan
                     
                     # 解析版本号和构建号
                     version_num = suite_version
-                    build_num = suite_build_number[0] if suite_build_number else "0"
+                    build_num = suite_build_number if suite_build_number else "0"
                     
                     self.tool_versions.append((tool_type, tool_name, version_num, build_num))
+                    self.suite_summaries.append({
+                        "suite_plan": Suite_Plan,
+                        "tool_version": tool_version_display,
+                        "passed": Summary_pass,
+                        "failed": Failed,
+                        "modules_done": modules_done,
+                        "modules_total": modules_total,
+                        "fingerprint": build_fingerprint,
+                        "security_patch": build_version_security_patch,
+                    })
                     
                     # 检查FAIL数是否为0
                     try:
@@ -126,4 +151,31 @@ class CVReportAnalyzer:
             except Exception as e:
                 output_error.append(f"❌ 处理CV报告时出错 {i}: {str(e)}")
         
-        return output_lines, output_error
\ No newline at end of file
+        return output_lines, output_error
+    
+    @staticmethod
+    def read_result_header(xml_file):
+        """流式读取test_result.xml头部的Result/Build/Summary属性
+        
+        CV报告可达数百MB，而所需信息都位于文件开头，因此使用iterparse
+        增量解析，头部元素读齐（或遇到第一个Module）后立即停止，内存占用
+        与文件大小无关。
+        
+        Returns:
+            dict: {"Result": {...}, "Build": {...}, "Summary": {...}}
+        """
+        header = {tag: {} for tag in HEADER_ELEMENTS}
+        with open_document(xml_file, 'rb') as xmlf:
+            try:
+                for event, elem in ET.iterparse(xmlf, events=("start",)):
+                    check_cancelled()
+                    if elem.tag in header and not header[elem.tag]:
+                        # 与原先逐行拼接时的处理保持一致，去掉字面量"\\n"
+                        header[elem.tag] = {k: v.replace("\\n", "") for k, v in elem.attrib.items()}
+                    if all(header.values()) or elem.tag == "Module":
+                        break
+            except ET.ParseError:
+                # 报告被截断等情况下，保留已解析出的头部信息
+                if not header["Result"]:
+                    raise
+        return header
\ No newline at end of file
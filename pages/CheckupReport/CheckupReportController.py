@@ -3,6 +3,7 @@ from PyQt6.QtWidgets import QFileDialog, QMessageBox
 from PyQt6.QtCore import QTimer
 
 from .ReportAnalyzer import ReportAnalyzer
+from .ReportWatchThread import ReportWatchThread
 
 
 class CheckupReportController:
@@ -12,12 +13,17 @@ class CheckupReportController:
         super().__init__()
         self.ui = ui
         self.analyzer = None
+        self.watch_thread = None
+        # 已取消但尚未退出的分析线程，保留引用直到线程结束，避免运行中的QThread被回收
+        self.stopping_analyzers = []
         self.setup_connections()
     
     def setup_connections(self):
         """设置信号连接"""
         self.ui.select_directory_btn.clicked.connect(self.select_directory)
+        self.ui.select_archive_btn.clicked.connect(self.select_archive)
         self.ui.analyze_btn.clicked.connect(self.start_analysis)
+        self.ui.watch_btn.clicked.connect(self.toggle_watch)
         self.ui.clear_btn.clicked.connect(self.ui.clear_results)
 
     
@@ -31,48 +37,49 @@ class CheckupReportController:
         )
         
         if directory:
-            abs_path = os.path.abspath(directory)
-            self.ui.directory_path.setText(abs_path)
-            self.ui.analyze_btn.setEnabled(True)
-            self.ui.result_text.clear()
-            self.ui.result_text.append(f"已选择目录: {abs_path}")
-            
-            # 显示当前分析模式
-            mode = self.ui.get_android_version_mode()
-            if mode == "GO":
-                mode_text = "GO版本模式 - 将检查APTS报告"
-            elif mode == "FULL":
-                mode_text = "FULL版本模式 - 不检查APTS报告"
-            else:
-                mode_text = "默认模式 - 检查所有报告（包括APTS）"
-            
-            self.ui.result_text.append(f"当前分析模式: {mode_text}")
-            self.ui.result_text.append("点击'开始分析'按钮进行分析...")
+            self.on_report_path_selected(directory, "已选择目录")
+    
+    def select_archive(self):
+        """选择ZIP报告包（tradefed结果压缩包，可嵌套）"""
+        archive_path, _ = QFileDialog.getOpenFileName(
+            self.ui,
+            "选择ZIP报告包",
+            "",
+            "ZIP报告包 (*.zip)"
+        )
+        
+        if archive_path:
+            self.on_report_path_selected(archive_path, "已选择ZIP报告包")
+    
+    def on_report_path_selected(self, path, prompt):
+        """选中报告目录或ZIP报告包后更新界面"""
+        abs_path = os.path.abspath(path)
+        self.ui.directory_path.setText(abs_path)
+        self.ui.analyze_btn.setEnabled(True)
+        self.ui.result_text.clear()
+        self.ui.result_text.append(f"{prompt}: {abs_path}")
+        
+        # 显示当前分析模式
+        mode = self.ui.get_android_version_mode()
+        if mode == "GO":
+            mode_text = "GO版本模式 - 将检查APTS报告"
+        elif mode == "FULL":
+            mode_text = "FULL版本模式 - 不检查APTS报告"
+        else:
+            mode_text = "默认模式 - 检查所有报告（包括APTS）"
+        
+        self.ui.result_text.append(f"当前分析模式: {mode_text}")
+        self.ui.result_text.append("点击'开始分析'按钮进行分析...")
     
     def start_analysis(self):
         """开始分析报告"""
         directory = self.ui.directory_path.text()
         if not directory or not os.path.exists(directory):
-            QMessageBox.warning(self.ui, "错误", "请选择有效的目录!")
+            QMessageBox.warning(self.ui, "错误", "请选择有效的目录或ZIP报告包!")
             return
 
-        # ==================== 新增：处理之前的分析线程 ====================
-        if hasattr(self, 'analyzer') and self.analyzer is not None:
-            if self.analyzer.isRunning():
-                # 断开信号连接，避免旧线程触发回调
-                try:
-                    self.analyzer.analysis_finished.disconnect()
-                    self.analyzer.error_occurred.disconnect()
-                except TypeError:
-                    pass
-                # 请求线程退出（对于无事件循环的线程，quit()无效，但可调用wait()等待完成）
-                self.analyzer.quit()
-                if not self.analyzer.wait(2000):  # 等待最多2秒
-                    self.analyzer.terminate()     # 强制终止
-                    self.analyzer.wait()
-                self.analyzer.deleteLater()       # 安排Qt对象删除
-                self.analyzer = None
-        # ==================================================================
+        # 取消之前的分析线程（协作式取消，不阻塞界面，也不强制终止线程）
+        self.stop_analysis()
 
         # 禁用按钮
         self.ui.set_analysis_state(False)
@@ -103,11 +110,113 @@ class CheckupReportController:
         self.ui.result_text.append("=" * 50)
         
         # 创建并启动分析线程，传递check_apts参数
-        self.analyzer = ReportAnalyzer(directory, check_apts)
+        self.analyzer = ReportAnalyzer(directory, check_apts, record_history=self.ui.should_record_history(),
+                                       merge_results=self.ui.should_merge_results())
         self.analyzer.analysis_finished.connect(self.on_analysis_finished)
         self.analyzer.error_occurred.connect(self.on_analysis_error)
+        self.analyzer.progress.connect(self.ui.update_progress)
+        self.analyzer.performance_ready.connect(self.ui.update_performance)
         self.analyzer.start()
     
+    def stop_analysis(self):
+        """取消正在运行的分析线程"""
+        analyzer = self.analyzer
+        self.analyzer = None
+        if analyzer is None:
+            return
+        
+        # 断开信号连接，避免旧线程触发回调
+        for signal in (analyzer.analysis_finished, analyzer.error_occurred, analyzer.progress,
+                       analyzer.performance_ready):
+            try:
+                signal.disconnect()
+            except TypeError:
+                pass
+        
+        if analyzer.isRunning():
+            analyzer.cancel()
+            self.stopping_analyzers.append(analyzer)
+            analyzer.finished.connect(lambda: self.on_analyzer_stopped(analyzer))
+        else:
+            analyzer.deleteLater()
+    
+    def on_analyzer_stopped(self, analyzer):
+        """已取消的分析线程退出后释放"""
+        if analyzer in self.stopping_analyzers:
+            self.stopping_analyzers.remove(analyzer)
+        analyzer.deleteLater()
+    
+    def toggle_watch(self, checked):
+        """开始/停止监视目录"""
+        if checked:
+            self.start_watch()
+        else:
+            self.stop_watch()
+            self.ui.result_text.append("*** 监视已停止 ***")
+    
+    def start_watch(self):
+        """开始监视目录：先分析已有报告，之后新报告写入完成时自动重新分析"""
+        directory = self.ui.directory_path.text()
+        if not directory or not os.path.exists(directory):
+            self.ui.watch_btn.setChecked(False)
+            QMessageBox.warning(self.ui, "错误", "请选择有效的目录或ZIP报告包!")
+            return
+        
+        self.stop_analysis()
+        self.ui.clear_results()
+        self.ui.set_watch_state(True)
+        self.ui.result_text.append(f"开始监视: {directory}")
+        self.ui.result_text.append("新的报告文件写入完成后将自动重新分析（不写入历史记录）")
+        self.ui.result_text.append("=" * 50)
+        
+        self.watch_thread = ReportWatchThread(directory, self.ui.should_check_apts(),
+                                              merge_results=self.ui.should_merge_results())
+        self.watch_thread.analysis_finished.connect(self.on_watch_finished)
+        self.watch_thread.error_occurred.connect(self.on_watch_error)
+        self.watch_thread.performance_ready.connect(self.ui.update_performance)
+        self.watch_thread.watch_updated.connect(self.on_watch_updated)
+        self.watch_thread.start()
+    
+    def stop_watch(self):
+        """停止监视线程"""
+        watch_thread = self.watch_thread
+        self.watch_thread = None
+        self.ui.set_watch_state(False)
+        if watch_thread is None:
+            return
+        
+        for signal in (watch_thread.analysis_finished, watch_thread.error_occurred,
+                       watch_thread.performance_ready, watch_thread.watch_updated):
+            try:
+                signal.disconnect()
+            except TypeError:
+                pass
+        
+        if watch_thread.isRunning():
+            # 先连接finished再请求停止：空闲等待中的监视线程会立即退出
+            self.stopping_analyzers.append(watch_thread)
+            watch_thread.finished.connect(lambda: self.on_analyzer_stopped(watch_thread))
+            watch_thread.stop()
+        else:
+            watch_thread.deleteLater()
+    
+    def on_watch_finished(self, full_results, error_results):
+        """监视模式下的一次重新分析完成（已标记的PASS/FAIL状态保留）"""
+        scrollbar = self.ui.error_text.verticalScrollBar()
+        old_scroll_position = scrollbar.value()
+        self.ui.update_results(full_results, error_results)
+        scrollbar.setValue(old_scroll_position)
+    
+    def on_watch_error(self, error_msg):
+        """监视模式下分析出错：显示错误，继续监视"""
+        self.ui.handle_analysis_error(error_msg)
+        self.ui.set_watch_state(True)
+    
+    def on_watch_updated(self, status):
+        """在结果末尾追加本次更新的说明"""
+        self.ui.result_text.append("=" * 50)
+        self.ui.result_text.append(f"*** 监视更新 {status} ***")
+    
     def on_analysis_finished(self, full_results, error_results):
         """分析完成处理"""
         self.ui.update_results(full_results, error_results)
@@ -1,28 +1,32 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QHBoxLayout, 
                             QPushButton, QLineEdit, QTextEdit, QProgressBar,
                             QFrame, QMenu)
-from PyQt6.QtGui import QFont, QAction, QTextCursor
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import (QFont, QAction, QTextCursor, QTextDocument, QTextImageFormat,
+                         QTextCharFormat, QTextBlockFormat, QImage, QColor)
+from PyQt6.QtCore import Qt, QUrl
 from .CustomComboBox import CustomComboBox
+from .ResultView import ResultView
+from .ReportArchive import is_archive_file
+from .ErrorBlock import (parse_error_blocks, NO_ERROR_TEXT,
+                         STATUS_PENDING, STATUS_PASSED, STATUS_FAILED)
 import os
-import base64
-import re
+import bisect
 
 class CheckupReportUI(QWidget):
     """检查报告页面UI - 修复按钮选中状态显示问题"""
     
     def __init__(self):
         super().__init__()
-        # 错误状态存储：{错误块标识: "pending"/"passed"/"failed"}
-        self.error_status = {}
-        # 存储图片的Base64编码
-        self.image_base64 = {}
+        # 错误块列表（ErrorBlock，block_id即列表下标），状态保存在各错误块中
+        self.error_blocks = []
+        # 各错误块在错误文本框中的起始段落号（与error_blocks一一对应，升序）
+        self.error_block_starts = []
+        # 状态图片：{状态: QImage}，作为资源注册到错误文本框的文档中
+        self.status_images = {}
         # 分隔符
         self.delimiter = "=" * 100
         # 存储原始错误文本
         self.original_error_text = ""
-        # 存储错误块标识符映射
-        self.error_block_identifiers = {}
         # 跟踪分析状态
         self.is_analyzing = False
         self.setup_ui()
@@ -31,34 +35,25 @@ class CheckupReportUI(QWidget):
         self.load_images()
     
     def load_images(self):
-        """加载图片并转换为Base64编码"""
+        """加载状态图片（只加载一次，之后以文档资源的形式引用）"""
         image_files = {
-            "pending": "Pending.png",
-            "passed": "CheckPASS.png", 
-            "failed": "CheckFAIL.png"
+            STATUS_PENDING: "Pending.png",
+            STATUS_PASSED: "CheckPASS.png",
+            STATUS_FAILED: "CheckFAIL.png"
         }
         
         for status, filename in image_files.items():
             image_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
-            if os.path.exists(image_path):
-                try:
-                    with open(image_path, 'rb') as img_file:
-                        img_data = img_file.read()
-                        base64_data = base64.b64encode(img_data).decode('utf-8')
-                        
-                    # 根据图片类型设置MIME类型
-                    if filename.lower().endswith('.png'):
-                        mime_type = 'image/png'
-                    else:
-                        mime_type = 'image/png'  # 默认
-                    
-                    self.image_base64[status] = f"data:{mime_type};base64,{base64_data}"
-                except Exception as e:
-                    print(f"加载图片失败 {filename}: {e}")
-                    self.image_base64[status] = None
-            else:
+            if not os.path.exists(image_path):
                 print(f"图片文件不存在: {image_path}")
-                self.image_base64[status] = None
+                self.status_images[status] = None
+                continue
+            image = QImage(image_path)
+            if image.isNull():
+                print(f"加载图片失败 {filename}")
+                self.status_images[status] = None
+            else:
+                self.status_images[status] = image
     
     def setup_ui(self):
         """设置UI界面"""
@@ -82,6 +77,8 @@ class CheckupReportUI(QWidget):
         # 创建分析结果区域（占3/5）
         result_frame = self.create_text_area_frame("分析结果 (完整信息):", True)
         self.result_text = result_frame.text_edit
+        # 性能统计区域（默认折叠，位于分析结果下方）
+        self.create_performance_section(result_frame.layout())
         content_layout.addWidget(result_frame, 3)
         
         # 创建错误信息区域（占2/5）
@@ -149,7 +146,8 @@ class CheckupReportUI(QWidget):
         """处理目录路径变化 - 更新控件样式和启用状态"""
         path = text.strip()
         has_directory = bool(path)
-        path_exists = os.path.exists(path) and os.path.isdir(path) if has_directory else False
+        # 报告目录或tradefed结果ZIP包均可直接分析
+        path_exists = (os.path.isdir(path) or is_archive_file(path)) if has_directory else False
 
         # 1. 更新目录输入框的边框颜色
         if not has_directory:
@@ -168,8 +166,9 @@ class CheckupReportUI(QWidget):
                 }
             """)
 
-        # 2. 根据路径有效性启用分析按钮
+        # 2. 根据路径有效性启用分析按钮和监视按钮
         self.analyze_btn.setEnabled(path_exists)
+        self.watch_btn.setEnabled(path_exists)
 
         # 3. 更新“选择报告目录”按钮的背景色
         if path_exists:
@@ -206,7 +205,7 @@ class CheckupReportUI(QWidget):
         
         # 目录路径显示
         self.directory_path = QLineEdit()
-        self.directory_path.setPlaceholderText("请选择报告目录...")
+        self.directory_path.setPlaceholderText("请选择报告目录或ZIP报告包...")
         self.directory_path.setReadOnly(False)
         self.directory_path.setFixedHeight(36)
         self.directory_path.setStyleSheet(self.get_line_edit_style(False))  # 初始为蓝色边框
@@ -217,12 +216,25 @@ class CheckupReportUI(QWidget):
         self.select_directory_btn.setCheckable(False) 
         directory_layout.addWidget(self.select_directory_btn)
         
+        # 选择ZIP报告包按钮（直接分析压缩包，无需解压）
+        self.select_archive_btn = self.create_button("选择ZIP报告", 140)
+        self.select_archive_btn.setCheckable(False)
+        directory_layout.addWidget(self.select_archive_btn)
+        
         # Android版本选择器
         android_versions = ["GO 版本", "FULL 版本"]
         self.android_version_combo = CustomComboBox(android_versions)
         self.android_version_combo.setFixedSize(140, 36)
         directory_layout.addWidget(self.android_version_combo)
         
+        # 合并分片/重试结果开关（选中时按同一套件最后一次执行的结果检查FAIL数，需完整读取结果XML，默认关闭）
+        self.merge_btn = self.create_button("合并分片结果", 140)
+        directory_layout.addWidget(self.merge_btn)
+        
+        # 记录历史开关（选中时分析结果写入历史记录，并与同产品的前几个构建对比，默认关闭）
+        self.history_btn = self.create_button("记录历史", 140)
+        directory_layout.addWidget(self.history_btn)
+        
         # 分析按钮 - 特别注意这里
         self.analyze_btn = QPushButton("开始分析")
         self.analyze_btn.setFixedSize(140, 36)
@@ -231,6 +243,11 @@ class CheckupReportUI(QWidget):
         self.analyze_btn.setEnabled(False)
         directory_layout.addWidget(self.analyze_btn)
         
+        # 监视目录按钮（选中时持续监视，新报告写入完成后自动重新分析）
+        self.watch_btn = self.create_button("监视目录", 140)
+        self.watch_btn.setEnabled(False)
+        directory_layout.addWidget(self.watch_btn)
+        
         # 清空记录按钮
         self.clear_btn = self.create_button("清空记录", 140)
         directory_layout.addWidget(self.clear_btn)
@@ -259,14 +276,57 @@ class CheckupReportUI(QWidget):
         label.setContentsMargins(0, 0 if is_result else 0, 0, 3)
         layout.addWidget(label)
         
-        # 创建文本框
-        text_edit = self.create_text_edit(is_result)
+        # 创建文本框（分析结果可达数万行，使用模型/视图的结果视图）
+        if is_result:
+            text_edit = ResultView()
+            text_edit.setPlaceholderText("分析结果将显示在这里...")
+            text_edit.setStyleSheet(self.get_status_text_style(False, "QListView"))
+        else:
+            text_edit = self.create_text_edit(is_result)
         layout.addWidget(text_edit)
         
         # 将文本框保存为属性以便访问
         frame.text_edit = text_edit
         return frame
     
+    def create_performance_section(self, layout):
+        """创建可折叠的"性能统计"区域"""
+        self.performance_toggle = QPushButton("▶ 性能统计")
+        self.performance_toggle.setCheckable(True)
+        self.performance_toggle.setEnabled(False)
+        self.performance_toggle.setStyleSheet("""
+            QPushButton {
+                border: none;
+                background: transparent;
+                color: #2c3e50;
+                font-size: 12px;
+                text-align: left;
+                padding: 2px 4px;
+            }
+            QPushButton:disabled {
+                color: #95a5a6;
+            }
+        """)
+        self.performance_toggle.toggled.connect(self.on_performance_toggled)
+        layout.addWidget(self.performance_toggle)
+        
+        self.performance_text = self.create_text_edit(True)
+        self.performance_text.setPlaceholderText("")
+        self.performance_text.setMinimumHeight(0)
+        self.performance_text.setMaximumHeight(160)
+        self.performance_text.setVisible(False)
+        layout.addWidget(self.performance_text)
+    
+    def on_performance_toggled(self, checked):
+        """展开/折叠性能统计"""
+        self.performance_text.setVisible(checked)
+        self.performance_toggle.setText(("▼" if checked else "▶") + " 性能统计")
+    
+    def update_performance(self, performance_text):
+        """显示本次分析的性能统计（保持当前的展开/折叠状态）"""
+        self.performance_text.setPlainText(performance_text)
+        self.performance_toggle.setEnabled(bool(performance_text))
+    
     def create_text_edit(self, is_result=True):
         """创建文本框 - 修复占位文本显示不完整问题"""
         text_edit = QTextEdit()
@@ -397,11 +457,11 @@ class CheckupReportUI(QWidget):
                 }
             """
     
-    def get_status_text_style(self, has_output=False):
-        """获取状态文本框样式"""
+    def get_status_text_style(self, has_output=False, widget_type="QTextEdit"):
+        """获取状态文本框样式（widget_type为样式选择器，分析结果视图为QListView）"""
         if has_output:
             return """
-                QTextEdit {
+                %s {
                     background-color: rgba(255, 255, 255, 0.8);
                     border: 2px solid #27ae60;
                     border-radius: 8px;
@@ -410,10 +470,10 @@ class CheckupReportUI(QWidget):
                     color: #2c3e50;
                     font-family: "Consolas", "Monaco", "Courier New", monospace;
                 }
-            """
+            """ % widget_type
         else:
             return """
-                QTextEdit {
+                %s {
                     background-color: rgba(255, 255, 255, 0.8);
                     border: 2px solid #39C5BB;
                     border-radius: 8px;
@@ -422,7 +482,7 @@ class CheckupReportUI(QWidget):
                     color: #2c3e50;
                     font-family: "Consolas", "Monaco", "Courier New", monospace;
                 }
-            """
+            """ % widget_type
     
     def update_apts_check_status(self, version_text):
         """根据选择的Android版本更新APTS检查状态"""
@@ -458,9 +518,18 @@ class CheckupReportUI(QWidget):
             return False
         return True  # 默认检查
     
+    def should_merge_results(self):
+        """是否合并同一套件的分片/重试结果"""
+        return self.merge_btn.isChecked()
+    
+    def should_record_history(self):
+        """是否将分析结果写入历史记录"""
+        return self.history_btn.isChecked()
+    
     def set_analysis_state(self, enabled):
         """设置分析状态 - 修复分析完成后的状态显示"""
         self.select_directory_btn.setEnabled(enabled)
+        self.select_archive_btn.setEnabled(enabled)
         self.analyze_btn.setEnabled(enabled)
         
         if enabled:
@@ -482,19 +551,36 @@ class CheckupReportUI(QWidget):
         # 强制更新样式
         self.force_button_style_update()
     
+    def set_watch_state(self, watching):
+        """设置监视状态 - 监视期间不能更换目录，也不能手动分析"""
+        self.directory_path.setReadOnly(watching)
+        self.select_directory_btn.setEnabled(not watching)
+        self.select_archive_btn.setEnabled(not watching)
+        self.android_version_combo.setEnabled(not watching)
+        self.merge_btn.setEnabled(not watching)
+        self.history_btn.setEnabled(not watching)
+        self.analyze_btn.setEnabled(not watching)
+        self.watch_btn.setChecked(watching)
+        self.watch_btn.setText("停止监视" if watching else "监视目录")
+        self.watch_btn.style().unpolish(self.watch_btn)
+        self.watch_btn.style().polish(self.watch_btn)
+    
     def clear_results(self):
         """清空分析结果和错误信息"""
         self.result_text.clear()
         self.result_text.setPlaceholderText("分析结果将显示在这里...")
         self.error_text.clear()
         self.error_text.setPlaceholderText("错误信息将显示在这里...")
+        self.performance_text.clear()
+        self.performance_toggle.setEnabled(False)
+        self.progress_bar.setVisible(False)
         # 清空错误状态
-        self.error_status.clear()
+        self.error_blocks = []
+        self.error_block_starts = []
         self.original_error_text = ""
-        self.error_block_identifiers.clear()
         
         # 重置文本框边框为默认蓝色
-        self.result_text.setStyleSheet(self.get_status_text_style(False))
+        self.result_text.setStyleSheet(self.get_status_text_style(False, "QListView"))
         self.error_text.setStyleSheet(self.get_status_text_style(False))
         
         # 重置目录路径边框为蓝色（如果没有目录）
@@ -503,183 +589,151 @@ class CheckupReportUI(QWidget):
     
     def update_results(self, full_results, error_results):
         """更新分析结果和错误信息"""
+        self.progress_bar.setVisible(False)
         self.result_text.setPlainText(full_results)
         
         # 保存原始错误文本
         self.original_error_text = error_results
         
-        # 处理错误信息，添加图片
-        formatted_errors = self.format_errors_with_status(error_results)
-        self.error_text.setHtml(formatted_errors)  # 使用setHtml而不是setPlainText
-        
-        # 初始化所有错误块的状态为"pending"
-        self.initialize_error_status(error_results)
+        # 拆分为错误块（初始状态均为pending），带状态图片显示；
+        # 监视模式下重新分析时，已人工核对过的同一错误保留原状态
+        previous_status = {block.identifier: block.status for block in self.error_blocks}
+        self.error_blocks = parse_error_blocks(error_results, self.delimiter)
+        for block in self.error_blocks:
+            block.status = previous_status.get(block.identifier, block.status)
+        if NO_ERROR_TEXT in error_results:
+            self.error_block_starts = []
+            self.error_text.setPlainText(error_results)
+        else:
+            self.render_error_blocks()
         
         # 根据是否有内容更新文本框边框样式
         has_result_content = bool(full_results.strip())
-        has_error_content = bool(error_results.strip()) and error_results != "没有发现错误"
+        has_error_content = bool(error_results.strip()) and error_results != NO_ERROR_TEXT
         
-        self.result_text.setStyleSheet(self.get_status_text_style(has_result_content))
+        self.result_text.setStyleSheet(self.get_status_text_style(has_result_content, "QListView"))
         self.error_text.setStyleSheet(self.get_status_text_style(has_error_content))
     
-    def format_errors_with_status(self, error_text):
-        """根据错误状态格式化错误信息为HTML - 支持错误和警告"""
-        if "没有发现错误" in error_text:
-            return error_text
-        
-        # 按分隔符分割错误信息
-        blocks = error_text.split(self.delimiter)
-        formatted_blocks = []
-        
-        for block in blocks:
-            block = block.strip()
-            if not block:
-                continue
-                
-            # 检查这个块是否包含错误信息或警告信息
-            if any(marker in block for marker in ['❌', '⚠️']):
-                # 这是一个错误或警告块，使用清理后的文本作为标识
-                block_identifier = self.clean_error_text(block)
-                    
-                status = self.error_status.get(block_identifier, "pending")
-                image_html = self.get_image_html(status)
-                
-                # 根据状态设置颜色
-                color_style = ""
-                if status == "passed":
-                    color_style = "color: #27ae60;"  # 绿色
-                    # 将❌和⚠️替换为✅
-                    block = block.replace('❌', '✅').replace('⚠️', '✅')
-                elif status == "failed":
-                    color_style = "color: #E91E63;"  # 红色
-                    # 将❌和⚠️替换为❌（保持为❌，不替换为图片）
-                    # 这样确保后续仍然可以识别这个错误块
-                    block = block.replace('❌', '❌').replace('⚠️', '❌')
-                else:  # pending
-                    color_style = "color: #2c3e50;"  # 默认颜色
-                    # 对于pending状态，确保使用原始符号
-                    # 这里不需要替换，因为原始文本已经包含❌和⚠️
-                
-                # 添加图片和分隔符，然后添加处理后的块内容
-                formatted_block = f"{image_html}{self.delimiter}\n<span style='{color_style}'>{block}</span>"
-                formatted_blocks.append(formatted_block)
-        
-        # 在最后添加一个分隔符
-        if formatted_blocks:
-            formatted_blocks.append(self.delimiter)
-        
-        # 使用等宽字体显示
-        html_content = "<pre style='font-family: \"Courier New\", Monaco, Consolas, monospace; font-size: 12px;'>" + "\n".join(formatted_blocks) + "</pre>"
-        return html_content
-    
-    def get_image_html(self, status):
-        """根据状态获取图片的HTML"""
-        base64_data = self.image_base64.get(status)
-        
-        if base64_data:
-            # 使用Base64编码的图片
-            return f"<img src='{base64_data}' width='16' height='16' style='vertical-align: middle; margin-right: 5px;'>"
+    def update_progress(self, files_done, files_total, bytes_done):
+        """更新分析进度条，files_total为0时显示为忙碌状态（正在遍历目录）"""
+        self.progress_bar.setVisible(True)
+        if files_total <= 0:
+            self.progress_bar.setRange(0, 0)
+            return
+        self.progress_bar.setRange(0, files_total)
+        self.progress_bar.setValue(files_done)
+        self.progress_bar.setFormat(f"{files_done}/{files_total} 个文件  {bytes_done / (1024 * 1024):.1f} MB")
+    
+    def render_error_blocks(self):
+        """完整绘制错误文本框：每个错误块为"状态图片+分隔符"一行，随后是块内容，最后一条分隔符"""
+        self.error_text.clear()
+        document = self.error_text.document()
+        # 状态图片只注册一次，各错误块通过URL引用同一资源
+        for status, image in self.status_images.items():
+            if image is not None:
+                document.addResource(QTextDocument.ResourceType.ImageResource,
+                                     self.get_status_image_url(status), image)
+        
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        self.error_block_starts = []
+        for error_block in self.error_blocks:
+            if self.error_block_starts:
+                cursor.insertBlock()
+            self.error_block_starts.append(cursor.blockNumber())
+            self.insert_error_block(cursor, error_block)
+        if self.error_blocks:
+            cursor.insertBlock()
+            cursor.insertText(self.delimiter, self.get_error_char_format())
+        cursor.endEditBlock()
+    
+    def insert_error_block(self, cursor, error_block):
+        """在光标处插入一个错误块（段落数为 1 + error_block.line_count）"""
+        block_format = QTextBlockFormat()
+        block_format.setNonBreakableLines(True)  # 与<pre>一致，不自动换行
+        cursor.setBlockFormat(block_format)
+        
+        image = self.status_images.get(error_block.status)
+        if image is not None:
+            image_format = QTextImageFormat()
+            image_format.setName(self.get_status_image_url(error_block.status).toString())
+            image_format.setWidth(16)
+            image_format.setHeight(16)
+            image_format.setVerticalAlignment(QTextImageFormat.VerticalAlignment.AlignMiddle)
+            cursor.insertImage(image_format)
         else:
             # 图片不存在，使用文本替代
             text_map = {
-                "pending": "[PENDING]",
-                "passed": "[PASS]", 
-                "failed": "[FAIL]"
+                STATUS_PENDING: "[PENDING]",
+                STATUS_PASSED: "[PASS]",
+                STATUS_FAILED: "[FAIL]"
             }
-            return f"<span style='color: gray; font-weight: bold;'>{text_map.get(status, '')}</span>"
+            placeholder_format = self.get_error_char_format("gray")
+            placeholder_format.setFontWeight(QFont.Weight.Bold)
+            cursor.insertText(text_map.get(error_block.status, ""), placeholder_format)
+        cursor.insertText(self.delimiter, self.get_error_char_format())
+        
+        # 根据状态设置颜色：通过为绿色，失败为红色，待核对为默认颜色
+        colors = {
+            STATUS_PASSED: "#27ae60",
+            STATUS_FAILED: "#E91E63",
+            STATUS_PENDING: "#2c3e50"
+        }
+        text_format = self.get_error_char_format(colors.get(error_block.status))
+        for line in error_block.display_text().split("\n"):
+            cursor.insertBlock(block_format)
+            cursor.insertText(line, text_format)
     
-    def initialize_error_status(self, error_text):
-        """初始化错误状态 - 支持错误和警告"""
-        if "没有发现错误" in error_text:
-            return
-        
-        # 按分隔符分割错误信息
-        blocks = error_text.split(self.delimiter)
-        
-        for block in blocks:
-            block = block.strip()
-            if not block:
-                continue
-                
-            # 检查这个块是否包含错误信息或警告信息
-            if any(marker in block for marker in ['❌', '⚠️']):
-                # 获取标识 - 使用清理后的文本
-                block_identifier = self.clean_error_text(block)
-                    
-                if block_identifier and block_identifier not in self.error_status:
-                    self.error_status[block_identifier] = "pending"
-                    # 保存标识符映射
-                    self.error_block_identifiers[block_identifier] = block
+    def update_error_block(self, error_block):
+        """只重绘一个错误块，其他错误块和滚动位置保持不变"""
+        document = self.error_text.document()
+        start = self.error_block_starts[error_block.block_id]
+        first = document.findBlockByNumber(start)
+        last = document.findBlockByNumber(start + error_block.line_count)
+        
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        cursor.setPosition(first.position())
+        cursor.setPosition(last.position() + last.length() - 1, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        # 段落数与原来相同，其他错误块的起始段落号不变
+        self.insert_error_block(cursor, error_block)
+        cursor.endEditBlock()
+    
+    def get_error_char_format(self, color=None):
+        """错误文本框使用的等宽字体格式"""
+        char_format = QTextCharFormat()
+        font = QFont()
+        font.setFamilies(["Courier New", "Monaco", "Consolas", "monospace"])
+        font.setPixelSize(12)
+        char_format.setFont(font)
+        if color:
+            char_format.setForeground(QColor(color))
+        return char_format
+    
+    @staticmethod
+    def get_status_image_url(status):
+        """状态图片在文档中的资源URL"""
+        return QUrl(f"checkup-status:{status}")
+    
+    def find_error_block(self, block_number):
+        """根据段落号查找所在的错误块（含其状态图片与分隔符所在行），不在任何错误块中时返回None"""
+        index = bisect.bisect_right(self.error_block_starts, block_number) - 1
+        if index < 0:
+            return None
+        error_block = self.error_blocks[index]
+        if block_number > self.error_block_starts[index] + error_block.line_count:
+            return None
+        return error_block
     
     def show_error_context_menu(self, position):
         """显示错误信息的右键菜单 - 支持在任何行点击，包括已标记状态的块"""
-        # 获取光标位置
+        # 获取光标位置所在段落对应的错误块
         cursor = self.error_text.cursorForPosition(position)
+        error_block = self.find_error_block(cursor.blockNumber())
+        error_block_key = error_block.block_id if error_block is not None else None
         
-        # 获取当前块号
-        block_number = cursor.blockNumber()
-        
-        # 获取文档
-        document = self.error_text.document()
-        
-        # 查找当前块所属的错误块
-        error_block_key = None
-        
-        # 向上查找分隔符
-        start_index = -1
-        for i in range(block_number, -1, -1):
-            block = document.findBlockByNumber(i)
-            text = block.text().strip()
-            if self.delimiter in text:
-                start_index = i
-                break
-        
-        # 向下查找分隔符
-        end_index = -1
-        if start_index != -1:
-            for i in range(start_index + 1, document.blockCount()):
-                block = document.findBlockByNumber(i)
-                text = block.text().strip()
-                if self.delimiter in text:
-                    end_index = i
-                    break
-        
-        # 提取错误块内容
-        if start_index != -1 and end_index != -1:
-            error_block_lines = []
-            for i in range(start_index + 1, end_index):
-                block = document.findBlockByNumber(i)
-                text = block.text().strip()
-                if text:
-                    error_block_lines.append(text)
-            
-            if error_block_lines:
-                # 使用整个错误块内容作为标识符
-                error_block_content = "\n".join(error_block_lines)
-                
-                # 在错误状态中查找匹配的块
-                for key in self.error_status.keys():
-                    # 创建一个清理后的版本进行比较，移除状态符号
-                    clean_key = self.clean_error_text(key)
-                    clean_content = self.clean_error_text(error_block_content)
-                    
-                    # 检查清理后的内容是否匹配
-                    if clean_content in clean_key or clean_key in clean_content:
-                        error_block_key = key
-                        break
-                
-                # 如果没有找到匹配的键，尝试使用保存的标识符映射
-                if not error_block_key:
-                    for key, original_block in self.error_block_identifiers.items():
-                        clean_key = self.clean_error_text(key)
-                        clean_content = self.clean_error_text(error_block_content)
-                        
-                        # 检查清理后的内容是否匹配
-                        if clean_content in clean_key or clean_key in clean_content:
-                            error_block_key = key
-                            break
-        
-        if error_block_key:
+        if error_block_key is not None:
             menu = QMenu(self)
             
             # 设置菜单样式 - 蓝色背景，悬停时文字变绿色
@@ -715,9 +769,9 @@ class CheckupReportUI(QWidget):
             mark_fail_action = QAction("标记为失败(FAIL)", self)
             reset_action = QAction("重置状态", self)
             
-            mark_pass_action.triggered.connect(lambda: self.mark_error_status(error_block_key, "passed"))
-            mark_fail_action.triggered.connect(lambda: self.mark_error_status(error_block_key, "failed"))
-            reset_action.triggered.connect(lambda: self.mark_error_status(error_block_key, "pending"))
+            mark_pass_action.triggered.connect(lambda: self.mark_error_status(error_block_key, STATUS_PASSED))
+            mark_fail_action.triggered.connect(lambda: self.mark_error_status(error_block_key, STATUS_FAILED))
+            reset_action.triggered.connect(lambda: self.mark_error_status(error_block_key, STATUS_PENDING))
             
             menu.addAction(mark_pass_action)
             menu.addAction(mark_fail_action)
@@ -725,34 +779,26 @@ class CheckupReportUI(QWidget):
             
             menu.exec(self.error_text.mapToGlobal(position))
     
-    def clean_error_text(self, text):
-        """清理错误文本，移除状态符号"""
-        # 移除所有状态符号
-        cleaned = text.replace('❌', '').replace('⚠️', '').replace('✅', '')
-        # 移除状态图片的HTML标签
-        cleaned = re.sub(r'<img[^>]*>', '', cleaned)
-        # 移除多余的空白字符
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        return cleaned
-    
-    def mark_error_status(self, block_key, status):
-        """标记错误状态"""
+    def mark_error_status(self, block_id, status):
+        """标记错误状态，只重绘该错误块"""
+        error_block = self.error_blocks[block_id]
+        if error_block.status == status:
+            return
+        
         # 保存当前的滚动位置
         scrollbar = self.error_text.verticalScrollBar()
         old_scroll_position = scrollbar.value()
         
-        # 设置新的状态
-        self.error_status[block_key] = status
-        
-        # 使用原始错误文本重新格式化错误信息
-        formatted_errors = self.format_errors_with_status(self.original_error_text)
-        self.error_text.setHtml(formatted_errors)
+        error_block.status = status
+        self.update_error_block(error_block)
         
         # 恢复滚动位置
         scrollbar.setValue(old_scroll_position)
     
     def handle_analysis_error(self, error_message):
         """处理分析过程中出现的错误 - 保持选中状态"""
+        self.error_blocks = []
+        self.error_block_starts = []
         self.error_text.setPlainText(error_message)
         self.progress_bar.setVisible(False)
         # 分析出错时，按钮保持选中状态但显示错误状态
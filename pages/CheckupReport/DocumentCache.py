@@ -0,0 +1,173 @@
+import io
+import sys
+import threading
+import contextlib
+from collections import OrderedDict
+
+from .ReportArchive import open_report
+
+# 单次分析中缓存的文档内容上限（字节）
+DEFAULT_DOCUMENT_BUDGET = 256 * 1024 * 1024
+
+_current = threading.local()
+
+
+class DocumentCache:
+    """单次分析内的文档缓存 - 每个报告文件只读取、解码一次
+
+    按需加载原始字节、解码后的文本以及解析视图（如XML根元素），
+    总大小超过预算时按最近最少使用（LRU）淘汰。
+    通过activate()在当前线程激活后，read_report_bytes/read_report_text/
+    get_document_view/open_document会自动使用缓存；未激活时直接读取文件。
+    """
+
+    def __init__(self, budget=DEFAULT_DOCUMENT_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # {(路径, 形式): (值, 大小)}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def activate(self):
+        """在当前线程中激活缓存"""
+        previous = getattr(_current, "cache", None)
+        _current.cache = self
+        try:
+            yield self
+        finally:
+            _current.cache = previous
+
+    def peek(self, path, form):
+        """查询缓存（命中时更新LRU顺序），未命中返回None"""
+        key = (path, form)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get(self, path, form, loader, size_of=sys.getsizeof):
+        """获取缓存值，未命中时调用loader()加载并放入缓存"""
+        value = self.peek(path, form)
+        if value is not None:
+            return value
+        value = loader()
+        with self._lock:
+            self.misses += 1
+        self.put(path, form, value, size_of(value))
+        return value
+
+    def put(self, path, form, value, size=None):
+        """放入缓存（如预读取得到的原始字节）"""
+        if size is None:
+            size = sys.getsizeof(value)
+        with self._lock:
+            # 单个文档超过预算时不缓存
+            if size > self.budget:
+                return
+            key = (path, form)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.budget:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def load_bytes(self, path):
+        """获取报告文件的原始字节（未缓存时读取文件）"""
+        return self.get(path, "bytes", lambda: _load_bytes(path))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+def current_document_cache():
+    """当前线程激活的文档缓存（未激活时为None）"""
+    return getattr(_current, "cache", None)
+
+
+def _load_bytes(path):
+    with open_report(path, 'rb') as f:
+        return f.read()
+
+
+def _decode_text(data, encoding):
+    # 与文本模式打开文件一致（含换行符转换）
+    with io.TextIOWrapper(io.BytesIO(data), encoding=encoding) as text_file:
+        return text_file.read()
+
+
+def read_report_bytes(path):
+    """读取报告文件的全部字节"""
+    cache = current_document_cache()
+    if cache is None:
+        return _load_bytes(path)
+    return cache.load_bytes(path)
+
+
+def read_report_text(path, encoding="utf-8"):
+    """读取报告文件的全部文本（按文本模式打开文件的方式解码）"""
+    cache = current_document_cache()
+    if cache is None:
+        with open_report(path, 'r', encoding=encoding) as f:
+            return f.read()
+
+    def load():
+        data = cache.peek(path, "bytes")
+        if data is None:
+            data = _load_bytes(path)
+        return _decode_text(data, encoding)
+
+    return cache.get(path, ("text", encoding), load)
+
+
+def get_document_view(path, name, factory):
+    """获取报告文件的解析视图（如XML根元素），同一文件的同名视图只构建一次
+
+    Args:
+        factory: factory(原始字节) -> 解析结果
+    """
+    cache = current_document_cache()
+    if cache is None:
+        return factory(_load_bytes(path))
+    data_size = []
+
+    def load():
+        data = read_report_bytes(path)
+        data_size.append(len(data))
+        return factory(data)
+
+    # 解析视图的内存占用按源文件大小估算
+    return cache.get(path, ("view", name), load, size_of=lambda _: data_size[0] if data_size else 0)
+
+
+@contextlib.contextmanager
+def open_document(path, mode='rb', encoding=None):
+    """打开报告文件：已缓存全文时从内存读取，否则直接打开文件（不加载全文，适合流式读取）"""
+    cache = current_document_cache()
+    if cache is not None:
+        if 'b' in mode:
+            data = cache.peek(path, "bytes")
+            if data is not None:
+                yield io.BytesIO(data)
+                return
+        else:
+            text = cache.peek(path, ("text", encoding or "utf-8"))
+            if text is not None:
+                yield io.StringIO(text)
+                return
+            data = cache.peek(path, "bytes")
+            if data is not None:
+                with io.TextIOWrapper(io.BytesIO(data), encoding=encoding) as text_file:
+                    yield text_file
+                return
+    with open_report(path, mode, encoding) as f:
+        yield f
@@ -0,0 +1,56 @@
+import re
+from dataclasses import dataclass
+
+# 错误块的人工核对状态
+STATUS_PENDING = "pending"
+STATUS_PASSED = "passed"
+STATUS_FAILED = "failed"
+
+ERROR_MARKERS = ('❌', '⚠️')
+NO_ERROR_TEXT = "没有发现错误"
+
+
+def clean_error_text(text):
+    """清理错误文本，移除状态符号"""
+    # 移除所有状态符号
+    cleaned = text.replace('❌', '').replace('⚠️', '').replace('✅', '')
+    # 移除状态图片的HTML标签
+    cleaned = re.sub(r'<img[^>]*>', '', cleaned)
+    # 移除多余的空白字符
+    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    return cleaned
+
+
+@dataclass
+class ErrorBlock:
+    """错误信息中的一个错误/警告块（两条分隔符之间的内容）"""
+    block_id: int
+    text: str
+    # 移除状态符号后的文本，用于识别同一错误
+    identifier: str
+    status: str = STATUS_PENDING
+
+    @property
+    def line_count(self):
+        return self.text.count("\n") + 1
+
+    def display_text(self):
+        """按状态替换符号后的显示文本（行数与原文本相同）"""
+        if self.status == STATUS_PASSED:
+            return self.text.replace('❌', '✅').replace('⚠️', '✅')
+        if self.status == STATUS_FAILED:
+            # 保持为❌，确保仍然可以识别这个错误块
+            return self.text.replace('⚠️', '❌')
+        return self.text
+
+
+def parse_error_blocks(error_text, delimiter):
+    """按分隔符拆分错误信息，返回包含❌/⚠️的错误块列表（按出现顺序编号）"""
+    if NO_ERROR_TEXT in error_text:
+        return []
+    blocks = []
+    for block in error_text.split(delimiter):
+        block = block.strip()
+        if block and any(marker in block for marker in ERROR_MARKERS):
+            blocks.append(ErrorBlock(len(blocks), block, clean_error_text(block)))
+    return blocks
@@ -0,0 +1,244 @@
+import os
+import hashlib
+import sqlite3
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+from .ReportArchive import ARCHIVE_SEPARATOR, is_archive_file, report_signature
+from .DocumentCache import open_document
+from .ReportCache import get_default_cache_path
+from ..common.CancellationToken import check_cancelled
+
+# 提取逻辑变更时递增，使已建立的索引自动重建
+INDEX_VERSION = 1
+INDEX_FILE_NAME = "checkup_failed_tests.db"
+# 堆栈哈希取SHA1前16位，用于归并相同原因的失败
+TRACE_HASH_LENGTH = 16
+
+FailedTest = namedtuple("FailedTest", "path suite module abi testcase test message trace_hash")
+
+
+def trace_hash(stack_trace):
+    """计算堆栈哈希（空堆栈返回空字符串）"""
+    stack_trace = (stack_trace or "").strip()
+    if not stack_trace:
+        return ""
+    return hashlib.sha1(stack_trace.encode("utf-8", "replace")).hexdigest()[:TRACE_HASH_LENGTH]
+
+
+def iter_failed_tests(xml_file):
+    """流式读取test_result.xml中的失败用例
+
+    使用iterparse逐个处理<Module>/<TestCase>/<Test>，处理完即清空元素，
+    内存占用与文件大小（测试用例数量）无关。
+
+    Yields:
+        tuple: (suite, module, abi, testcase, test, message, trace_hash)
+    """
+    suite = ""
+    module = ""
+    abi = ""
+    testcase = ""
+    root = None
+    with open_document(xml_file, 'rb') as xmlf:
+        for event, elem in ET.iterparse(xmlf, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == "Module":
+                    module = elem.get("name", "")
+                    abi = elem.get("abi", "")
+                elif tag == "TestCase":
+                    testcase = elem.get("name", "")
+                elif tag == "Result" and root is None:
+                    root = elem
+                    suite = elem.get("suite_name", "")
+                continue
+
+            if tag == "Test":
+                check_cancelled()
+                if elem.get("result") == "fail":
+                    failure = elem.find("Failure")
+                    message = ""
+                    stack_trace = ""
+                    if failure is not None:
+                        message = failure.get("message", "")
+                        stack_trace = failure.findtext("StackTrace", "")
+                    yield suite, module, abi, testcase, elem.get("name", ""), message, trace_hash(stack_trace)
+                elem.clear()
+            elif tag == "TestCase":
+                elem.clear()
+            elif tag == "Module":
+                elem.clear()
+                # 已处理完的Module不再保留在根元素下
+                if root is not None:
+                    root.clear()
+
+
+class FailedTestIndex:
+    """失败用例索引 - 将各test_result.xml中的失败用例写入带索引的SQLite表
+
+    按 路径+大小+修改时间+索引版本 判断报告是否变化，未变化的报告不重复提取。
+    界面和命令行可直接按套件/模块/用例名过滤查询，无需再打开原始XML。
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_default_cache_path(INDEX_FILE_NAME)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS result_files (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                index_version INTEGER NOT NULL,
+                failed_count INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS failed_tests (
+                file_id INTEGER NOT NULL,
+                suite TEXT NOT NULL,
+                module TEXT NOT NULL,
+                abi TEXT NOT NULL,
+                testcase TEXT NOT NULL,
+                test TEXT NOT NULL,
+                message TEXT NOT NULL,
+                trace_hash TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_failed_tests_file ON failed_tests (file_id);
+            CREATE INDEX IF NOT EXISTS idx_failed_tests_module ON failed_tests (suite, module);
+            CREATE INDEX IF NOT EXISTS idx_failed_tests_test ON failed_tests (test);
+            CREATE INDEX IF NOT EXISTS idx_failed_tests_trace ON failed_tests (trace_hash);
+        """)
+        return conn
+
+    def index_reports(self, xml_files):
+        """提取多个报告的失败用例
+
+        Returns:
+            tuple: (失败用例总数, 出错信息列表)
+        """
+        total = 0
+        errors = []
+        for xml_file in xml_files:
+            check_cancelled()
+            try:
+                total += self.index_report(xml_file)
+            except (ET.ParseError, OSError, sqlite3.Error, ValueError) as e:
+                errors.append(f"⚠️ 失败用例提取出错 {xml_file}: {str(e)}")
+        return total, errors
+
+    def index_report(self, xml_file):
+        """提取单个报告的失败用例（报告未变化时直接返回已索引的数量）"""
+        signature = report_signature(xml_file)
+        if signature is None:
+            raise OSError(f"无法读取报告文件: {xml_file}")
+        size, mtime_ns = signature
+
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id, size, mtime_ns, index_version, failed_count FROM result_files WHERE path = ?",
+                (xml_file,)
+            ).fetchone()
+            if row is not None and row[1:4] == (size, mtime_ns, INDEX_VERSION):
+                return row[4]
+
+            # 整个报告在一个事务内写入，取消或解析出错时回滚，不留下半份数据
+            with conn:
+                if row is not None:
+                    conn.execute("DELETE FROM failed_tests WHERE file_id = ?", (row[0],))
+                    conn.execute("DELETE FROM result_files WHERE id = ?", (row[0],))
+                file_id = conn.execute(
+                    "INSERT INTO result_files (path, size, mtime_ns, index_version, failed_count) "
+                    "VALUES (?, ?, ?, ?, 0)",
+                    (xml_file, size, mtime_ns, INDEX_VERSION)
+                ).lastrowid
+                cursor = conn.executemany(
+                    "INSERT INTO failed_tests (file_id, suite, module, abi, testcase, test, message, trace_hash) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    ((file_id,) + failed for failed in iter_failed_tests(xml_file))
+                )
+                failed_count = cursor.rowcount
+                conn.execute("UPDATE result_files SET failed_count = ? WHERE id = ?", (failed_count, file_id))
+            return failed_count
+        finally:
+            conn.close()
+
+    def query(self, root=None, suite=None, module=None, keyword=None, trace=None, limit=None):
+        """查询失败用例
+
+        Args:
+            root: 只返回该报告目录或ZIP报告包内的失败用例
+            suite: 测试套件名（如CTS，不区分大小写）
+            module: 模块名（包含匹配）
+            keyword: 匹配TestCase或Test名称（包含匹配）
+            trace: 堆栈哈希
+            limit: 最多返回的条数
+
+        Returns:
+            list: [FailedTest, ...]，按报告路径和文件内顺序排列
+        """
+        where, params = self._build_filter(root, suite, module, keyword, trace)
+        sql = ("SELECT f.path, t.suite, t.module, t.abi, t.testcase, t.test, t.message, t.trace_hash "
+               "FROM failed_tests t JOIN result_files f ON f.id = t.file_id" + where +
+               " ORDER BY f.path, t.rowid")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        if not os.path.exists(self.db_path):
+            return []
+        conn = self._connect()
+        try:
+            return [FailedTest(*row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def count(self, root=None, suite=None, module=None, keyword=None, trace=None):
+        """统计满足条件的失败用例数量"""
+        where, params = self._build_filter(root, suite, module, keyword, trace)
+        if not os.path.exists(self.db_path):
+            return 0
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT COUNT(*) FROM failed_tests t JOIN result_files f ON f.id = t.file_id" + where,
+                params
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _like_pattern(text):
+        """包含text的LIKE模式，text中的%、_按普通字符匹配（配合 ESCAPE '\\' 使用）"""
+        escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
+
+    @staticmethod
+    def _build_filter(root, suite, module, keyword, trace):
+        conditions = []
+        params = []
+        if root is not None:
+            # 目录下的文件以"目录/"开头，压缩包成员以"压缩包!/"开头
+            if is_archive_file(root):
+                prefix = root + ARCHIVE_SEPARATOR
+            else:
+                prefix = root.rstrip("/\\") + os.sep
+            conditions.append("substr(f.path, 1, ?) = ?")
+            params.extend([len(prefix), prefix])
+        if suite:
+            conditions.append("t.suite = ? COLLATE NOCASE")
+            params.append(suite)
+        if module:
+            conditions.append("t.module LIKE ? ESCAPE '\\'")
+            params.append(FailedTestIndex._like_pattern(module))
+        if keyword:
+            pattern = FailedTestIndex._like_pattern(keyword)
+            conditions.append("(t.test LIKE ? ESCAPE '\\' OR t.testcase LIKE ? ESCAPE '\\')")
+            params.extend([pattern, pattern])
+        if trace:
+            conditions.append("t.trace_hash = ?")
+            params.append(trace)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, params
@@ -0,0 +1,193 @@
+import json
+
+from ..common.CancellationToken import check_cancelled
+
+JSON_READ_CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = " \t\n\r"
+# 数字中可能出现的字符：数字解码结束后缓冲区只剩这些字符时，数字可能尚未读完
+JSON_NUMBER_CHARS = "0123456789+-.eE"
+
+
+class JsonStreamScanner:
+    """增量JSON扫描器 - 分块读取文件，逐个解码数组元素/对象成员
+
+    只在内存中保留当前正在解码的值，调用方可在找到所需数据后停止读取。
+    语法错误（或文件被截断）时抛出json.JSONDecodeError。
+    """
+
+    def __init__(self, f, chunk_size=JSON_READ_CHUNK_SIZE):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size=None):
+        """读入更多内容，返回是否读到数据"""
+        if self._eof:
+            return False
+        check_cancelled()
+        chunk = self._file.read(size or self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # 丢弃已解码的部分，缓冲区只保留当前值
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += chunk
+        return True
+
+    def _error(self, message):
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+    def peek(self):
+        """跳过空白，返回下一个字符（文件结束时返回空字符串）"""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            end = len(buf)
+            while pos < end and buf[pos] in JSON_WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < end:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char):
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def read_value(self):
+        """解码下一个完整的JSON值"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # 值跨越了缓冲区末尾：读入与未解码部分等长的内容后重试，总开销保持线性
+                if self._fill(max(self._chunk_size, len(self._buf) - self._pos)):
+                    continue
+                raise
+            # 数字等值恰好结束于缓冲区末尾，或数字后面只剩"."、"e"等未完的部分（如"-1."被解码为-1）时
+            # 可能被截断，需读入后续内容确认
+            if self._may_continue(value, end) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _may_continue(self, value, end):
+        """解码得到的值是否可能在缓冲区之后还有后续内容"""
+        if end >= len(self._buf):
+            return True
+        # 数字被截断时剩余的至多是"."、"e"、"e-"这样不超过2个字符的未完部分
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and len(self._buf) - end <= 2:
+            return not self._buf[end:].strip(JSON_NUMBER_CHARS)
+        return False
+
+    def iter_array_items(self):
+        """逐个解码当前位置数组的元素"""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_object_keys(self):
+        """逐个返回当前位置对象的成员名
+
+        每返回一个成员名后，调用方须用read_value或iter_array_items消费其值。
+        """
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def finish(self):
+        """确认顶层值之后只有空白"""
+        if self.peek():
+            raise self._error("Extra data")
+
+
+def scan_package_versions(f, package_names):
+    """流式查找PackageDeviceInfo中指定包的version_name，全部找到后立即停止读取
+
+    支持的结构（与原整文件解析一致）：顶层包列表；顶层对象的"package"列表；
+    没有"package"成员时，名称中含"package"的其他列表成员。
+    PackageDeviceInfo中每个包只出现一次，因此取第一次出现的version_name，
+    找齐后不再读取文件剩余部分。
+
+    Returns:
+        dict: {包名: version_name}；文件不是上述结构时返回None（由调用方整文件解析）
+    """
+    scanner = JsonStreamScanner(f)
+    found = {}
+
+    def consume(packages):
+        """返回是否已找齐所有目标包"""
+        for package in packages:
+            if isinstance(package, dict):
+                name = package.get("name", "")
+                if name in package_names and name not in found:
+                    found[name] = package.get("version_name", "未知")
+                    if len(found) == len(package_names):
+                        return True
+        return False
+
+    first = scanner.peek()
+    if first == "[":
+        if consume(scanner.iter_array_items()):
+            return found
+        scanner.finish()
+        return found
+
+    if first != "{":
+        return None
+
+    package_found = False
+    candidates = []
+    for key in scanner.iter_object_keys():
+        if key == "package":
+            package_found = True
+            if scanner.peek() == "[":
+                if consume(scanner.iter_array_items()):
+                    return found
+            else:
+                scanner.read_value()
+        elif not package_found and "package" in key.lower():
+            value = scanner.read_value()
+            if isinstance(value, list):
+                candidates.append(value)
+        else:
+            scanner.read_value()
+    scanner.finish()
+
+    if not package_found:
+        for packages in candidates:
+            if consume(packages):
+                break
+    return found
@@ -2,8 +2,22 @@ import os
 import re
 import datetime
 
+from .ReportIndex import KIND_FAILURES_HTML
+from .ReportParsePool import get_record_data
+from .DocumentCache import open_document
+from ..common.CancellationToken import check_cancelled
+
 ReportDelimiter = "=" * 100
 
+# test_result_failures_suite.html摘要表中需要提取的字段
+SUMMARY_FIELDS = ("Suite / Plan", "Suite / Build", "Tests Passed", "Tests Failed",
+                  "Modules Done", "Modules Total", "Fingerprint", "Security Patch")
+# 一次扫描提取所有摘要字段（每个字段取第一次出现的值）
+SUMMARY_ROW_PATTERN = re.compile(
+    "(" + "|".join(re.escape(field) for field in SUMMARY_FIELDS) + ")</td><td>(.*?)</td>")
+SUMMARY_TABLE_END = "</table>"
+HTML_READ_CHUNK_SIZE = 64 * 1024
+
 class OtherReportAnalyzer:
     """其他报告分析器"""
     
@@ -13,39 +27,55 @@ class OtherReportAnalyzer:
         self.Fingerprint_comparison = []
         self.Security_Patch_comparison = []
         self.tool_versions = []
+        self.suite_summaries = []  # 各报告的结构化摘要（写入历史记录）
     
-    def analyze_other_reports(self, pathnames, output_lines, output_error):
+    def analyze_other_reports(self, report_index, output_lines, output_error, records=None, merged_suites=None):
+        """分析GTS/STS/VTS等HTML报告
+        
+        Args:
+            records: 预解析记录 {(报告类型, 文件路径): 记录}，为None时在当前线程中解析
+            merged_suites: {Suite / Plan: MergedSuiteResult}，有多个分片/重试结果的套件
+                按合并后的最终FAIL数检查，而不是逐个报告检查；Fingerprint/安全补丁一致性检查
+                只使用合并结果（最后一次执行）的值，每个套件一次
+        """
+        merged_suites = merged_suites or {}
+        compared_suites = set()  # 已按合并结果参与一致性检查的套件
         self.result_path.clear()
         self.Suite_Plan_comparison.clear()
         self.Fingerprint_comparison.clear()
         self.Security_Patch_comparison.clear()
         self.tool_versions.clear()
+        self.suite_summaries.clear()
 
-        for i in pathnames:
-            if "test_result_failures_suite.html" in i:
-                self.result_path.append(str(i))
+        for i in report_index.get_files(KIND_FAILURES_HTML):
+            self.result_path.append(str(i))
         
         self.result_path.sort(key=lambda x: self.get_tool_priority(x))
         
         for j in self.result_path:
             try:
-                with open(j, 'r', encoding="utf-8") as htmlf:
-                    htmlcont = htmlf.read().replace("\\n", "")
-                
-                Suite_Plan_match = re.findall("Suite / Plan</td><td>(.*?)</td>", htmlcont)
-                if Suite_Plan_match:
-                    Suite_Plan = Suite_Plan_match[0]
-                    self.Suite_Plan_comparison.append(Suite_Plan)
+                summary = get_record_data(records, KIND_FAILURES_HTML, j, self.extract_summary)
+                if summary:
+                    Suite_Plan = summary["Suite / Plan"]
+                    Suite_Build = summary["Suite / Build"]
+                    Tests_Passed = summary["Tests Passed"]
+                    Tests_Failed = summary["Tests Failed"]
+                    Modules_Done = summary["Modules Done"]
+                    Modules_Total = summary["Modules Total"]
+                    Fingerprint = summary["Fingerprint"]
+                    Security_Patch = summary["Security Patch"]
                     
-                    Suite_Build = re.findall("Suite / Build</td><td>(.*?)</td>", htmlcont)[0]
-                    Tests_Passed = re.findall("Tests Passed</td><td>(.*?)</td>", htmlcont)[0]
-                    Tests_Failed = re.findall("Tests Failed</td><td>(.*?)</td>", htmlcont)[0]
-                    Modules_Done = re.findall("Modules Done</td><td>(.*?)</td>", htmlcont)[0]
-                    Modules_Total = re.findall("Modules Total</td><td>(.*?)</td>", htmlcont)[0]
-                    Fingerprint = re.findall("Fingerprint</td><td>(.*?)</td>", htmlcont)[0]
-                    self.Fingerprint_comparison.append(Fingerprint)
-                    Security_Patch = re.findall("Security Patch</td><td>(.*?)</td>", htmlcont)[0]
-                    self.Security_Patch_comparison.append(Security_Patch)
+                    merged = merged_suites.get(Suite_Plan)
+                    if merged is None:
+                        self.Suite_Plan_comparison.append(Suite_Plan)
+                        self.Fingerprint_comparison.append(Fingerprint)
+                        self.Security_Patch_comparison.append(Security_Patch)
+                    elif Suite_Plan not in compared_suites:
+                        # 合并的套件只按最后一次执行的结果参与一致性检查，先前的分片/重试页面不再逐个比较
+                        compared_suites.add(Suite_Plan)
+                        self.Suite_Plan_comparison.append(Suite_Plan)
+                        self.Fingerprint_comparison.append(merged.fingerprint or Fingerprint)
+                        self.Security_Patch_comparison.append(merged.security_patch or Security_Patch)
                     
                     # 输出时直接使用 Suite_Plan，不修改显示文本
                     output_lines.append("测试工具:\t%s" % Suite_Plan)
@@ -59,13 +89,28 @@ class OtherReportAnalyzer:
                     
                     # 收集工具版本信息，传入真实的 Suite_Plan
                     self.collect_tool_version(Suite_Plan, Suite_Build)
+                    self.suite_summaries.append({
+                        "suite_plan": Suite_Plan,
+                        "tool_version": Suite_Build,
+                        "passed": Tests_Passed,
+                        "failed": Tests_Failed,
+                        "modules_done": Modules_Done,
+                        "modules_total": Modules_Total,
+                        "fingerprint": Fingerprint,
+                        "security_patch": Security_Patch,
+                    })
                     
-                    try:
-                        failed_count = int(Tests_Failed)
-                        if failed_count > 0:
-                            output_error.append(f"❌ {Suite_Plan} 有 {failed_count} 个测试失败，请检查")
-                    except ValueError:
-                        pass
+                    if merged is not None:
+                        if merged.failed > 0:
+                            output_error.append(f"❌ {Suite_Plan} 合并{merged.attempts}个分片/重试结果后"
+                                                f"仍有 {merged.failed} 个测试失败，请检查")
+                    else:
+                        try:
+                            failed_count = int(Tests_Failed)
+                            if failed_count > 0:
+                                output_error.append(f"❌ {Suite_Plan} 有 {failed_count} 个测试失败，请检查")
+                        except ValueError:
+                            pass
                     
                     if 'sts' in Suite_Plan.lower():
                         self.check_sts_version(Suite_Plan, Suite_Build, Security_Patch, output_lines, output_error)
@@ -79,6 +124,63 @@ class OtherReportAnalyzer:
         
         return output_lines, output_error
     
+    @staticmethod
+    def extract_summary(html_file):
+        """提取HTML报告摘要表中的字段
+        
+        摘要表位于页面开头，读到摘要表结束即停止，不再读取后面的失败用例列表；
+        只有摘要表中缺少字段时才继续读取全文查找。
+        
+        Returns:
+            dict: {字段名: 值}；报告中没有"Suite / Plan"时返回None
+        """
+        with open_document(html_file, 'r', encoding="utf-8") as htmlf:
+            head = OtherReportAnalyzer._read_summary_section(htmlf)
+            summary = OtherReportAnalyzer._scan_summary_rows(head)
+            if "Suite / Plan" not in summary:
+                return None
+            
+            missing_fields = [field for field in SUMMARY_FIELDS if field not in summary]
+            if missing_fields:
+                full_summary = OtherReportAnalyzer._scan_summary_rows(head + htmlf.read())
+                for field in missing_fields:
+                    if field not in full_summary:
+                        raise ValueError(f"报告中未找到字段: {field}")
+                    summary[field] = full_summary[field]
+        return summary
+    
+    @staticmethod
+    def _read_summary_section(htmlf):
+        """分块读取HTML，直到"Suite / Plan"所在的摘要表结束（或文件结束）"""
+        chunks = []
+        tail = ""
+        plan_found = False
+        while True:
+            check_cancelled()
+            chunk = htmlf.read(HTML_READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            # 拼接上一块的结尾，避免标记恰好跨块
+            window = tail + chunk
+            if not plan_found:
+                plan_pos = window.find("Suite / Plan")
+                if plan_pos != -1:
+                    plan_found = True
+                    window = window[plan_pos:]
+            if plan_found and SUMMARY_TABLE_END in window:
+                break
+            tail = window[-(len("Suite / Plan") - 1):]
+        return "".join(chunks)
+    
+    @staticmethod
+    def _scan_summary_rows(htmlcont):
+        """单次扫描提取所有摘要字段，每个字段保留第一次出现的值"""
+        summary = {}
+        for match in SUMMARY_ROW_PATTERN.finditer(htmlcont.replace("\\n", "")):
+            summary.setdefault(match.group(1), match.group(2))
+        return summary
+    
     def collect_tool_version(self, suite_plan, suite_build):
         """收集工具版本信息，特殊处理 GTS / apts 归类为 APTS（仅修改 tool_type，不修改显示）"""
         if " / " in suite_plan:
@@ -0,0 +1,799 @@
+import datetime
+import os
+import traceback
+import re
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .CVReportAnalyzer import CVReportAnalyzer
+from .OtherReportAnalyzer import OtherReportAnalyzer
+from .AptsReportAnalyzer import AptsReportAnalyzer
+from .ReportIndex import (ReportIndex, KIND_APTS_XML, KIND_CV_XML, KIND_FAILURES_HTML,
+                          KIND_PACKAGE_DEVICE_INFO, KIND_CTS_DEVICE_INFO, KIND_RESULT_XML)
+from .ReportParsePool import ReportParsePool, get_record_data
+from .ReportCache import ReportCache
+from .ReportArchive import ArchiveCache, is_archive_file, report_signature
+from .DocumentCache import DocumentCache, current_document_cache, read_report_text, open_document
+from .ReportPrefetcher import ReportPrefetcher
+from .StageProfiler import StageProfiler, StageTiming
+from .ResultMerger import MergedSuiteResult, merge_suite_results, result_group_key, result_start_time
+from .ReportHistory import DEFAULT_HISTORY_BUILDS
+from .JsonStreamScanner import scan_package_versions
+from ..common.MarkerSearch import contains_marker
+from ..common.CancellationToken import CancellationToken
+
+# PackageDeviceInfo中需要提取版本号的包
+GO_PACKAGE_NAME = "com.google.mainline.go.primary"
+MAINLINE_PACKAGE_NAME = "com.google.android.modulemetadata"
+
+# 检测"GTS / apts"标记的解析任务类型（与摘要提取共用同一批HTML文件）
+TASK_GTS_APTS_MARKER = "gts_apts_marker"
+GTS_APTS_MARKER = "GTS / apts"
+# "GTS / apts"位于页面开头的摘要表中（Suite / Plan行），读到摘要表结束仍未出现即可判定不是APTS报告
+GTS_APTS_MARKER_SECTION = ("Suite / Plan", "</table>")
+# 读取各test_result.xml头部（套件、计划、开始时间），用于找出同一套件的分片/重试结果
+TASK_RESULT_HEADER = "result_header"
+# 合并同一套件的分片/重试结果
+TASK_SUITE_MERGE = "suite_merge"
+
+# ============================ 检查结论 ============================
+VERDICT_PASS = "PASS"    # 没有发现错误
+VERDICT_WARN = "WARN"    # 只有需人工确认的⚠️项
+VERDICT_FAIL = "FAIL"    # 存在❌错误，或分析过程无法完成
+
+
+@dataclass
+class ToolMinVersion:
+    """单个测试工具的最低版本"""
+    tool_type: str
+    tool_name: str
+    version: str
+    build: str
+
+
+@dataclass
+class AnalysisResult:
+    """一次报告分析的结果"""
+    test_path: str
+    full_result: str = ""
+    error_result: str = ""
+    # 目录不存在、无报告文件或分析器异常等导致分析无法完成时的错误信息
+    fatal_error: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+    tool_min_versions: List[ToolMinVersion] = field(default_factory=list)
+    fingerprints: List[str] = field(default_factory=list)
+    security_patches: List[str] = field(default_factory=list)
+    suite_plans: List[str] = field(default_factory=list)
+    device_info_version: Optional[str] = None
+    # 各测试套件报告的结构化摘要（PASS/FAIL数、工具版本等）
+    suite_summaries: List[dict] = field(default_factory=list)
+    # 写入失败用例索引的失败用例数（未启用失败用例索引时为None）
+    failed_test_count: Optional[int] = None
+    # 历史记录ID（未启用历史记录时为None）
+    history_run_id: Optional[int] = None
+    # 与同产品前几个构建的对比（ReportHistory.compare的结果），回退项仅供参考，不影响检查结论
+    history_comparison: Optional[dict] = None
+    # 有多个分片/重试结果的套件合并后的最终结果
+    merged_suites: List[MergedSuiteResult] = field(default_factory=list)
+    # 各分析阶段的耗时与内存，以及格式化后的"性能统计"文本
+    stage_timings: List[StageTiming] = field(default_factory=list)
+    performance_result: str = ""
+
+    @property
+    def verdict(self):
+        """检查结论：❌ 为FAIL，仅有 ⚠️ 为WARN，否则为PASS"""
+        if self.fatal_error is not None or any("❌" in error for error in self.errors):
+            return VERDICT_FAIL
+        if any("⚠️" in error for error in self.errors):
+            return VERDICT_WARN
+        return VERDICT_PASS
+
+
+class ReportAnalyzerCore:
+    """报告分析核心 - 不依赖Qt，可由界面线程（ReportAnalyzer）或命令行（cli）驱动"""
+    
+    def __init__(self, test_path, check_apts=True, parse_workers=None, use_cache=True, cache_path=None,
+                 progress_callback=None, executor=None, failed_test_index=None, history=None,
+                 history_builds=DEFAULT_HISTORY_BUILDS, prefetch_workers=0, profile_memory=False,
+                 merge_results=False, scan_archives=False):
+        """
+        Args:
+            parse_workers: 报告解析进程数，None为默认值，小于等于1时串行解析
+            progress_callback: 进度回调 progress_callback(已完成文件数, 文件总数, 已处理字节数)
+            executor: 共享的ProcessPoolExecutor（批量分析多个目录时复用同一进程池）
+            failed_test_index: FailedTestIndex，提供时将各test_result.xml中的失败用例写入索引
+            history: ReportHistory，提供时保存本次分析结果，并与同产品的前history_builds个构建对比
+            prefetch_workers: 预读取线程数，大于0时在解析前并发读取报告文件（适用于网络共享），0为不预读取
+            profile_memory: 为True时用tracemalloc统计各阶段的内存（会拖慢分析）
+            merge_results: 为True时合并同一套件的分片/重试结果，按最终结果检查FAIL数（需完整读取这些套件的结果XML）
+            scan_archives: 为True时展开目录中的ZIP结果包（test_path本身是ZIP时总是分析其内容）
+        """
+        self.test_path = test_path
+        self.check_apts = check_apts  # 控制是否检查APTS
+        self.parse_pool = ReportParsePool(parse_workers, executor)
+        self.prefetcher = ReportPrefetcher(prefetch_workers) if prefetch_workers > 0 else None
+        self.merge_results = merge_results
+        self.scan_archives = scan_archives
+        # 解析结果持久化缓存（SQLite，默认与config.ini同目录）
+        self.report_cache = ReportCache(cache_path) if use_cache else None
+        self.progress_callback = progress_callback
+        self.failed_test_index = failed_test_index
+        self.history = history
+        self.history_builds = history_builds
+        self.cv_analyzer = CVReportAnalyzer()
+        self.other_analyzer = OtherReportAnalyzer()
+        self.apts_analyzer = AptsReportAnalyzer()
+        self.cts_device_info_version = None
+        # 协作式取消令牌：在文件之间和流式解析内部检查
+        self.cancel_token = CancellationToken()
+        # 各阶段计时，每次analyze()重新创建
+        self.profile_memory = profile_memory
+        self.profiler = StageProfiler(profile_memory)
+    
+    def analyze(self, report_index=None):
+        """执行报告分析，返回AnalysisResult；已取消时抛出AnalysisCancelled
+        
+        Args:
+            report_index: 已建立的目录索引（监视模式轮询时已遍历过目录），为None时重新遍历
+        """
+        # 文档缓存：同一报告文件在本次分析中只读取、解码一次；压缩包缓存：嵌套压缩包只解压一次
+        self.profiler = StageProfiler(self.profile_memory)
+        archive_cache = ArchiveCache()
+        try:
+            with self.cancel_token.activate(), DocumentCache().activate(), archive_cache.activate(), \
+                    self.profiler.run():
+                self._report_progress(0, 0, 0)
+                result = self._run_analysis(report_index)
+        finally:
+            archive_cache.close()
+        result.stage_timings = self.profiler.timings
+        result.performance_result = "\n".join(self.profiler.format_lines())
+        return result
+    
+    def cancel(self):
+        """请求取消分析（可在任意线程调用），分析线程会在下一个检查点退出"""
+        self.cancel_token.cancel()
+    
+    def _report_progress(self, files_done, files_total, bytes_done):
+        if self.progress_callback is not None:
+            self.progress_callback(files_done, files_total, bytes_done)
+    
+    def _run_analysis(self, report_index=None):
+        """报告分析主流程"""
+        try:
+            output_lines = []
+            output_error = []
+            ReportDelimiter = "=" * 100
+            output_lines.append(ReportDelimiter)
+            
+            # 检查目录是否存在
+            if not os.path.exists(self.test_path):
+                error_msg = f"❌ 目录不存在: {self.test_path}"
+                return AnalysisResult(self.test_path, fatal_error=error_msg)
+            
+            if not os.path.isdir(self.test_path) and not is_archive_file(self.test_path):
+                error_msg = f"❌ 路径不是目录或ZIP报告包: {self.test_path}"
+                return AnalysisResult(self.test_path, fatal_error=error_msg)
+            
+            # 一次遍历目录，建立按报告类型分类的索引，供所有分析器共用
+            if report_index is None:
+                with self.profiler.stage("目录索引"):
+                    report_index = ReportIndex(self.test_path, scan_archives=self.scan_archives)
+            
+            if report_index.file_count == 0:
+                error_msg = f"❌ 在目录中未找到任何报告文件: {self.test_path}"
+                return AnalysisResult(self.test_path, fatal_error=error_msg)
+            
+            self.cancel_token.raise_if_cancelled()
+            
+            # 获取各报告的解析记录（优先读缓存，其余并行解析）
+            with self.profiler.stage("报告解析"):
+                records = self.load_records(report_index)
+            self.cancel_token.raise_if_cancelled()
+            
+            # 合并同一套件的分片/重试结果（最后一次执行的结果为准）
+            merged_suites = {}
+            if self.merge_results:
+                with self.profiler.stage("分片/重试合并"):
+                    merged_suites, merge_errors = self.merge_sharded_results(report_index, records)
+                    output_error.extend(merge_errors)
+                self.cancel_token.raise_if_cancelled()
+            
+            # 提取失败用例到索引（可选）
+            failed_test_count = None
+            if self.failed_test_index is not None:
+                with self.profiler.stage("失败用例索引"):
+                    failed_test_count, index_errors = self.failed_test_index.index_reports(
+                        report_index.get_files(KIND_RESULT_XML))
+                    output_error.extend(index_errors)
+                    self.cancel_token.raise_if_cancelled()
+            
+            # 检查两种格式的APTS报告是否存在
+            with self.profiler.stage("APTS报告检查"):
+                apts_xml_exists = self.check_apts_xml_existence(report_index)
+                gts_apts_html_exists = self.check_gts_apts_html_existence(report_index, records)
+                apts_report_exists = apts_xml_exists or gts_apts_html_exists
+            
+            # 检查APTS报告存在性是否符合版本要求
+            if self.check_apts and not apts_report_exists:
+                output_error.append("❌ GO版本模式下未找到APTS报告，请检查")
+            elif not self.check_apts and apts_report_exists:
+                output_error.append("❌ FULL版本模式下发现了APTS报告，请检查")
+            
+            # 从CTS报告中提取PackageDeviceInfo版本号
+            with self.profiler.stage("CTS设备信息"):
+                cts_version_comparison = self.extract_and_compare_cts_device_info_versions(report_index, records)
+            if cts_version_comparison:
+                if self.check_apts:
+                    package_name = "com.google.mainline.go.primary"
+                    version_label = "GO主模块版本"
+                    extracted_versions = cts_version_comparison.get("go_versions", [])
+                    
+                    if extracted_versions:
+                        unique_versions = set(extracted_versions)
+                        if len(unique_versions) == 1:
+                            version = list(unique_versions)[0]
+                            self.cts_device_info_version = version
+                            output_lines.append(f"{version_label}:\t{package_name} = {version}")
+                        else:
+                            output_error.append(f"⚠️ {version_label}存在不同的版本号，请人工确认:")
+                            for i, version in enumerate(extracted_versions, 1):
+                                output_error.append(f"⚠️   版本{i}: {version}")
+                            output_lines.append(f"⚠️ {version_label} (需人工确认):")
+                            output_lines.append(f"⚠️   {package_name} 存在 {len(unique_versions)} 个不同版本:")
+                            for version in sorted(unique_versions):
+                                output_lines.append(f"⚠️     - {version}")
+                    else:
+                        output_error.append(f"⚠️ CTS报告中未找到GO版本包信息: {package_name}")
+                else:
+                    package_name = "com.google.android.modulemetadata"
+                    version_label = "Mainline版本"
+                    extracted_versions = cts_version_comparison.get("full_versions", [])
+                    
+                    if extracted_versions:
+                        unique_versions = set(extracted_versions)
+                        if len(unique_versions) == 1:
+                            version = list(unique_versions)[0]
+                            self.cts_device_info_version = version
+                            output_lines.append(f"{version_label}:\t{package_name} = {version}")
+                        else:
+                            output_error.append(f"⚠️ {version_label}存在不同的版本号，请人工确认:")
+                            for i, version in enumerate(extracted_versions, 1):
+                                output_error.append(f"⚠️   版本{i}: {version}")
+                            output_lines.append(f"⚠️ {version_label} (需人工确认):")
+                            output_lines.append(f"⚠️   {package_name} 存在 {len(unique_versions)} 个不同版本:")
+                            for version in sorted(unique_versions):
+                                output_lines.append(f"⚠️     - {version}")
+                    else:
+                        output_error.append(f"⚠️ CTS报告中未找到FULL版本包信息: {package_name}")
+                
+                output_lines.append(ReportDelimiter)
+            else:
+                output_error.append(f"⚠️ 无法提取CTS设备信息版本")
+            
+            # 1. 分析APTS报告（仅当存在XML格式时才调用AptsReportAnalyzer）
+            if self.check_apts:
+                if apts_xml_exists:
+                    with self.profiler.stage("APTS报告分析"):
+                        output_lines, apts_errors = self.apts_analyzer.analyze_apts_reports(report_index, output_lines, [], records)
+                        output_error.extend(apts_errors)
+                else:
+                    output_lines.append("💡 未找到旧版XML APTS报告，但检测到GTS/apts报告（由其他分析器处理）")
+                    output_lines.append(ReportDelimiter)
+            else:
+                output_lines.append("💡 已跳过APTS报告分析（FULL版本模式）")
+                output_lines.append(ReportDelimiter)
+            
+            # 2. 分析CTS报告（CVReportAnalyzer处理CTS_VERIFIER）
+            try:
+                with self.profiler.stage("CTS报告分析"):
+                    output_lines, cts_errors = self.cv_analyzer.analyze_cv_reports(report_index, output_lines, [], records)
+                    output_error.extend(cts_errors)
+            except Exception as e:
+                error_msg = f"CTS报告分析错误: {str(e)}\n{traceback.format_exc()}"
+                return AnalysisResult(self.test_path, fatal_error=error_msg)
+            
+            # 3. 分析其他报告（GTS, STS, VTS等）—— GTS/apts将被归类为APTS
+            try:
+                with self.profiler.stage("其他报告分析"):
+                    output_lines, other_errors = self.other_analyzer.analyze_other_reports(
+                        report_index, output_lines, [], records, merged_suites)
+                    output_error.extend(other_errors)
+            except Exception as e:
+                error_msg = f"❌ 其他报告分析错误: {str(e)}\n{traceback.format_exc()}"
+                return AnalysisResult(self.test_path, fatal_error=error_msg)
+            
+            if merged_suites:
+                output_lines.extend(self.format_merged_suites(merged_suites.values()))
+                output_lines.append(ReportDelimiter)
+            
+            # 合并所有分析数据
+            all_suite_plans = []
+            all_fingerprints = []
+            all_security_patches = []
+            
+            if self.check_apts:
+                all_suite_plans.extend(self.apts_analyzer.Suite_Plan_comparison)
+                all_fingerprints.extend(self.apts_analyzer.Fingerprint_comparison)
+                all_security_patches.extend(self.apts_analyzer.Security_Patch_comparison)
+            
+            all_suite_plans.extend(self.cv_analyzer.Suite_Plan_comparison)
+            all_fingerprints.extend(self.cv_analyzer.Fingerprint_comparison)
+            all_security_patches.extend(self.cv_analyzer.Security_Patch_comparison)
+            
+            all_suite_plans.extend(self.other_analyzer.Suite_Plan_comparison)
+            all_fingerprints.extend(self.other_analyzer.Fingerprint_comparison)
+            all_security_patches.extend(self.other_analyzer.Security_Patch_comparison)
+            
+            # 构建有序且去重的错误列表
+            ordered_errors = []
+            seen_errors = set()
+            
+            for error in output_error:
+                if error not in seen_errors:
+                    seen_errors.add(error)
+                    ordered_errors.append(error)
+            
+            # 检查Fingerprint差异
+            for i in range(len(all_fingerprints)):
+                if i > 0 and all_fingerprints[0] != all_fingerprints[i]:
+                    tool_name = all_suite_plans[i] if i < len(all_suite_plans) else "未知工具"
+                    error_line = f"❌ {tool_name}存在有不同的Fingerprint：\n❌ Fingerprint\t{all_fingerprints[0]}\n❌ Fingerprint\t{all_fingerprints[i]}"
+                    if error_line not in seen_errors:
+                        seen_errors.add(error_line)
+                        ordered_errors.append(error_line)
+            
+            # 检查安全补丁年龄
+            if all_security_patches:
+                try:
+                    Security_Patch_time = datetime.datetime.strptime(all_security_patches[0], "%Y-%m-%d")
+                    diff_days = (datetime.datetime.now() - Security_Patch_time).days
+                    if diff_days > 60:
+                        error_line = '❌ 当前安全补丁已超出送测日期,需更新安全补丁'
+                        if error_line not in seen_errors:
+                            seen_errors.add(error_line)
+                            ordered_errors.append(error_line)
+                except Exception as e:
+                    error_line = f"❌ 安全补丁日期解析错误: {str(e)}"
+                    if error_line not in seen_errors:
+                        seen_errors.add(error_line)
+                        ordered_errors.append(error_line)
+            
+            # 检查安全补丁差异
+            for i in range(len(all_security_patches)):
+                if i > 0 and all_security_patches[0] != all_security_patches[i]:
+                    tool_name = all_suite_plans[i] if i < len(all_suite_plans) else "未知工具"
+                    label = "Security_Patch"
+                    padding = ' ' * 4
+                    error_line = f"❌ {tool_name}存在有不同的Security_Patch：\n❌ {label}{padding}{all_security_patches[0]}\n❌ {label}{padding}{all_security_patches[i]}"
+                    if error_line not in seen_errors:
+                        seen_errors.add(error_line)
+                        ordered_errors.append(error_line)
+            
+            # 分析工具最低版本
+            tool_min_versions = self.collect_minimum_tool_versions()
+            min_versions_output = self.format_minimum_tool_versions(tool_min_versions)
+            if min_versions_output:
+                min_versions_block = []
+                min_versions_block.append("="*100)
+                min_versions_block.append("⚠️ 各测试工具最低版本汇总 (按构建号升序) - 请人工确认:")
+                for line in min_versions_output:
+                    min_versions_block.append(f"⚠️ {line}")
+                min_versions_block.append("="*100)
+                min_versions_text = "\n".join(min_versions_block)
+                if min_versions_text not in seen_errors:
+                    seen_errors.add(min_versions_text)
+                    ordered_errors.append(min_versions_text)
+            
+            self.cancel_token.raise_if_cancelled()
+            
+            suite_summaries = []
+            if self.check_apts:
+                suite_summaries.extend(self.apts_analyzer.suite_summaries)
+            suite_summaries.extend(self.cv_analyzer.suite_summaries)
+            suite_summaries.extend(self.other_analyzer.suite_summaries)
+            
+            result = AnalysisResult(
+                self.test_path,
+                errors=ordered_errors,
+                tool_min_versions=tool_min_versions,
+                fingerprints=all_fingerprints,
+                security_patches=all_security_patches,
+                suite_plans=all_suite_plans,
+                suite_summaries=suite_summaries,
+                device_info_version=self.cts_device_info_version,
+                failed_test_count=failed_test_count,
+                merged_suites=list(merged_suites.values()),
+            )
+            
+            # 保存到历史记录，并与同产品的前几个构建对比
+            if self.history is not None:
+                with self.profiler.stage("历史记录"):
+                    self.record_history(result, output_lines)
+            
+            result.full_result = "\n".join(output_lines)
+            
+            if ordered_errors:
+                formatted_errors = []
+                for error in ordered_errors:
+                    formatted_errors.append(ReportDelimiter)
+                    formatted_errors.append(error)
+                formatted_errors.append(ReportDelimiter)
+                error_result = "\n".join(formatted_errors)
+            else:
+                error_result = "没有发现错误"
+            result.error_result = error_result
+            
+            return result
+            
+        except Exception as e:
+            error_msg = f"❌ 分析过程中出现错误: {str(e)}\n{traceback.format_exc()}"
+            return AnalysisResult(self.test_path, fatal_error=error_msg)
+    
+    # ==================== 辅助方法 ====================
+    @property
+    def mode(self):
+        """版本类型：检查APTS为GO版本，否则为FULL版本"""
+        return "GO" if self.check_apts else "FULL"
+    
+    def record_history(self, result, output_lines):
+        """保存分析结果到历史记录，对比结果（含回退项）追加到输出
+
+        历史对比只供参考，不加入错误列表，不影响检查结论。
+        """
+        try:
+            result.history_run_id = self.history.record_run(result, self.mode)
+            if self.history_builds <= 0:
+                return
+            result.history_comparison = self.history.compare(result.history_run_id, self.history_builds)
+        except sqlite3.Error as e:
+            output_lines.append(f"⚠️ 历史记录保存失败: {str(e)}")
+            return
+        output_lines.extend(self.history.format_comparison(result.history_comparison))
+    
+    def load_records(self, report_index):
+        """获取所有报告的解析记录：缓存命中的直接复用，未命中的交给解析池并写回缓存"""
+        tasks = self.collect_parse_tasks(report_index)
+        with self.profiler.stage("查询缓存"):
+            if self.report_cache is not None:
+                records, signatures = self.report_cache.load_records(tasks)
+            else:
+                records = {}
+                signatures = {}
+                for kind, path, _ in tasks:
+                    signature = report_signature(path)
+                    if signature is not None:
+                        signatures[(kind, path)] = signature
+        
+        # 进度按文件统计（同一HTML文件可能对应多个解析任务）
+        file_sizes = {path: signature[0] for (_, path), signature in signatures.items()}
+        files_total = len({path for _, path, _ in tasks})
+        done_paths = set()
+        bytes_done = 0
+        
+        def on_task_done(kind, path):
+            nonlocal bytes_done
+            if path not in done_paths:
+                done_paths.add(path)
+                bytes_done += file_sizes.get(path, 0)
+                self._report_progress(len(done_paths), files_total, bytes_done)
+        
+        for kind, path in records:
+            on_task_done(kind, path)
+        self._report_progress(len(done_paths), files_total, bytes_done)
+        
+        missing_tasks = [task for task in tasks if (task[0], task[1]) not in records]
+        if missing_tasks:
+            # 预读取放入本次分析的文档缓存，解析与网络延迟重叠
+            cache = current_document_cache()
+            prefetch = None
+            if self.prefetcher is not None and cache is not None:
+                prefetch = self.prefetcher.start([path for _, path, _ in missing_tasks], cache, file_sizes)
+            try:
+                with self.profiler.stage(f"解析文件 ({len(missing_tasks)}个任务)"):
+                    parsed_records = self.parse_pool.parse_all(missing_tasks, self.cancel_token, on_task_done, prefetch)
+            finally:
+                if prefetch is not None:
+                    prefetch.close()
+            if self.report_cache is not None:
+                with self.profiler.stage("写入缓存"):
+                    self.report_cache.save_records(parsed_records, signatures)
+            records.update(parsed_records)
+        return records
+    
+    def collect_parse_tasks(self, report_index):
+        """收集需要解析的报告文件，返回 [(报告类型, 文件路径, 解析函数), ...]"""
+        tasks = []
+        if self.check_apts:
+            for path in report_index.get_files(KIND_APTS_XML):
+                tasks.append((KIND_APTS_XML, path, AptsReportAnalyzer.extract_apts_record))
+        for path in report_index.get_files(KIND_CV_XML):
+            tasks.append((KIND_CV_XML, path, CVReportAnalyzer.read_result_header))
+        for path in report_index.get_files(KIND_FAILURES_HTML):
+            # 标记查找和摘要提取都只读取页面开头的摘要区段，必要时才各自读取全文
+            tasks.append((TASK_GTS_APTS_MARKER, path, ReportAnalyzerCore.contains_gts_apts_marker))
+            tasks.append((KIND_FAILURES_HTML, path, OtherReportAnalyzer.extract_summary))
+        kind, device_info_files = self.get_cts_device_info_files(report_index)
+        for path in device_info_files:
+            tasks.append((kind, path, ReportAnalyzerCore.extract_device_info_versions))
+        if self.merge_results:
+            for path in self.get_mergeable_result_files(report_index):
+                tasks.append((TASK_RESULT_HEADER, path, CVReportAnalyzer.read_result_header))
+        return tasks
+    
+    @staticmethod
+    def get_mergeable_result_files(report_index):
+        """参与分片/重试合并的test_result.xml（APTS和CTS_VERIFIER报告由各自的分析器检查，不参与合并）"""
+        excluded = set(report_index.get_files(KIND_APTS_XML)) | set(report_index.get_files(KIND_CV_XML))
+        return [path for path in report_index.get_files(KIND_RESULT_XML) if path not in excluded]
+    
+    def merge_sharded_results(self, report_index, records=None):
+        """合并同一套件（Suite / Plan相同）的多个test_result.xml，按开始时间排序，后执行的结果覆盖先前的
+        
+        只有一个结果文件的套件不需要合并。
+        
+        Returns:
+            tuple: ({Suite / Plan: MergedSuiteResult}, 出错信息列表)
+        """
+        groups = {}
+        for path in self.get_mergeable_result_files(report_index):
+            try:
+                header = get_record_data(records, TASK_RESULT_HEADER, path, CVReportAnalyzer.read_result_header)
+            except Exception:
+                continue
+            key = result_group_key(header)
+            if key is not None:
+                groups.setdefault(key, []).append((result_start_time(header), path))
+        
+        tasks = []
+        for key, attempts in groups.items():
+            if len(attempts) > 1:
+                paths = tuple(path for _, path in sorted(attempts))
+                tasks.append((TASK_SUITE_MERGE, (key, paths), merge_suite_results))
+        if not tasks:
+            return {}, []
+        
+        merged_suites = {}
+        errors = []
+        parsed = self.parse_pool.parse_all(tasks, self.cancel_token)
+        for (_, (key, _)), record in parsed.items():
+            if "error" in record:
+                errors.append(f"⚠️ {key} 分片/重试结果合并出错: {record['error']}")
+            else:
+                merged_suites[key] = record["data"]
+        return merged_suites, errors
+    
+    @staticmethod
+    def format_merged_suites(merged_suites):
+        """分片/重试合并结果的输出行"""
+        lines = ["分片/重试合并结果（以最后一次执行为准）:"]
+        for merged in merged_suites:
+            line = (f"{merged.suite_plan}:\t{merged.attempts}个结果文件  用例 {merged.tests}  "
+                    f"PASS {merged.passed}  FAIL {merged.failed}")
+            if merged.other:
+                line += f"  其他 {merged.other}"
+            if merged.recovered:
+                line += f"  经重试通过 {merged.recovered}"
+            lines.append(line)
+        return lines
+    
+    def check_apts_xml_existence(self, report_index):
+        """检查是否存在XML格式的旧版APTS报告"""
+        return report_index.has(KIND_APTS_XML)
+    
+    def check_gts_apts_html_existence(self, report_index, records=None):
+        """检查是否存在GTS/apts格式的HTML报告（视为新APTS报告）"""
+        for path in report_index.get_files(KIND_FAILURES_HTML):
+            if path.endswith("test_result_failures_suite.html"):
+                try:
+                    if get_record_data(records, TASK_GTS_APTS_MARKER, path, self.contains_gts_apts_marker):
+                        return True
+                except Exception:
+                    continue
+        return False
+    
+    @staticmethod
+    def contains_gts_apts_marker(html_file):
+        """HTML报告中是否包含"GTS / apts"标记（只读取开头的摘要表，按字节查找，不解码全文）"""
+        return contains_marker(html_file, GTS_APTS_MARKER, GTS_APTS_MARKER_SECTION, opener=open_document)
+    
+    def get_cts_device_info_files(self, report_index):
+        """获取CTS设备信息文件及其报告类型"""
+        # 查找所有CTS报告目录中的PackageDeviceInfo.deviceinfo.json文件
+        cts_device_info_files = report_index.get_files(KIND_PACKAGE_DEVICE_INFO)
+        if cts_device_info_files:
+            return KIND_PACKAGE_DEVICE_INFO, cts_device_info_files
+        # 如果没有找到，尝试宽泛匹配
+        return KIND_CTS_DEVICE_INFO, report_index.get_files(KIND_CTS_DEVICE_INFO)
+    
+    def extract_and_compare_cts_device_info_versions(self, report_index, records=None):
+        """从CTS报告中提取PackageDeviceInfo版本号"""
+        try:
+            kind, cts_device_info_files = self.get_cts_device_info_files(report_index)
+            
+            if not cts_device_info_files:
+                return None
+            
+            # 收集所有版本信息
+            go_versions = []
+            full_versions = []
+            all_file_paths = []
+            
+            for file_path in cts_device_info_files:
+                try:
+                    go_version, full_version = get_record_data(
+                        records, kind, file_path, self.extract_device_info_versions)
+                    
+                    if go_version:
+                        go_versions.append(go_version)
+                    if full_version:
+                        full_versions.append(full_version)
+                    
+                    all_file_paths.append(file_path)
+                    
+                except Exception:
+                    continue
+            
+            return {
+                "go_versions": go_versions,
+                "full_versions": full_versions,
+                "file_paths": all_file_paths
+            }
+                
+        except Exception:
+            return None
+    
+    @staticmethod
+    def extract_device_info_versions(file_path):
+        """从单个PackageDeviceInfo文件中提取GO主模块与Mainline版本号
+        
+        PackageDeviceInfo可达数MB，而只需要其中两个包：流式逐个解码包对象，
+        两个包都找到后立即停止读取；不是常规结构或JSON有误时再整文件解析。
+        
+        Returns:
+            tuple: (go_version, full_version)，未找到的项为None
+        """
+        with open_document(file_path, 'r', encoding='utf-8') as f:
+            try:
+                versions = scan_package_versions(f, (GO_PACKAGE_NAME, MAINLINE_PACKAGE_NAME))
+            except json.JSONDecodeError:
+                versions = None
+        if versions is not None:
+            return versions.get(GO_PACKAGE_NAME), versions.get(MAINLINE_PACKAGE_NAME)
+        
+        content = read_report_text(file_path)
+        return ReportAnalyzerCore._extract_device_info_versions_from_content(file_path, content)
+    
+    @staticmethod
+    def _extract_device_info_versions_from_content(file_path, content):
+        """整文件解析设备信息（包括逐行JSON及非常规结构的兼容处理）"""
+        go_version = None
+        full_version = None
+        
+        # 尝试解析JSON
+        try:
+            data = json.loads(content)
+            
+            if isinstance(data, dict):
+                if "package" in data:
+                    packages = data["package"]
+                    if isinstance(packages, list):
+                        for package in packages:
+                            if isinstance(package, dict):
+                                package_name = package.get("name", "")
+                                if package_name == "com.google.mainline.go.primary":
+                                    version_name = package.get("version_name", "未知")
+                                    go_version = version_name
+                                elif package_name == "com.google.android.modulemetadata":
+                                    version_name = package.get("version_name", "未知")
+                                    full_version = version_name
+                else:
+                    for key in data.keys():
+                        if "package" in key.lower():
+                            packages = data[key]
+                            if isinstance(packages, list):
+                                for package in packages:
+                                    if isinstance(package, dict):
+                                        package_name = package.get("name", "")
+                                        if package_name == "com.google.mainline.go.primary":
+                                            version_name = package.get("version_name", "未知")
+                                            go_version = version_name
+                                        elif package_name == "com.google.android.modulemetadata":
+                                            version_name = package.get("version_name", "未知")
+                                            full_version = version_name
+            elif isinstance(data, list):
+                for package in data:
+                    if isinstance(package, dict):
+                        package_name = package.get("name", "")
+                        if package_name == "com.google.mainline.go.primary":
+                            version_name = package.get("version_name", "未知")
+                            go_version = version_name
+                        elif package_name == "com.google.android.modulemetadata":
+                            version_name = package.get("version_name", "未知")
+                            full_version = version_name
+            else:
+                content_lower = content.lower()
+                if "com.google.android.modulemetadata" in content_lower:
+                    version_match = re.search(r'"version_name"\s*:\s*"([^"]+)"', content)
+                    if version_match:
+                        full_version = version_match.group(1)
+                if "com.google.mainline.go.primary" in content_lower:
+                    version_match = re.search(r'"version_name"\s*:\s*"([^"]+)"', content)
+                    if version_match:
+                        go_version = version_match.group(1)
+        
+        except json.JSONDecodeError:
+            lines = content.strip().split('\n')
+            parsed_objects = []
+            for line in lines:
+                line = line.strip()
+                if line:
+                    try:
+                        obj = json.loads(line)
+                        parsed_objects.append(obj)
+                    except json.JSONDecodeError:
+                        continue
+            if not parsed_objects:
+                raise ValueError(f"无法解析设备信息文件: {file_path}")
+            data = parsed_objects
+            for obj in data:
+                if isinstance(obj, dict):
+                    package_name = obj.get("name", "")
+                    if package_name == "com.google.mainline.go.primary":
+                        version_name = obj.get("version_name", "未知")
+                        go_version = version_name
+                    elif package_name == "com.google.android.modulemetadata":
+                        version_name = obj.get("version_name", "未知")
+                        full_version = version_name
+        
+        return go_version, full_version
+    
+    def collect_minimum_tool_versions(self):
+        """收集各测试工具的最低版本（按构建号升序取最小），返回 [ToolMinVersion, ...]"""
+        # 收集所有工具版本信息
+        all_tool_versions = {}
+        
+        if self.check_apts:
+            self._collect_versions_from_analyzer(self.apts_analyzer, all_tool_versions)
+        
+        self._collect_versions_from_analyzer(self.cv_analyzer, all_tool_versions)
+        self._collect_versions_from_analyzer(self.other_analyzer, all_tool_versions)
+        
+        min_versions = []
+        for tool_type, versions in all_tool_versions.items():
+            if versions:
+                sorted_versions = sorted(versions, key=lambda x: self._parse_build_number(x[3]))
+                min_version = sorted_versions[0]
+                min_versions.append(ToolMinVersion(tool_type, min_version[1], min_version[2], min_version[3]))
+        return min_versions
+    
+    def format_minimum_tool_versions(self, min_versions):
+        """将各测试工具的最低版本格式化为输出行"""
+        output_lines = []
+        for item in min_versions:
+            output_lines.append(f"{item.tool_type} ({item.tool_name}):")
+            if item.tool_type == "APTS":
+                output_lines.append(f"  最低版本: {item.version}")
+            else:
+                output_lines.append(f"  最低版本: {item.version} / {item.build}")
+        return output_lines
+    
+    def analyze_minimum_tool_versions(self):
+        """分析各测试工具的最低版本（按构建号升序）"""
+        return self.format_minimum_tool_versions(self.collect_minimum_tool_versions())
+    
+    def _collect_versions_from_analyzer(self, analyzer, all_tool_versions):
+        if hasattr(analyzer, 'tool_versions') and analyzer.tool_versions:
+            for tool_type, tool_name, version_num, build_num in analyzer.tool_versions:
+                if tool_type not in all_tool_versions:
+                    all_tool_versions[tool_type] = []
+                all_tool_versions[tool_type].append((tool_type, tool_name, version_num, build_num))
+    
+    def _parse_build_number(self, build_str):
+        try:
+            clean_build = re.sub(r'[^\d]', '', build_str)
+            return int(clean_build) if clean_build else 0
+        except (ValueError, TypeError):
+            return 0
\ No newline at end of file
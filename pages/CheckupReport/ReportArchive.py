@@ -0,0 +1,203 @@
+import io
+import os
+import zipfile
+import threading
+import contextlib
+from collections import OrderedDict
+
+# 压缩包内文件的路径表示：<压缩包路径>!/<成员路径>，嵌套压缩包依次拼接
+# 例如：/data/results.zip!/android-cts/results/cts.zip!/test_result.xml
+ARCHIVE_SEPARATOR = "!/"
+ARCHIVE_SUFFIX = ".zip"
+# 解析子进程中保留的已打开压缩包（成员链）数量
+WORKER_ARCHIVE_CACHE_SIZE = 4
+
+_current = threading.local()
+
+
+def is_archive_file(path):
+    """是否为可直接分析的ZIP压缩包（磁盘上的文件）"""
+    return path.lower().endswith(ARCHIVE_SUFFIX) and os.path.isfile(path) and zipfile.is_zipfile(path)
+
+
+def is_archive_location(path):
+    """路径是否指向压缩包内的文件"""
+    return ARCHIVE_SEPARATOR in path
+
+
+def make_location(archive_location, member_name):
+    """拼接压缩包成员的路径"""
+    return archive_location + ARCHIVE_SEPARATOR + member_name
+
+
+def split_location(path):
+    """拆分路径为 (磁盘上的压缩包路径, [逐层成员路径])"""
+    parts = path.split(ARCHIVE_SEPARATOR)
+    return parts[0], parts[1:]
+
+
+def sibling_path(path, filename):
+    """获取与报告文件同目录的另一个文件的路径（支持压缩包成员）"""
+    if not is_archive_location(path):
+        return os.path.join(os.path.dirname(path), filename)
+    head, _, member = path.rpartition(ARCHIVE_SEPARATOR)
+    member_dir = member.rpartition("/")[0]
+    return make_location(head, f"{member_dir}/{filename}" if member_dir else filename)
+
+
+def report_exists(path):
+    """报告文件是否存在（支持压缩包成员）"""
+    if not is_archive_location(path):
+        return os.path.exists(path)
+    try:
+        with open_report(path):
+            return True
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return False
+
+
+def report_signature(path):
+    """返回用于缓存校验的 (大小, 修改时间ns)，不可访问时返回None
+
+    压缩包成员使用成员的解压后大小和外层压缩包的修改时间。
+    """
+    archive_path, members = split_location(path)
+    try:
+        stat = os.stat(archive_path)
+        if not members:
+            return stat.st_size, stat.st_mtime_ns
+        with _open_member_chain(archive_path, members[:-1]) as archive:
+            info = archive.getinfo(members[-1])
+        return info.file_size, stat.st_mtime_ns
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+class ArchiveCache:
+    """已打开压缩包的缓存 - 同一压缩包（含嵌套压缩包）在一次分析中只打开、解压一次
+
+    不使用缓存时，每次打开嵌套压缩包的成员或查询其签名都要重新打开外层压缩包并解压整条成员链。
+    嵌套压缩包解压到内存后再打开（在压缩流上随机定位需要从头重新解压）。
+    通过activate()在当前线程激活后，open_report/report_signature会自动使用缓存。
+    外层压缩包的大小或修改时间变化时重新打开；max_archives为保留的成员链数量上限（LRU），None为不限。
+    """
+
+    def __init__(self, max_archives=None):
+        self.max_archives = max_archives
+        self._archives = OrderedDict()  # {(磁盘路径, (成员, ...)): (外层签名, ZipFile)}
+        self._lock = threading.RLock()
+
+    @contextlib.contextmanager
+    def activate(self):
+        """在当前线程中激活缓存"""
+        previous = getattr(_current, "archives", None)
+        _current.archives = self
+        try:
+            yield self
+        finally:
+            _current.archives = previous
+
+    def get(self, archive_path, members=()):
+        """逐层打开的最内层ZipFile（由缓存负责关闭）"""
+        stat = os.stat(archive_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        key = (archive_path, tuple(members))
+        with self._lock:
+            entry = self._archives.get(key)
+            if entry is not None and entry[0] == signature:
+                self._archives.move_to_end(key)
+                return entry[1]
+            if members:
+                parent = self.get(archive_path, members[:-1])
+                archive = zipfile.ZipFile(io.BytesIO(parent.read(members[-1])))
+            else:
+                archive = zipfile.ZipFile(archive_path)
+            if entry is not None:
+                entry[1].close()
+            self._archives[key] = (signature, archive)
+            self._archives.move_to_end(key)
+            while self.max_archives is not None and len(self._archives) > self.max_archives:
+                _, (_, evicted) = self._archives.popitem(last=False)
+                evicted.close()
+            return archive
+
+    def close(self):
+        with self._lock:
+            for _, archive in self._archives.values():
+                archive.close()
+            self._archives.clear()
+
+
+@contextlib.contextmanager
+def _open_member_chain(archive_path, members):
+    """逐层打开嵌套压缩包，返回最内层的ZipFile（当前线程激活了ArchiveCache时使用缓存）"""
+    cache = getattr(_current, "archives", None)
+    if cache is not None:
+        yield cache.get(archive_path, members)
+        return
+    with contextlib.ExitStack() as stack:
+        archive = stack.enter_context(zipfile.ZipFile(archive_path))
+        for member in members:
+            member_file = stack.enter_context(archive.open(member))
+            archive = stack.enter_context(zipfile.ZipFile(member_file))
+        yield archive
+
+
+@contextlib.contextmanager
+def open_report(path, mode='rb', encoding=None):
+    """打开报告文件，支持直接流式读取压缩包（含嵌套压缩包）内的成员，无需解压到磁盘
+
+    Args:
+        mode: 'rb' 或 'r'
+        encoding: 文本模式下的编码
+    """
+    if not is_archive_location(path):
+        with open(path, mode, encoding=encoding) as f:
+            yield f
+        return
+
+    archive_path, members = split_location(path)
+    with _open_member_chain(archive_path, members[:-1]) as archive:
+        with archive.open(members[-1]) as member_file:
+            if 'b' in mode:
+                yield member_file
+            else:
+                with io.TextIOWrapper(member_file, encoding=encoding) as text_file:
+                    yield text_file
+
+
+def iter_archive_members(archive_location, archive_file, is_skipped_dir_path, parent_dirs=()):
+    """列出压缩包内的文件（嵌套压缩包递归展开），跳过is_skipped_dir_path判定为需跳过的目录
+
+    Args:
+        is_skipped_dir_path: 接收成员所在目录层级（目录名列表，含parent_dirs），返回是否跳过
+        parent_dirs: 嵌套压缩包在外层压缩包中所在的目录层级
+
+    Yields:
+        (成员路径, 文件名)
+    """
+    with zipfile.ZipFile(archive_file) as archive:
+        names = [info.filename for info in archive.infolist() if not info.is_dir()]
+        # 与磁盘遍历一致：若存在同名目录（tradefed会同时保留结果目录和zip），跳过该zip
+        member_dirs = set()
+        for name in names:
+            parts = name.lower().split("/")
+            for depth in range(1, len(parts)):
+                member_dirs.add("/".join(parts[:depth]))
+        for name in names:
+            parts = name.split("/")
+            dir_names = list(parent_dirs) + parts[:-1]
+            if is_skipped_dir_path(dir_names):
+                continue
+            location = make_location(archive_location, name)
+            filename = parts[-1]
+            if filename.lower().endswith(ARCHIVE_SUFFIX):
+                if name[:-len(ARCHIVE_SUFFIX)].lower() in member_dirs:
+                    continue
+                try:
+                    with archive.open(name) as nested_file:
+                        yield from iter_archive_members(location, nested_file, is_skipped_dir_path, dir_names)
+                except (zipfile.BadZipFile, OSError):
+                    yield location, filename
+                continue
+            yield location, filename
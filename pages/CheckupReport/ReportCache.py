@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+import sqlite3
+
+from .ReportArchive import report_signature
+
+# 解析逻辑（各分析器的extract函数）变更时递增，使旧缓存自动失效
+PARSER_VERSION = 2
+CACHE_FILE_NAME = "checkup_report_cache.db"
+# 程序目录不可写（如安装在Program Files下）时，数据库放在用户数据目录下的该子目录中
+USER_DATA_DIR_NAME = "CheckupReport"
+
+
+def get_default_cache_path(file_name=CACHE_FILE_NAME):
+    """缓存数据库默认位于程序目录（与config.ini同级），程序目录不可写时位于用户数据目录"""
+    if getattr(sys, 'frozen', False):
+        app_dir = os.path.dirname(sys.executable)
+    else:
+        app_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if not os.access(app_dir, os.W_OK):
+        base_dir = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+        app_dir = os.path.join(base_dir, USER_DATA_DIR_NAME)
+        os.makedirs(app_dir, exist_ok=True)
+    return os.path.join(app_dir, file_name)
+
+
+class ReportCache:
+    """报告解析结果缓存 - 以 路径+大小+修改时间+解析器版本 为键持久化到SQLite
+
+    重复分析同一目录或切换GO/FULL模式时，未变化的报告直接复用解析记录，
+    只需重新执行规则检查。压缩包成员以成员大小和外层压缩包的修改时间作为签名。
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_default_cache_path()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS report_records (
+                path TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                parser_version INTEGER NOT NULL,
+                record TEXT NOT NULL,
+                PRIMARY KEY (path, kind)
+            )
+        """)
+        return conn
+
+    def load_records(self, tasks):
+        """查询缓存
+
+        Args:
+            tasks: [(报告类型, 文件路径, 解析函数), ...]
+
+        Returns:
+            tuple: (命中的记录 {(报告类型, 文件路径): 记录}, 文件签名 {(报告类型, 文件路径): (大小, 修改时间ns)})
+        """
+        hits = {}
+        signatures = {}
+        for kind, path, _ in tasks:
+            signature = report_signature(path)
+            if signature is not None:
+                signatures[(kind, path)] = signature
+        if not signatures:
+            return hits, signatures
+
+        try:
+            conn = self._connect()
+        except sqlite3.Error:
+            return hits, signatures
+        try:
+            for (kind, path), (size, mtime_ns) in signatures.items():
+                row = conn.execute(
+                    "SELECT record FROM report_records WHERE path = ? AND kind = ? "
+                    "AND size = ? AND mtime_ns = ? AND parser_version = ?",
+                    (path, kind, size, mtime_ns, PARSER_VERSION)
+                ).fetchone()
+                if row is not None:
+                    hits[(kind, path)] = {"data": json.loads(row[0])}
+        except (sqlite3.Error, ValueError):
+            pass
+        finally:
+            conn.close()
+        return hits, signatures
+
+    def save_records(self, records, signatures):
+        """保存解析成功的记录（解析出错的记录不缓存，下次重新解析）"""
+        rows = []
+        for key, record in records.items():
+            if "error" in record or key not in signatures:
+                continue
+            kind, path = key
+            size, mtime_ns = signatures[key]
+            rows.append((path, kind, size, mtime_ns, PARSER_VERSION,
+                         json.dumps(record["data"], ensure_ascii=False)))
+        if not rows:
+            return
+
+        try:
+            conn = self._connect()
+        except sqlite3.Error:
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO report_records "
+                    "(path, kind, size, mtime_ns, parser_version, record) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
@@ -0,0 +1,257 @@
+import re
+import json
+import sqlite3
+import datetime
+
+from .ReportCache import get_default_cache_path
+
+HISTORY_FILE_NAME = "checkup_report_history.db"
+# 默认与最近几次同产品构建对比
+DEFAULT_HISTORY_BUILDS = 3
+
+ReportDelimiter = "=" * 100
+
+
+def split_fingerprint(fingerprint):
+    """将Fingerprint拆分为 (产品, 构建)
+
+    例如 google/product/device:14/UP1A.231005.007/123456:user/release-keys
+    拆分为 ("google/product/device", "14/UP1A.231005.007/123456")
+    """
+    parts = (fingerprint or "").split(":")
+    product = parts[0]
+    build = parts[1] if len(parts) > 1 else ""
+    return product, build
+
+
+def tool_build_number(tool_version):
+    """从工具版本中提取构建号：'12.0_r1 / 12345' -> 12345，'2.0 (777)' -> 777"""
+    if not tool_version:
+        return 0
+    if " / " in tool_version:
+        digits = re.sub(r'[^\d]', '', tool_version.split(" / ")[-1])
+        return int(digits) if digits else 0
+    match = re.search(r'\((\d+)\)', tool_version)
+    return int(match.group(1)) if match else 0
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_order_key(fingerprint, security_patch):
+    """构建的先后顺序：先比较安全补丁日期，再比较Fingerprint中的增量版本号（incremental）
+
+    例如 google/product/device:14/UP1A.231005.007/123456:user/release-keys 的增量版本号为123456，
+    不是纯数字的增量版本号按字符串比较，排在纯数字的之前。
+    """
+    incremental = split_fingerprint(fingerprint)[1].rsplit("/", 1)[-1]
+    number = to_int(incremental)
+    return (security_patch or "", number if number is not None else -1, incremental)
+
+
+class ReportHistory:
+    """报告分析历史 - 将每次分析的各测试套件摘要写入SQLite
+
+    以Fingerprint中的产品部分（品牌/产品/设备）区分产品，可将当前送测与同产品、
+    同版本类型（GO/FULL）的前N个构建对比，找出PASS数下降、FAIL数增加或测试工具版本回退。
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or get_default_cache_path(HISTORY_FILE_NAME)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                analyzed_at TEXT NOT NULL,
+                test_path TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                verdict TEXT NOT NULL,
+                product TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                security_patch TEXT NOT NULL,
+                device_info_version TEXT,
+                errors TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS suite_results (
+                run_id INTEGER NOT NULL,
+                suite_plan TEXT NOT NULL,
+                tool_version TEXT NOT NULL,
+                passed INTEGER,
+                failed INTEGER,
+                modules_done INTEGER,
+                modules_total INTEGER,
+                fingerprint TEXT NOT NULL,
+                security_patch TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_runs_fingerprint ON runs (fingerprint);
+            CREATE INDEX IF NOT EXISTS idx_runs_product ON runs (product, mode, analyzed_at);
+            CREATE INDEX IF NOT EXISTS idx_runs_analyzed_at ON runs (analyzed_at);
+            CREATE INDEX IF NOT EXISTS idx_suite_results_run ON suite_results (run_id);
+        """)
+        return conn
+
+    def record_run(self, result, mode, analyzed_at=None):
+        """保存一次分析结果，返回记录ID
+
+        Args:
+            result: AnalysisResult
+            mode: 版本类型（GO/FULL）
+        """
+        analyzed_at = analyzed_at or datetime.datetime.now().isoformat(timespec="seconds")
+        fingerprint = result.fingerprints[0] if result.fingerprints else ""
+        security_patch = result.security_patches[0] if result.security_patches else ""
+        product, _ = split_fingerprint(fingerprint)
+
+        conn = self._connect()
+        try:
+            with conn:
+                run_id = conn.execute(
+                    "INSERT INTO runs (analyzed_at, test_path, mode, verdict, product, fingerprint, "
+                    "security_patch, device_info_version, errors) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (analyzed_at, result.test_path, mode, result.verdict, product, fingerprint,
+                     security_patch, result.device_info_version, json.dumps(result.errors, ensure_ascii=False))
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO suite_results (run_id, suite_plan, tool_version, passed, failed, "
+                    "modules_done, modules_total, fingerprint, security_patch) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run_id, summary["suite_plan"], summary["tool_version"], to_int(summary["passed"]),
+                      to_int(summary["failed"]), to_int(summary["modules_done"]), to_int(summary["modules_total"]),
+                      summary["fingerprint"], summary["security_patch"])
+                     for summary in result.suite_summaries]
+                )
+            return run_id
+        finally:
+            conn.close()
+
+    def get_run(self, run_id):
+        """读取一次分析记录，返回dict（含suites列表），不存在时返回None"""
+        conn = self._connect()
+        try:
+            return self._load_run(conn, run_id)
+        finally:
+            conn.close()
+
+    def previous_builds(self, run_id, limit=DEFAULT_HISTORY_BUILDS):
+        """同产品、同版本类型中构建顺序在当前构建之前的N个构建（每个Fingerprint取其最近一次分析），按构建顺序倒序
+
+        构建顺序见build_order_key，与分析的先后无关（重新分析旧构建时不会与更新的构建对比），
+        顺序相同的不同构建再按分析的先后区分。
+        """
+        conn = self._connect()
+        try:
+            current = conn.execute(
+                "SELECT product, mode, fingerprint, security_patch FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()
+            if current is None or not current[0]:
+                return []
+            product, mode, fingerprint, security_patch = current
+            current_key = (build_order_key(fingerprint, security_patch), run_id)
+            rows = conn.execute(
+                "SELECT MAX(id), fingerprint, security_patch FROM runs WHERE product = ? AND mode = ? "
+                "AND fingerprint != ? GROUP BY fingerprint",
+                (product, mode, fingerprint)
+            ).fetchall()
+            candidates = sorted(
+                ((build_order_key(row[1], row[2]), row[0]) for row in rows), reverse=True
+            )
+            previous = [key for key in candidates if key < current_key][:limit]
+            return [self._load_run(conn, key[1]) for key in previous]
+        finally:
+            conn.close()
+
+    def _load_run(self, conn, run_id):
+        row = conn.execute(
+            "SELECT id, analyzed_at, test_path, mode, verdict, product, fingerprint, security_patch, "
+            "device_info_version, errors FROM runs WHERE id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        keys = ("id", "analyzed_at", "test_path", "mode", "verdict", "product", "fingerprint",
+                "security_patch", "device_info_version", "errors")
+        run = dict(zip(keys, row))
+        run["errors"] = json.loads(run["errors"])
+        suite_keys = ("suite_plan", "tool_version", "passed", "failed", "modules_done", "modules_total",
+                      "fingerprint", "security_patch")
+        run["suites"] = [
+            dict(zip(suite_keys, suite_row)) for suite_row in conn.execute(
+                "SELECT suite_plan, tool_version, passed, failed, modules_done, modules_total, fingerprint, "
+                "security_patch FROM suite_results WHERE run_id = ? ORDER BY rowid", (run_id,)
+            )
+        ]
+        return run
+
+    def compare(self, run_id, limit=DEFAULT_HISTORY_BUILDS):
+        """将一次分析与同产品的前N个构建对比
+
+        Returns:
+            dict: {"current": 当前记录, "previous": [前N个构建的记录], "regressions": [与上一构建相比的回退项]}
+        """
+        current = self.get_run(run_id)
+        previous = self.previous_builds(run_id, limit) if current is not None else []
+        regressions = self.find_regressions(current, previous[0]) if previous else []
+        return {"current": current, "previous": previous, "regressions": regressions}
+
+    @staticmethod
+    def find_regressions(current, previous):
+        """找出当前构建相对上一构建的回退项（同一测试套件取第一份报告对比）"""
+        previous_build = split_fingerprint(previous["fingerprint"])[1]
+        previous_suites = {}
+        for suite in previous["suites"]:
+            previous_suites.setdefault(suite["suite_plan"], suite)
+        current_suites = {}
+        for suite in current["suites"]:
+            current_suites.setdefault(suite["suite_plan"], suite)
+
+        regressions = []
+        for suite_plan, suite in current_suites.items():
+            before = previous_suites.get(suite_plan)
+            if before is None:
+                continue
+            if suite["passed"] is not None and before["passed"] is not None and suite["passed"] < before["passed"]:
+                regressions.append(f"⚠️ {suite_plan} PASS数下降: {before['passed']} -> {suite['passed']}（上一构建 {previous_build}）")
+            if suite["failed"] is not None and before["failed"] is not None and suite["failed"] > before["failed"]:
+                regressions.append(f"⚠️ {suite_plan} FAIL数增加: {before['failed']} -> {suite['failed']}（上一构建 {previous_build}）")
+            if tool_build_number(suite["tool_version"]) < tool_build_number(before["tool_version"]):
+                regressions.append(f"⚠️ {suite_plan} 工具版本低于上一构建: {before['tool_version']} -> {suite['tool_version']}（上一构建 {previous_build}）")
+        for suite_plan in previous_suites:
+            if suite_plan not in current_suites:
+                regressions.append(f"⚠️ 上一构建 {previous_build} 中的 {suite_plan} 报告本次缺失")
+        return regressions
+
+    @staticmethod
+    def format_comparison(comparison):
+        """将对比结果格式化为输出行（各测试套件在每个构建中的PASS/FAIL数和工具版本，以及与上一构建相比的回退项）"""
+        current = comparison["current"]
+        previous = comparison["previous"]
+        if current is None or not previous:
+            return []
+
+        runs = [current] + previous
+        output_lines = [f"📈 历史对比（同产品 {current['product']} 最近 {len(previous)} 个{current['mode']}构建）:"]
+        for index, run in enumerate(runs):
+            label = "当前" if index == 0 else f"前{index}"
+            output_lines.append(f"构建[{label}]:\t{split_fingerprint(run['fingerprint'])[1]}（{run['analyzed_at']}，{run['verdict']}）")
+
+        suite_plans = []
+        for run in runs:
+            for suite in run["suites"]:
+                if suite["suite_plan"] not in suite_plans:
+                    suite_plans.append(suite["suite_plan"])
+        for suite_plan in suite_plans:
+            output_lines.append(f"{suite_plan}:")
+            for index, run in enumerate(runs):
+                label = "当前" if index == 0 else f"前{index}"
+                suite = next((s for s in run["suites"] if s["suite_plan"] == suite_plan), None)
+                if suite is None:
+                    output_lines.append(f"  [{label}]\t无报告")
+                else:
+                    output_lines.append(f"  [{label}]\tPASS {suite['passed']}\tFAIL {suite['failed']}\t工具版本 {suite['tool_version']}")
+        output_lines.extend(comparison["regressions"])
+        output_lines.append(ReportDelimiter)
+        return output_lines
@@ -0,0 +1,168 @@
+import os
+import re
+import zipfile
+
+from .ReportArchive import ARCHIVE_SUFFIX, is_archive_file, iter_archive_members
+from ..common.CancellationToken import check_cancelled
+
+# ============================ 报告类型 ============================
+KIND_APTS_XML = "apts_xml"                      # 旧版XML格式APTS报告（test_approval/test_result.xml）
+KIND_CV_XML = "cv_xml"                          # CTS_VERIFIER的test_result.xml
+KIND_FAILURES_HTML = "failures_html"            # test_result_failures_suite.html（GTS/STS/VTS/CTS等）
+KIND_PACKAGE_DEVICE_INFO = "package_device_info"  # PackageDeviceInfo.deviceinfo.json
+KIND_CTS_DEVICE_INFO = "cts_device_info"        # CTS目录下的其他deviceinfo.json（宽泛匹配时使用）
+KIND_RESULT_XML = "result_xml"                  # 所有测试套件的test_result.xml（失败用例索引使用）
+
+# tradefed目录（android-cts、android-gts等）下整体跳过的子目录（模块日志、测试用例包等，动辄数万个文件且不含报告）
+DEFAULT_SKIP_DIRS = frozenset({"logs", "proto", "testcases", "tools"})
+# 任意位置都跳过的子目录
+ALWAYS_SKIP_DIRS = frozenset({"__pycache__", ".git", ".svn"})
+# tradefed目录名：android-cts、android-gts、android-sts、android-vts等
+TRADEFED_ROOT_PATTERN = re.compile(r'^android-[a-z]*ts$')
+
+CTS_PATH_MARKERS = ('/cts/', '\\cts\\', '_cts_', 'android-cts')
+SUITE_PATTERN = re.compile(r'(?<![a-z])(apts|gts|sts|vts|cts)(?![a-z])')
+
+
+class ReportIndex:
+    """报告目录索引 - 一次遍历目录，按报告类型和测试套件对文件分类
+
+    所有分析器共用同一份索引，不再各自对完整文件列表做子串扫描。
+    同一类型内的文件保持与os.walk一致的遍历顺序。
+    ZIP压缩包（含嵌套压缩包）只读取目录表，成员以"<压缩包>!/<成员>"形式编入索引。
+    根路径本身是压缩包时总是分析其内容；目录中的压缩包只在scan_archives为True时展开
+    （目录中常同时存在结果目录和改名/复制的结果zip，默认展开会重复计入同一份结果）。
+    skip_dirs只在tradefed目录之下跳过，其他位置的同名目录（如送测目录下的tools）照常遍历。
+    """
+
+    def __init__(self, root_path, skip_dirs=DEFAULT_SKIP_DIRS, scan_archives=False):
+        self.root_path = root_path
+        self.skip_dirs = frozenset(d.lower() for d in skip_dirs)
+        self.scan_archives = scan_archives
+        self.file_count = 0
+        self._files = {}        # {报告类型: [路径, ...]}
+        self._suite_files = {}  # {报告类型: {测试套件: [路径, ...]}}
+        self._build()
+
+    def _build(self):
+        """使用os.scandir遍历目录（自上而下、先文件后子目录，与os.walk顺序一致）"""
+        if is_archive_file(self.root_path):
+            self._index_archive(self.root_path)
+            return
+        
+        root_name = os.path.basename(os.path.normpath(self.root_path)).lower()
+        stack = [(self.root_path, bool(TRADEFED_ROOT_PATTERN.match(root_name)))]
+        while stack:
+            check_cancelled()
+            current, in_tradefed = stack.pop()
+            files = []
+            subdirs = []
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            if not self._skip_dir(entry.name.lower(), in_tradefed) and not entry.is_symlink():
+                                subdirs.append(entry)
+                        else:
+                            files.append(entry)
+            except OSError:
+                continue
+            
+            # tradefed会同时保留结果目录和同名zip，已有目录时不再重复分析zip
+            subdir_names = {entry.name.lower() for entry in subdirs}
+            for entry in files:
+                if self.scan_archives and entry.name.lower().endswith(ARCHIVE_SUFFIX):
+                    if entry.name[:-len(ARCHIVE_SUFFIX)].lower() not in subdir_names and is_archive_file(entry.path):
+                        self._index_archive(entry.path)
+                        continue
+                self.file_count += 1
+                self._classify(entry.path, entry.name)
+            stack.extend(reversed([
+                (entry.path, in_tradefed or bool(TRADEFED_ROOT_PATTERN.match(entry.name.lower())))
+                for entry in subdirs
+            ]))
+    
+    def _skip_dir(self, name, in_tradefed):
+        """是否跳过名为name（小写）的子目录，in_tradefed表示其父目录位于tradefed目录之下"""
+        return name in ALWAYS_SKIP_DIRS or (in_tradefed and name in self.skip_dirs)
+    
+    def is_skipped_dir_path(self, dir_names):
+        """压缩包成员所在的目录层级（自上而下的目录名列表）中是否有需要跳过的目录"""
+        in_tradefed = False
+        for name in dir_names:
+            name = name.lower()
+            if self._skip_dir(name, in_tradefed):
+                return True
+            in_tradefed = in_tradefed or bool(TRADEFED_ROOT_PATTERN.match(name))
+        return False
+    
+    def _index_archive(self, archive_path):
+        """将压缩包内的文件编入索引"""
+        try:
+            for location, filename in iter_archive_members(archive_path, archive_path, self.is_skipped_dir_path):
+                check_cancelled()
+                self.file_count += 1
+                self._classify(location, filename)
+        except (zipfile.BadZipFile, OSError):
+            self.file_count += 1
+            self._classify(archive_path, os.path.basename(archive_path))
+    
+    def _classify(self, path, filename):
+        """根据路径和文件名判断报告类型，一个文件可同时属于多个类型"""
+        name_lower = filename.lower()
+        if "test_result.xml" in filename:
+            self._add(KIND_RESULT_XML, path)
+            if "test_approval" in path:
+                self._add(KIND_APTS_XML, path)
+            if "CTS_VERIFIER" in path:
+                self._add(KIND_CV_XML, path)
+        elif "test_result_failures_suite.html" in filename:
+            self._add(KIND_FAILURES_HTML, path)
+        elif "deviceinfo.json" in name_lower:
+            path_lower = path.lower()
+            if "packagedeviceinfo.deviceinfo.json" in name_lower:
+                self._add(KIND_PACKAGE_DEVICE_INFO, path)
+            elif "cts_verifier" not in path_lower and any(marker in path_lower for marker in CTS_PATH_MARKERS):
+                self._add(KIND_CTS_DEVICE_INFO, path)
+
+    def _add(self, kind, path):
+        suite = self.suite_of(path)
+        self._files.setdefault(kind, []).append(path)
+        self._suite_files.setdefault(kind, {}).setdefault(suite, []).append(path)
+
+    @staticmethod
+    def suite_of(path):
+        """根据路径推断所属测试套件（APTS/CTS_VERIFIER/GTS/STS/VTS/CTS/OTHER）"""
+        if "test_approval" in path:
+            return "APTS"
+        if "CTS_VERIFIER" in path:
+            return "CTS_VERIFIER"
+        matches = SUITE_PATTERN.findall(path.lower())
+        # 取离文件最近的目录标记
+        return matches[-1].upper() if matches else "OTHER"
+
+    def get_files(self, kind, suite=None):
+        """获取指定类型（可选指定测试套件）的文件列表"""
+        if suite is None:
+            return list(self._files.get(kind, []))
+        return list(self._suite_files.get(kind, {}).get(suite, []))
+
+    def all_files(self):
+        """所有已分类的报告文件（去重，保持遍历顺序）"""
+        seen = {}
+        for paths in self._files.values():
+            for path in paths:
+                seen.setdefault(path, None)
+        return list(seen)
+
+    def get_suites(self, kind):
+        """获取指定类型下出现过的测试套件"""
+        return list(self._suite_files.get(kind, {}).keys())
+
+    def has(self, kind):
+        """是否存在指定类型的文件"""
+        return bool(self._files.get(kind))
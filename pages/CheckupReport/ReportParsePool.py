@@ -0,0 +1,144 @@
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from ..common.CancellationToken import check_cancelled
+from .DocumentCache import DocumentCache
+from .ReportArchive import ArchiveCache, WORKER_ARCHIVE_CACHE_SIZE
+
+# 默认解析进程数（正则解析为CPU密集型，使用进程而非线程）
+DEFAULT_PARSE_WORKERS = min(8, os.cpu_count() or 1)
+# 任务数少于该值时直接串行解析，避免进程启动开销超过收益
+PARALLEL_MIN_TASKS = 4
+# 并行解析时检查取消令牌的间隔（秒）
+CANCEL_POLL_INTERVAL = 0.1
+
+
+# 解析子进程中的压缩包缓存：同一嵌套压缩包的多个成员分到同一子进程时不再重复解压外层
+_worker_archives = ArchiveCache(WORKER_ARCHIVE_CACHE_SIZE)
+
+
+class ReportParseError(Exception):
+    """预解析记录中保存的解析错误（在分析器中按原有方式输出）"""
+
+
+def parse_report(task):
+    """解析单个报告文件 - 进程池任务入口
+
+    Args:
+        task: (报告类型, 文件路径, 解析函数)，解析函数须为可pickle的模块级函数或静态方法
+
+    Returns:
+        dict: {"data": 解析结果} 或 {"error": 错误信息}
+    """
+    kind, path, extractor = task
+    try:
+        return {"data": extractor(path)}
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def parse_report_group(group, data=None):
+    """解析同一文件的多个任务 - 进程池任务入口
+
+    组内任务共用一个文档缓存，文件在子进程中只读取、解码一次。
+
+    Args:
+        data: 主进程预读取的文件原始字节，提供时子进程不再读取文件
+    """
+    cache = DocumentCache()
+    if data is not None:
+        cache.put(group[0][1], "bytes", data, len(data))
+    with cache.activate(), _worker_archives.activate():
+        return [parse_report(task) for task in group]
+
+
+def get_record_data(records, kind, path, extractor):
+    """获取报告的解析结果：优先使用预解析记录，缺失时在当前进程中解析"""
+    record = records.get((kind, path)) if records else None
+    if record is None:
+        return extractor(path)
+    if "error" in record:
+        raise ReportParseError(record["error"])
+    return record["data"]
+
+
+class ReportParsePool:
+    """报告解析池 - 将各报告文件分发到多个进程并行解析
+
+    结果按任务顺序合并为 {(报告类型, 文件路径): 记录}，与并行度无关，
+    保证后续Fingerprint/安全补丁一致性检查的顺序确定。
+    并行解析时同一文件的所有任务作为一组交给同一个子进程，避免重复读取。
+    """
+
+    def __init__(self, max_workers=None, executor=None):
+        # None表示使用默认进程数；小于等于1时退化为串行解析
+        self.max_workers = DEFAULT_PARSE_WORKERS if max_workers is None else max_workers
+        # 外部共享的进程池（由调用方负责关闭）；为None时每次解析临时创建
+        self.executor = executor
+
+    def parse_all(self, tasks, cancel_token=None, progress_callback=None, prefetch=None):
+        """解析全部任务，返回 {(报告类型, 文件路径): 记录}
+
+        Args:
+            cancel_token: CancellationToken，取消后抛出AnalysisCancelled
+            progress_callback: 每完成一个任务调用一次 progress_callback(kind, path)
+            prefetch: PrefetchBatch，提供时每个文件等预读取完成后再解析，并把原始字节交给解析进程
+        """
+        tasks = list(tasks)
+        if self.max_workers <= 1 or len(tasks) < PARALLEL_MIN_TASKS:
+            results = self._parse_serial(tasks, cancel_token, progress_callback, prefetch)
+        else:
+            try:
+                results = self._parse_parallel(tasks, cancel_token, progress_callback, prefetch)
+            except (OSError, BrokenProcessPool, pickle.PicklingError, RuntimeError):
+                # 进程池不可用（受限环境、打包环境等）时回退到串行解析
+                results = self._parse_serial(tasks, cancel_token, progress_callback, prefetch)
+        return {(kind, path): record for (kind, path, _), record in zip(tasks, results)}
+
+    def _parse_serial(self, tasks, cancel_token=None, progress_callback=None, prefetch=None):
+        results = []
+        for task in tasks:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            check_cancelled()
+            if prefetch is not None:
+                # 预读取的字节已放入当前线程激活的文档缓存
+                prefetch.wait(task[1])
+            results.append(parse_report(task))
+            if progress_callback is not None:
+                progress_callback(task[0], task[1])
+        return results
+
+    def _parse_parallel(self, tasks, cancel_token=None, progress_callback=None, prefetch=None):
+        shared = self.executor is not None
+        executor = self.executor if shared else ProcessPoolExecutor(max_workers=min(self.max_workers, len(tasks)))
+        futures = {}
+        try:
+            groups = {}
+            for index, task in enumerate(tasks):
+                groups.setdefault(task[1], []).append(index)
+            for path, indexes in groups.items():
+                data = prefetch.wait(path) if prefetch is not None else None
+                futures[executor.submit(parse_report_group, [tasks[index] for index in indexes], data)] = indexes
+            results = [None] * len(tasks)
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # 按提交顺序存放结果，与完成顺序无关
+                    for index, record in zip(futures[future], future.result()):
+                        results[index] = record
+                        if progress_callback is not None:
+                            progress_callback(tasks[index][0], tasks[index][1])
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+            return results
+        finally:
+            # 取消时不等待正在运行的子进程，未开始的任务直接丢弃
+            if shared:
+                for future in futures:
+                    future.cancel()
+            else:
+                executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from ..common.CancellationToken import check_cancelled
+
+# 默认预读取线程数（网络共享上的延迟远大于CPU开销，线程数可高于CPU核数）
+DEFAULT_PREFETCH_WORKERS = 8
+# 超过该大小的文件不预读取，由解析函数按需流式读取
+DEFAULT_PREFETCH_MAX_FILE_SIZE = 16 * 1024 * 1024
+# 等待预读取结果时检查取消令牌的间隔（秒）
+PREFETCH_POLL_INTERVAL = 0.1
+
+
+class PrefetchBatch:
+    """一批正在进行的预读取，解析前通过wait()取得对应文件的原始字节"""
+
+    def __init__(self, executor, futures):
+        self._executor = executor
+        self._futures = futures  # {文件路径: Future}
+
+    def wait(self, path):
+        """等待文件预读取完成，返回原始字节；未预读取或读取失败时返回None"""
+        future = self._futures.get(path)
+        if future is None:
+            return None
+        while not future.done():
+            check_cancelled()
+            wait([future], timeout=PREFETCH_POLL_INTERVAL)
+        if future.cancelled() or future.exception() is not None:
+            # 读取错误留给解析函数按原有方式报告
+            return None
+        return future.result()
+
+    def close(self):
+        """丢弃尚未开始的预读取，不等待正在进行的读取"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ReportPrefetcher:
+    """报告预读取 - 用有界线程池并发读取报告文件，放入本次分析的文档缓存
+
+    报告位于SMB/NFS等网络共享时，每次打开和读取都有数十毫秒延迟；
+    预读取使这些延迟相互重叠，解析函数随后直接从内存读取。
+    """
+
+    def __init__(self, max_workers=DEFAULT_PREFETCH_WORKERS, max_file_size=DEFAULT_PREFETCH_MAX_FILE_SIZE):
+        self.max_workers = max_workers
+        self.max_file_size = max_file_size
+
+    def start(self, paths, cache, file_sizes=None):
+        """按给定顺序开始预读取，立即返回PrefetchBatch
+
+        Args:
+            paths: 文件路径（重复的路径只读取一次）
+            cache: 接收原始字节的DocumentCache
+            file_sizes: {文件路径: 大小}，用于跳过过大的文件
+        """
+        file_sizes = file_sizes or {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="report-prefetch")
+        futures = {}
+        for path in paths:
+            if path in futures or file_sizes.get(path, 0) > self.max_file_size:
+                continue
+            futures[path] = executor.submit(cache.load_bytes, path)
+        return PrefetchBatch(executor, futures)
@@ -0,0 +1,53 @@
+import time
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .ReportAnalyzerCore import ReportAnalyzerCore
+from .ReportWatcher import ReportWatcher, DEFAULT_WATCH_INTERVAL
+
+
+class ReportWatchThread(QThread):
+    """目录监视线程 - 在后台轮询报告目录，报告写入完成后重新分析（监视逻辑见ReportWatcher）
+
+    每次更新依次发射performance_ready、analysis_finished（或error_occurred）和watch_updated，
+    信号与ReportAnalyzer相同，界面可复用同一套结果显示。监视模式不写入历史记录。
+    """
+
+    analysis_finished = pyqtSignal(str, str)
+    error_occurred = pyqtSignal(str)
+    performance_ready = pyqtSignal(str)
+    # 更新说明，如"[12:00:00] 新增 2 / 变更 0 / 删除 0 个报告文件，结论: FAIL"
+    watch_updated = pyqtSignal(str)
+
+    def __init__(self, test_path, check_apts=True, interval=DEFAULT_WATCH_INTERVAL, parse_workers=None,
+                 cache_path=None, merge_results=False):
+        super().__init__()
+        self.test_path = test_path
+        self.check_apts = check_apts
+        self.watcher = ReportWatcher(
+            test_path,
+            lambda: ReportAnalyzerCore(test_path, check_apts, parse_workers, True, cache_path,
+                                       merge_results=merge_results),
+            interval
+        )
+
+    def run(self):
+        """持续监视直到stop()"""
+        self.watcher.run(self.on_update, self.on_error)
+
+    def on_update(self, update):
+        result = update.result
+        self.performance_ready.emit(result.performance_result)
+        if result.fatal_error is not None:
+            self.error_occurred.emit(result.fatal_error)
+        else:
+            self.analysis_finished.emit(result.full_result, result.error_result)
+        timestamp = time.strftime("%H:%M:%S", time.localtime(update.timestamp))
+        self.watch_updated.emit(f"[{timestamp}] {update.describe()}，结论: {result.verdict}")
+
+    def on_error(self, error):
+        self.error_occurred.emit(f"监视分析出错: {error}")
+
+    def stop(self):
+        """停止监视（可在任意线程调用），线程会在当前分析的下一个检查点退出"""
+        self.watcher.stop()
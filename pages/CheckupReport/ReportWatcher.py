@@ -0,0 +1,154 @@
+import os
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import List
+
+from .ReportIndex import ReportIndex
+from .ReportArchive import split_location
+from ..common.CancellationToken import AnalysisCancelled
+
+# 默认轮询间隔（秒）
+DEFAULT_WATCH_INTERVAL = 5.0
+# 文件签名连续多少次轮询不变才视为写入完成（tradefed边执行边写结果，复制到共享目录也需要时间）
+DEFAULT_SETTLE_POLLS = 1
+# 一直在变化的文件最多等待的轮询次数，超过后不再等待（避免个别文件持续写入导致永不分析）
+DEFAULT_MAX_SETTLE_WAIT = 12
+
+
+@dataclass
+class WatchUpdate:
+    """一次因报告文件变化而重新分析的结果"""
+    result: object            # AnalysisResult
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    timestamp: float = 0.0
+
+    def describe(self):
+        """变化摘要，如"新增 2 / 变更 1 / 删除 0 个报告文件\""""
+        return (f"新增 {len(self.added)} / 变更 {len(self.changed)} / "
+                f"删除 {len(self.removed)} 个报告文件")
+
+
+class ReportWatcher:
+    """报告目录监视器 - 轮询目录，报告文件写入完成后重新分析并更新检查结论
+
+    每次轮询只遍历目录和stat报告文件（与ReportIndex相同的剪枝规则），不读取文件内容；
+    文件签名（大小、修改时间）连续settle_polls次轮询不变才视为写入完成，发生变化的文件都已完成时才重新分析。
+    重新分析复用本次轮询的目录索引，未变化文件的解析记录直接从ReportCache读取，
+    实际只解析新增或变化的报告，再对全部记录重新执行规则检查，得到更新后的整体结论。
+    使用轮询而不是inotify等系统通知：报告通常位于SMB/NFS共享目录，系统通知在这些文件系统上不可靠。
+    """
+
+    def __init__(self, test_path, core_factory, interval=DEFAULT_WATCH_INTERVAL,
+                 settle_polls=DEFAULT_SETTLE_POLLS, max_settle_wait=DEFAULT_MAX_SETTLE_WAIT, scan_archives=False):
+        """
+        Args:
+            core_factory: 无参数的可调用对象，每次分析返回一个新的ReportAnalyzerCore（应启用ReportCache）
+            interval: 轮询间隔（秒）
+            scan_archives: 是否展开目录中的ZIP结果包（与ReportIndex相同）
+        """
+        self.test_path = test_path
+        self.core_factory = core_factory
+        self.interval = interval
+        self.settle_polls = settle_polls
+        self.max_settle_wait = max_settle_wait
+        self.scan_archives = scan_archives
+        self.analyzed = None        # 上次分析时的 {路径: 签名}，尚未分析时为None
+        self._last_snapshot = {}
+        self._stable_polls = {}     # {路径: 签名连续未变的轮询次数}
+        self._waiting_polls = 0
+        self._core = None
+        self._stop_event = threading.Event()
+
+    def snapshot(self, report_index):
+        """当前各报告文件的签名 {路径: (大小, 修改时间ns)}
+
+        压缩包成员使用外层压缩包的签名（整个压缩包写入完成后成员才可读取）。
+        """
+        archive_stats = {}
+        signatures = {}
+        for path in report_index.all_files():
+            disk_path, _ = split_location(path)
+            if disk_path not in archive_stats:
+                try:
+                    stat = os.stat(disk_path)
+                    archive_stats[disk_path] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    archive_stats[disk_path] = None
+            if archive_stats[disk_path] is not None:
+                signatures[path] = archive_stats[disk_path]
+        return signatures
+
+    def poll(self):
+        """执行一次轮询；有写入完成的变化时重新分析并返回WatchUpdate，否则返回None
+
+        第一次轮询直接分析目录中已有的报告。
+        """
+        report_index = ReportIndex(self.test_path, scan_archives=self.scan_archives)
+        current = self.snapshot(report_index)
+        for path, signature in current.items():
+            if self._last_snapshot.get(path) == signature:
+                self._stable_polls[path] = self._stable_polls.get(path, 0) + 1
+            else:
+                self._stable_polls[path] = 0
+        self._stable_polls = {path: count for path, count in self._stable_polls.items() if path in current}
+        self._last_snapshot = current
+
+        if self.analyzed is None:
+            return self._analyze(report_index, current, list(current), [], [])
+
+        added = [path for path in current if path not in self.analyzed]
+        changed = [path for path in current if path in self.analyzed and self.analyzed[path] != current[path]]
+        removed = [path for path in self.analyzed if path not in current]
+        if not (added or changed or removed):
+            self._waiting_polls = 0
+            return None
+        settled = all(self._stable_polls[path] >= self.settle_polls for path in added + changed)
+        if not settled and self._waiting_polls < self.max_settle_wait:
+            self._waiting_polls += 1
+            return None
+        return self._analyze(report_index, current, added, changed, removed)
+
+    def _analyze(self, report_index, current, added, changed, removed):
+        self._waiting_polls = 0
+        self._core = self.core_factory()
+        if self._stop_event.is_set():
+            self._core.cancel()
+        try:
+            result = self._core.analyze(report_index)
+        finally:
+            self._core = None
+        self.analyzed = current
+        return WatchUpdate(result, added, changed, removed, time.time())
+
+    def run(self, on_update, on_error=None):
+        """持续轮询直到stop()；每次重新分析后调用 on_update(WatchUpdate)
+
+        分析过程中的异常交给on_error(异常)处理后继续监视，未提供on_error时向上抛出。
+        """
+        while not self._stop_event.is_set():
+            try:
+                update = self.poll()
+            except AnalysisCancelled:
+                break
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+            else:
+                if update is not None:
+                    on_update(update)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        """停止监视（可在任意线程调用），正在进行的分析会在下一个检查点退出"""
+        self._stop_event.set()
+        core = self._core
+        if core is not None:
+            core.cancel()
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
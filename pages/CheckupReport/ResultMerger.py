@@ -0,0 +1,148 @@
+import xml.etree.ElementTree as ET
+from xml.parsers import expat
+from dataclasses import dataclass
+
+from .DocumentCache import open_document
+from ..common.CancellationToken import check_cancelled
+
+# 用例结果编码（每个用例在bytearray中占1字节）
+OUTCOME_PASS = 1
+OUTCOME_FAIL = 2
+OUTCOME_OTHER = 3    # IGNORED、ASSUMPTION_FAILURE等
+OUTCOME_CODES = {"pass": OUTCOME_PASS, "fail": OUTCOME_FAIL}
+# 曾经失败过的标记位（与最终结果一起保存在同一字节中）
+FAILED_BEFORE = 4
+
+
+@dataclass
+class MergedSuiteResult:
+    """同一测试套件多个分片/重试结果合并后的最终结果（最后一次执行的结果为准）"""
+    suite_plan: str           # "套件名 / 计划"，与失败页面中的Suite / Plan一致
+    attempts: int             # 参与合并的结果文件数
+    tests: int = 0            # 去重后的用例数
+    passed: int = 0
+    failed: int = 0
+    other: int = 0
+    # 前一次执行失败、之后的执行通过的用例数
+    recovered: int = 0
+    # 最后一个结果文件中的Fingerprint与安全补丁
+    fingerprint: str = ""
+    security_patch: str = ""
+
+
+def result_group_key(header):
+    """结果文件的合并分组："套件名 / 计划"（同一套件的分片和重试结果合并）"""
+    result = header.get("Result", {})
+    suite_name = result.get("suite_name", "")
+    if not suite_name:
+        return None
+    return f"{suite_name} / {result.get('suite_plan', '')}"
+
+
+def result_start_time(header):
+    """结果文件的开始时间（毫秒），用于确定执行顺序"""
+    try:
+        return int(header.get("Result", {}).get("start", 0))
+    except ValueError:
+        return 0
+
+
+class ResultMerger:
+    """分片/重试结果合并器 - 按执行顺序流式读取同一套件的各test_result.xml
+
+    每个用例只保存一个整数键和1字节状态：模块（名称+ABI）、TestCase名称和用例名
+    先映射为整数（同名的TestCase/用例只保存一份名称），用例以三者组合成的整数为键；状态存放在bytearray中，
+    低2位为最后一次的结果（后读取的覆盖先前的），另有1位记录是否失败过。
+    不构建DOM，也不创建元素对象。
+    """
+
+    def __init__(self):
+        self._modules = {}      # {(模块名, ABI): 模块ID}
+        self._testcases = {}    # {TestCase名称: ID}
+        self._names = {}        # {用例名: ID}
+        self._tests = {}        # {模块ID<<64 | TestCase ID<<32 | 用例名ID: 用例序号}
+        self._outcomes = bytearray()
+        self.attempts = 0
+        self.fingerprint = ""
+        self.security_patch = ""
+
+    def _intern(self, table, key):
+        value = table.get(key)
+        if value is None:
+            value = table[key] = len(table)
+        return value
+
+    def add_result_file(self, xml_file):
+        """按执行顺序依次加入结果文件
+
+        用例的结果和名称都在<Test>的开始标签中，只需处理开始标签：
+        直接使用expat回调，不创建元素对象。
+        """
+        self.attempts += 1
+        tests = self._tests
+        names = self._names
+        outcomes = self._outcomes
+        # [模块键, TestCase键]
+        keys = [0, 0]
+
+        def start_element(tag, attrs):
+            if tag == "Test":
+                outcome = OUTCOME_CODES.get(attrs.get("result"), OUTCOME_OTHER)
+                if outcome == OUTCOME_FAIL:
+                    outcome |= FAILED_BEFORE
+                name = attrs.get("name", "")
+                name_id = names.get(name)
+                if name_id is None:
+                    name_id = names[name] = len(names)
+                key = keys[1] | name_id
+                test_id = tests.get(key)
+                if test_id is None:
+                    tests[key] = len(outcomes)
+                    outcomes.append(outcome)
+                else:
+                    outcomes[test_id] = outcome | (outcomes[test_id] & FAILED_BEFORE)
+            elif tag == "TestCase":
+                keys[1] = keys[0] | self._intern(self._testcases, attrs.get("name", "")) << 32
+            elif tag == "Module":
+                check_cancelled()
+                keys[0] = keys[1] = self._intern(self._modules, (attrs.get("name", ""), attrs.get("abi", ""))) << 64
+            elif tag == "Build":
+                self.fingerprint = attrs.get("build_fingerprint", "")
+                self.security_patch = attrs.get("build_version_security_patch", "")
+
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = start_element
+        with open_document(xml_file, 'rb') as xmlf:
+            try:
+                parser.ParseFile(xmlf)
+            except expat.ExpatError as e:
+                # 与ElementTree一致，报告为XML解析错误
+                raise ET.ParseError(str(e)) from None
+
+    def result(self, suite_plan):
+        outcomes = self._outcomes
+        return MergedSuiteResult(
+            suite_plan=suite_plan,
+            attempts=self.attempts,
+            tests=len(outcomes),
+            passed=outcomes.count(OUTCOME_PASS) + outcomes.count(OUTCOME_PASS | FAILED_BEFORE),
+            failed=outcomes.count(OUTCOME_FAIL | FAILED_BEFORE),
+            other=outcomes.count(OUTCOME_OTHER) + outcomes.count(OUTCOME_OTHER | FAILED_BEFORE),
+            recovered=outcomes.count(OUTCOME_PASS | FAILED_BEFORE),
+            fingerprint=self.fingerprint,
+            security_patch=self.security_patch,
+        )
+
+
+def merge_suite_results(task_key):
+    """合并一个套件的多个结果文件 - 进程池任务入口
+
+    Args:
+        task_key: ("套件名 / 计划", (按执行顺序排列的结果文件, ...))
+    """
+    suite_plan, xml_files = task_key
+    merger = ResultMerger()
+    for xml_file in xml_files:
+        merger.add_result_file(xml_file)
+    return merger.result(suite_plan)
@@ -0,0 +1,230 @@
+import bisect
+
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
+                             QListView, QAbstractItemView, QApplication)
+from PyQt6.QtGui import QFont, QColor, QPainter, QKeySequence, QShortcut
+from PyQt6.QtCore import (Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel,
+                          QTimer)
+
+ERROR_MARKERS = ('❌', '⚠️')
+# 过滤输入停止后延迟多久再过滤（毫秒），避免每次按键都遍历全部行
+FILTER_DELAY_MS = 150
+
+
+class ResultLineModel(QAbstractListModel):
+    """分析结果行模型 - 只保存文本行，颜色等显示格式在视图请求可见行时才计算"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lines = []
+        # 含❌/⚠️的行号（升序），首次跳转时才建立
+        self._error_rows = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        line = self._lines[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return line
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if '❌' in line:
+                return QColor("#E91E63")
+            if '⚠️' in line:
+                return QColor("#e67e22")
+        return None
+
+    def set_lines(self, lines):
+        self.beginResetModel()
+        self._lines = list(lines)
+        self._error_rows = None
+        self.endResetModel()
+
+    def append_lines(self, lines):
+        if not lines:
+            return
+        start = len(self._lines)
+        self.beginInsertRows(QModelIndex(), start, start + len(lines) - 1)
+        self._lines.extend(lines)
+        if self._error_rows is not None:
+            self._error_rows.extend(start + i for i, line in enumerate(lines) if is_error_line(line))
+        self.endInsertRows()
+
+    def line(self, row):
+        return self._lines[row]
+
+    def lines(self):
+        return self._lines
+
+    def error_rows(self):
+        """含❌/⚠️的行号（升序）"""
+        if self._error_rows is None:
+            self._error_rows = [row for row, line in enumerate(self._lines) if is_error_line(line)]
+        return self._error_rows
+
+
+def is_error_line(line):
+    return any(marker in line for marker in ERROR_MARKERS)
+
+
+class ResultListView(QListView):
+    """结果列表 - 行高统一，只布局和绘制可见行；没有内容时显示占位文本"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.placeholder_text = ""
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(1000)
+        self.setWordWrap(False)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.model() is not None and self.model().rowCount() == 0 and self.placeholder_text:
+            painter = QPainter(self.viewport())
+            painter.setPen(QColor("#7f8c8d"))
+            painter.drawText(self.viewport().rect().adjusted(4, 4, -4, -4),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, self.placeholder_text)
+
+
+class ResultView(QWidget):
+    """分析结果视图 - 基于模型/视图的结果区域，支持输入即过滤和跳转到错误行
+
+    输出可达数万行（含失败用例列表），QTextEdit的整体排版会占满界面线程；
+    这里只保存文本行，绘制时间和内存与可见行数相关，与总行数基本无关。
+    提供append/setPlainText/clear/toPlainText/verticalScrollBar等与QTextEdit相同的接口。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = ResultLineModel(self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(3)
+
+        toolbar = QHBoxLayout()
+        toolbar.setSpacing(4)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("输入关键字过滤结果...")
+        self.filter_edit.setClearButtonEnabled(True)
+        toolbar.addWidget(self.filter_edit, 1)
+        self.prev_error_btn = QPushButton("上一个错误")
+        self.next_error_btn = QPushButton("下一个错误")
+        for button in (self.prev_error_btn, self.next_error_btn):
+            button.setStyleSheet("""
+                QPushButton {
+                    border: 1px solid #39C5BB;
+                    border-radius: 4px;
+                    padding: 3px 8px;
+                    color: #2c3e50;
+                    background-color: white;
+                }
+                QPushButton:hover {
+                    background-color: #e8f8f7;
+                }
+            """)
+            toolbar.addWidget(button)
+        layout.addLayout(toolbar)
+
+        self.list_view = ResultListView()
+        self.list_view.setModel(self.proxy)
+        font = QFont()
+        font.setFamilies(["Consolas", "Monaco", "Courier New", "monospace"])
+        font.setPixelSize(12)
+        self.list_view.setFont(font)
+        self.list_view.setMinimumHeight(200)
+        layout.addWidget(self.list_view, 1)
+
+        # 过滤在输入停止后执行
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
+
+        self.prev_error_btn.clicked.connect(lambda: self.jump_to_error(forward=False))
+        self.next_error_btn.clicked.connect(lambda: self.jump_to_error(forward=True))
+        QShortcut(QKeySequence("F8"), self, lambda: self.jump_to_error(forward=True))
+        QShortcut(QKeySequence("Shift+F8"), self, lambda: self.jump_to_error(forward=False))
+        QShortcut(QKeySequence.StandardKey.Copy, self.list_view, self.copy_selection)
+        self.list_view.doubleClicked.connect(self.on_double_clicked)
+
+    # ==================== 与QTextEdit兼容的接口 ====================
+    def append(self, text):
+        """追加文本（可含多行）并滚动到末尾"""
+        self.model.append_lines(text.split("\n"))
+        self.list_view.scrollToBottom()
+
+    def setPlainText(self, text):
+        self.model.set_lines(text.split("\n") if text else [])
+
+    def clear(self):
+        self.model.set_lines([])
+
+    def toPlainText(self):
+        return "\n".join(self.model.lines())
+
+    def setPlaceholderText(self, text):
+        self.list_view.placeholder_text = text
+        self.list_view.viewport().update()
+
+    def verticalScrollBar(self):
+        return self.list_view.verticalScrollBar()
+
+    # ==================== 过滤与跳转 ====================
+    def apply_filter(self):
+        self.proxy.setFilterFixedString(self.filter_edit.text())
+
+    def current_source_row(self):
+        index = self.list_view.currentIndex()
+        if not index.isValid():
+            return -1
+        return self.proxy.mapToSource(index).row()
+
+    def jump_to_error(self, forward=True):
+        """跳转到下一个/上一个含❌或⚠️的行（过滤时只在可见行中查找），到末尾后从头开始"""
+        error_rows = self.model.error_rows()
+        if not error_rows:
+            return
+        current = self.current_source_row()
+        if forward:
+            start = bisect.bisect_right(error_rows, current)
+            candidates = error_rows[start:] + error_rows[:start]
+        else:
+            start = bisect.bisect_left(error_rows, current if current >= 0 else len(self.model.lines()))
+            candidates = error_rows[:start][::-1] + error_rows[start:][::-1]
+        for row in candidates:
+            index = self.proxy.mapFromSource(self.model.index(row))
+            if index.isValid():
+                self.select_index(index)
+                return
+
+    def select_index(self, index):
+        self.list_view.setCurrentIndex(index)
+        self.list_view.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+
+    def on_double_clicked(self, index):
+        """过滤状态下双击某行：清除过滤并定位到该行在完整结果中的位置"""
+        row = self.proxy.mapToSource(index).row()
+        if self.filter_edit.text():
+            self.filter_timer.stop()
+            self.filter_edit.clear()
+            self.apply_filter()
+            self.select_index(self.proxy.mapFromSource(self.model.index(row)))
+
+    def copy_selection(self):
+        """复制选中的行（按显示顺序）"""
+        rows = sorted(self.proxy.mapToSource(index).row() for index in self.list_view.selectedIndexes())
+        if rows:
+            QApplication.clipboard().setText("\n".join(self.model.line(row) for row in rows))
@@ -0,0 +1,112 @@
+import time
+import threading
+import tracemalloc
+import contextlib
+from dataclasses import dataclass
+from typing import Optional
+
+PERFORMANCE_TITLE = "性能统计"
+
+# tracemalloc为进程级开关：由第一个需要的分析启动，最后一个结束的分析停止
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+
+@dataclass
+class StageTiming:
+    """单个分析阶段的耗时与内存"""
+    name: str
+    seconds: float
+    # 嵌套层级（0为顶层阶段）
+    depth: int = 0
+    # tracemalloc统计的阶段内峰值内存增量与结束时的内存增量（字节），未开启时为None
+    memory_peak: Optional[int] = None
+    memory_delta: Optional[int] = None
+
+
+class StageProfiler:
+    """分析阶段计时器 - 用 with profiler.stage(名称): 包住各阶段，记录耗时和（可选的）内存
+
+    trace_memory为True时使用tracemalloc统计Python对象分配；tracemalloc会明显拖慢分析，
+    且统计的是整个进程，多个目录并发分析时各自的内存数据会相互叠加。
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.timings = []
+        self.total_seconds = 0.0
+        self._stack = []  # [[开始时的内存, 已知的峰值], ...]
+        self._start = None
+
+    @contextlib.contextmanager
+    def run(self):
+        """包住整个分析过程，统计总耗时；开启内存统计时负责启动和停止tracemalloc"""
+        global _tracing_users, _tracing_owned
+        if self.trace_memory:
+            with _tracing_lock:
+                if _tracing_users == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _tracing_owned = True
+                _tracing_users += 1
+        self._start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.total_seconds = time.perf_counter() - self._start
+            if self.trace_memory:
+                with _tracing_lock:
+                    _tracing_users -= 1
+                    # 外部已开启的tracemalloc保持不变
+                    if _tracing_users == 0 and _tracing_owned:
+                        tracemalloc.stop()
+                        _tracing_owned = False
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """统计一个阶段，可嵌套"""
+        timing = StageTiming(name, 0.0, depth=len(self._stack))
+        # 先按开始顺序占位，嵌套的子阶段排在父阶段之后
+        self.timings.append(timing)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            self._stack.append([current, current])
+        else:
+            self._stack.append(None)
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.seconds = time.perf_counter() - start
+            frame = self._stack.pop()
+            if tracing and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(frame[1], peak)
+                timing.memory_peak = peak - frame[0]
+                timing.memory_delta = current - frame[0]
+                # 父阶段的峰值包含子阶段的峰值
+                if self._stack and self._stack[-1] is not None:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+                tracemalloc.reset_peak()
+
+    def format_lines(self):
+        """格式化为结果文本中的"性能统计"段落"""
+        lines = [f"{PERFORMANCE_TITLE} (总耗时 {self.total_seconds * 1000:.1f} ms):"]
+        for timing in self.timings:
+            line = f"{'  ' * (timing.depth + 1)}{timing.name}: {timing.seconds * 1000:.1f} ms"
+            if timing.memory_peak is not None:
+                line += (f"  峰值内存 +{format_size(timing.memory_peak)}"
+                         f"  结束时 {'+' if timing.memory_delta >= 0 else '-'}{format_size(abs(timing.memory_delta))}")
+            lines.append(line)
+        return lines
+
+
+def format_size(size):
+    """字节数格式化为KB/MB"""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.1f} KB"
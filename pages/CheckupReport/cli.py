@@ -0,0 +1,335 @@
+"""报告检查命令行工具 - 无界面批量检查多个送测目录
+
+用法（在仓库根目录执行）:
+    python -m pages.CheckupReport.cli DIR [DIR ...] [--mode GO|FULL] [--json]
+    python -m pages.CheckupReport.cli DIR --list-failures [--suite CTS] [--module M] [--test T]
+    python -m pages.CheckupReport.cli DIR --record-history [--history 5]
+    python -m pages.CheckupReport.cli DIR --profile [--trace-memory]
+    python -m pages.CheckupReport.cli DIR --watch [SECONDS]
+
+--record-history时将分析结果写入历史记录，并与同产品的前N个构建对比（对比仅供参考，不影响结论）。
+--merge时合并同一套件的分片/重试结果，按最后一次执行的结果检查FAIL数（默认逐个报告检查）。
+--watch持续监视目录，新的报告文件写入完成后重新分析并输出更新后的结论（不写入历史记录），Ctrl+C结束。
+
+各目录在线程池中并发分析，报告解析共用同一个进程池。
+存在❌错误或分析失败的目录结论为FAIL，此时退出码为1（--strict时WARN也视为失败）。
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from .ReportAnalyzerCore import ReportAnalyzerCore, VERDICT_PASS, VERDICT_WARN, VERDICT_FAIL
+from .ReportParsePool import DEFAULT_PARSE_WORKERS
+from .FailedTestIndex import FailedTestIndex
+from .ReportHistory import ReportHistory, DEFAULT_HISTORY_BUILDS
+from .ReportWatcher import ReportWatcher, DEFAULT_WATCH_INTERVAL
+from ..common.CancellationToken import AnalysisCancelled
+
+MODE_GO = "GO"
+MODE_FULL = "FULL"
+# 同时分析的目录数上限（目录遍历与规则检查在线程中执行，解析在共享进程池中执行）
+DEFAULT_DIR_JOBS = 4
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_INTERRUPTED = 130
+
+
+def result_to_dict(result, mode):
+    """将AnalysisResult转换为可JSON序列化的字典"""
+    return {
+        "path": result.test_path,
+        "mode": mode,
+        "verdict": result.verdict,
+        "fatal_error": result.fatal_error,
+        "errors": result.errors,
+        "tool_min_versions": [asdict(item) for item in result.tool_min_versions],
+        "fingerprints": result.fingerprints,
+        "security_patches": result.security_patches,
+        "suite_plans": result.suite_plans,
+        "device_info_version": result.device_info_version,
+        "failed_test_count": result.failed_test_count,
+        "suite_summaries": result.suite_summaries,
+        "history_run_id": result.history_run_id,
+        "history": result.history_comparison,
+        "merged_suites": [asdict(merged) for merged in result.merged_suites],
+        "stage_timings": [asdict(timing) for timing in result.stage_timings],
+        "performance": result.performance_result,
+    }
+
+
+def format_text(entry, profile=False):
+    """单个目录的文本输出（profile为True时附上性能统计）"""
+    lines = [f"[{entry['verdict']}] {entry['path']}"]
+    if entry["fatal_error"] is not None:
+        lines.append(f"  {entry['fatal_error']}")
+        if profile:
+            lines.extend(f"  {line}" for line in entry["performance"].splitlines())
+        return "\n".join(lines)
+    if entry["device_info_version"]:
+        lines.append(f"  设备信息版本: {entry['device_info_version']}")
+    if entry["fingerprints"]:
+        lines.append(f"  Fingerprint: {entry['fingerprints'][0]}")
+    if entry["security_patches"]:
+        lines.append(f"  Security_Patch: {entry['security_patches'][0]}")
+    for merged in entry["merged_suites"]:
+        line = (f"  合并结果 {merged['suite_plan']}: {merged['attempts']}个结果文件 "
+                f"PASS {merged['passed']} FAIL {merged['failed']}")
+        if merged["recovered"]:
+            line += f"（经重试通过 {merged['recovered']}）"
+        lines.append(line)
+    if entry.get("history"):
+        for line in ReportHistory.format_comparison(entry["history"]):
+            if line.strip("="):
+                lines.append(f"  {line}")
+    # 工具最低版本汇总已作为⚠️项包含在错误列表中
+    for error in entry["errors"]:
+        for line in error.splitlines():
+            if line.strip("="):
+                lines.append(f"  {line}")
+    if "failed_tests" in entry:
+        lines.append(f"  失败用例（{len(entry['failed_tests'])}/{entry['failed_test_count']}）:")
+        for failed in entry["failed_tests"]:
+            abi = f"[{failed['abi']}]" if failed["abi"] else ""
+            lines.append(f"    {failed['suite']} {failed['module']}{abi} "
+                         f"{failed['testcase']}#{failed['test']} ({failed['trace_hash']})")
+    if profile:
+        lines.extend(f"  {line}" for line in entry["performance"].splitlines())
+    return "\n".join(lines)
+
+
+def analyze_directories(paths, check_apts, jobs, parse_workers, use_cache, cache_path, failed_test_index=None,
+                        history=None, history_builds=DEFAULT_HISTORY_BUILDS, prefetch_workers=0,
+                        profile_memory=False, merge_results=False, scan_archives=False):
+    """并发分析多个目录，按输入顺序返回AnalysisResult列表"""
+    process_pool = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 1 else None
+    cores = [
+        ReportAnalyzerCore(path, check_apts, parse_workers, use_cache, cache_path,
+                           executor=process_pool, failed_test_index=failed_test_index,
+                           history=history, history_builds=history_builds,
+                           prefetch_workers=prefetch_workers, profile_memory=profile_memory,
+                           merge_results=merge_results, scan_archives=scan_archives)
+        for path in paths
+    ]
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(cores)))) as dir_pool:
+            futures = [dir_pool.submit(core.analyze) for core in cores]
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                # Ctrl+C等中断时通知所有分析尽快退出
+                for core in cores:
+                    core.cancel()
+                raise
+    finally:
+        if process_pool is not None:
+            process_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def watch_directories(paths, on_update, interval=DEFAULT_WATCH_INTERVAL, check_apts=True,
+                      parse_workers=DEFAULT_PARSE_WORKERS, cache_path=None, failed_test_index=None,
+                      prefetch_workers=0, profile_memory=False, merge_results=False, scan_archives=False,
+                      on_error=None):
+    """监视多个目录直到Ctrl+C，每个目录因报告变化重新分析后调用 on_update(WatchUpdate)
+
+    各目录在各自的线程中轮询，回调可能来自不同线程。监视模式必须启用解析结果缓存，
+    这样每次只解析新增或变化的报告文件。
+    """
+    process_pool = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 1 else None
+
+    def make_core_factory(path):
+        return lambda: ReportAnalyzerCore(path, check_apts, parse_workers, True, cache_path,
+                                          executor=process_pool, failed_test_index=failed_test_index,
+                                          prefetch_workers=prefetch_workers, profile_memory=profile_memory,
+                                          merge_results=merge_results, scan_archives=scan_archives)
+
+    watchers = [ReportWatcher(path, make_core_factory(path), interval, scan_archives=scan_archives)
+                for path in paths]
+    try:
+        with ThreadPoolExecutor(max_workers=len(watchers)) as watch_pool:
+            futures = [watch_pool.submit(watcher.run, on_update, on_error) for watcher in watchers]
+            try:
+                # 分段等待，使主线程能及时响应Ctrl+C
+                while wait(futures, timeout=0.5).not_done:
+                    pass
+                for future in futures:
+                    future.result()
+            finally:
+                for watcher in watchers:
+                    watcher.stop()
+    finally:
+        if process_pool is not None:
+            process_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m pages.CheckupReport.cli",
+        description="批量检查送测报告目录（或ZIP报告包），输出各目录的检查结论"
+    )
+    parser.add_argument("paths", nargs="+", metavar="DIR", help="报告目录或ZIP报告包")
+    parser.add_argument("--mode", choices=[MODE_GO, MODE_FULL], type=str.upper, default=MODE_GO,
+                        help="版本类型：GO需要APTS报告，FULL不应包含APTS报告（默认GO）")
+    parser.add_argument("--json", action="store_true", help="以JSON格式输出")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_DIR_JOBS,
+                        help=f"同时分析的目录数（默认{DEFAULT_DIR_JOBS}）")
+    parser.add_argument("--parse-workers", type=int, default=DEFAULT_PARSE_WORKERS,
+                        help=f"报告解析进程数，小于等于1时串行解析（默认{DEFAULT_PARSE_WORKERS}）")
+    parser.add_argument("--prefetch", type=int, default=0, metavar="N",
+                        help="用N个线程预读取报告文件，适用于SMB/NFS等网络共享（默认0不预读取）")
+    parser.add_argument("--no-cache", action="store_true", help="不读写解析结果缓存")
+    parser.add_argument("--cache", metavar="PATH", help="解析结果缓存数据库路径（默认程序目录）")
+    parser.add_argument("--strict", action="store_true", help="存在需人工确认的⚠️项时也返回非零退出码")
+    parser.add_argument("--scan-archives", action="store_true",
+                        help="同时分析目录中的ZIP结果包（默认只分析已解压的结果；直接指定ZIP报告包时总是分析）")
+    parser.add_argument("--merge", action="store_true",
+                        help="合并同一套件的分片/重试结果，按最后一次执行的结果检查FAIL数（默认逐个报告检查）")
+    parser.add_argument("--profile", action="store_true", help="输出各分析阶段的耗时（JSON输出中始终包含）")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="用tracemalloc统计各阶段内存（隐含--profile；会拖慢分析，建议配合--jobs 1）")
+    parser.add_argument("--watch", type=float, nargs="?", const=DEFAULT_WATCH_INTERVAL, metavar="SECONDS",
+                        help=f"持续监视目录，报告写入完成后重新分析并输出结论（轮询间隔默认{DEFAULT_WATCH_INTERVAL:g}秒，"
+                             "JSON输出为每次更新一行）")
+
+    history = parser.add_argument_group("历史记录")
+    history.add_argument("--history", type=int, default=DEFAULT_HISTORY_BUILDS, metavar="N",
+                         help=f"与同产品的前N个构建对比（默认{DEFAULT_HISTORY_BUILDS}，0为只记录不对比）")
+    history.add_argument("--record-history", action="store_true", help="将分析结果写入历史记录并与前N个构建对比")
+    history.add_argument("--history-db", metavar="PATH", help="历史记录数据库路径（默认程序目录，不可写时为用户数据目录）")
+
+    failures = parser.add_argument_group("失败用例索引")
+    failures.add_argument("--index-failures", action="store_true",
+                          help="将各test_result.xml中的失败用例写入失败用例索引")
+    failures.add_argument("--list-failures", action="store_true",
+                          help="列出各目录的失败用例（隐含--index-failures）")
+    failures.add_argument("--failures-db", metavar="PATH", help="失败用例索引数据库路径（默认程序目录）")
+    failures.add_argument("--suite", help="只列出指定测试套件的失败用例（如CTS）")
+    failures.add_argument("--module", help="只列出模块名包含该字符串的失败用例")
+    failures.add_argument("--test", help="只列出TestCase或Test名称包含该字符串的失败用例")
+    failures.add_argument("--limit", type=int, help="每个目录最多列出的失败用例数")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # Windows控制台编码可能无法输出❌/⚠️，替换而不是报错
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(errors="backslashreplace")
+
+    failed_test_index = None
+    if args.index_failures or args.list_failures:
+        failed_test_index = FailedTestIndex(args.failures_db)
+    if args.watch is not None:
+        return watch_main(args, failed_test_index)
+    history = ReportHistory(args.history_db) if args.record_history else None
+
+    try:
+        results = analyze_directories(
+            args.paths,
+            check_apts=(args.mode == MODE_GO),
+            jobs=args.jobs,
+            parse_workers=args.parse_workers,
+            use_cache=not args.no_cache,
+            cache_path=args.cache,
+            failed_test_index=failed_test_index,
+            history=history,
+            history_builds=args.history,
+            prefetch_workers=args.prefetch,
+            profile_memory=args.trace_memory,
+            merge_results=args.merge,
+            scan_archives=args.scan_archives,
+        )
+    except (KeyboardInterrupt, AnalysisCancelled):
+        print("分析已中断", file=sys.stderr)
+        return EXIT_INTERRUPTED
+
+    entries = [result_to_dict(result, args.mode) for result in results]
+    if args.list_failures:
+        for entry in entries:
+            add_failed_tests(entry, failed_test_index, args)
+    failing = {VERDICT_FAIL, VERDICT_WARN} if args.strict else {VERDICT_FAIL}
+    if any(entry["verdict"] == VERDICT_FAIL for entry in entries):
+        overall = VERDICT_FAIL
+    elif any(entry["verdict"] == VERDICT_WARN for entry in entries):
+        overall = VERDICT_WARN
+    else:
+        overall = VERDICT_PASS
+
+    if args.json:
+        print(json.dumps({"verdict": overall, "results": entries}, ensure_ascii=False, indent=2))
+    else:
+        profile = args.profile or args.trace_memory
+        print("\n\n".join(format_text(entry, profile) for entry in entries))
+
+    return EXIT_FAILED if any(entry["verdict"] in failing for entry in entries) else EXIT_OK
+
+
+
+def add_failed_tests(entry, failed_test_index, args):
+    """按过滤条件查询目录的失败用例，加入输出"""
+    if entry["fatal_error"] is None:
+        entry["failed_tests"] = [
+            failed._asdict() for failed in failed_test_index.query(
+                entry["path"], args.suite, args.module, args.test, limit=args.limit)
+        ]
+
+
+def watch_main(args, failed_test_index):
+    """--watch：每次更新输出该目录的结论，Ctrl+C结束后按各目录最后一次的结论返回退出码"""
+    if args.no_cache:
+        print("--watch需要解析结果缓存，不能与--no-cache同时使用", file=sys.stderr)
+        return EXIT_FAILED
+    output_lock = threading.Lock()
+    last_verdicts = {}
+    profile = args.profile or args.trace_memory
+
+    def on_update(update):
+        entry = result_to_dict(update.result, args.mode)
+        if args.list_failures:
+            add_failed_tests(entry, failed_test_index, args)
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(update.timestamp))
+        with output_lock:
+            last_verdicts[entry["path"]] = entry["verdict"]
+            if args.json:
+                print(json.dumps({"time": timestamp, "added": update.added, "changed": update.changed,
+                                  "removed": update.removed, "result": entry}, ensure_ascii=False))
+            else:
+                print(f"[{timestamp}] {update.describe()}")
+                print(format_text(entry, profile))
+                print()
+            sys.stdout.flush()
+
+    def on_error(error):
+        with output_lock:
+            print(f"分析出错: {error}", file=sys.stderr)
+
+    try:
+        watch_directories(
+            args.paths,
+            on_update,
+            interval=args.watch,
+            check_apts=(args.mode == MODE_GO),
+            parse_workers=args.parse_workers,
+            cache_path=args.cache,
+            failed_test_index=failed_test_index,
+            prefetch_workers=args.prefetch,
+            profile_memory=args.trace_memory,
+            merge_results=args.merge,
+            scan_archives=args.scan_archives,
+            on_error=on_error,
+        )
+    except KeyboardInterrupt:
+        print("监视已停止", file=sys.stderr)
+    with output_lock:
+        if not last_verdicts:
+            return EXIT_INTERRUPTED
+        failing = {VERDICT_FAIL, VERDICT_WARN} if args.strict else {VERDICT_FAIL}
+        return EXIT_FAILED if any(verdict in failing for verdict in last_verdicts.values()) else EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ from pathlib import Path
 from .strict_comparator import StrictFeatureComparator
 from .smart_comparator import SmartFeatureComparator
 from .html_generator import HTMLReportGenerator
+from .feature_digest import FeatureDigests
 
 
 class FeatureComparator:
@@ -13,10 +14,19 @@ class FeatureComparator:
         self.smart_comparator = SmartFeatureComparator()
         self.html_generator = HTMLReportGenerator()
     
-    def compare(self, mr_feature_data, smr_feature_data):
-        """比较两个Feature JSON文件的差异"""
+    def compare(self, mr_feature_data, smr_feature_data, mr_digests=None, smr_digests=None):
+        """比较两个Feature JSON文件的差异
+        
+        mr_digests/smr_digests为加载时计算的FeatureDigests（见feature_digest.load_feature_document），
+        未提供时在此计算一次，严格对比和智能对比共用
+        """
+        if mr_feature_data is not None and mr_digests is None:
+            mr_digests = FeatureDigests.from_data(mr_feature_data)
+        if smr_feature_data is not None and smr_digests is None:
+            smr_digests = FeatureDigests.from_data(smr_feature_data)
+        
         # 首先生成严格对比的文本结果
-        result_text = self.strict_comparator.compare(mr_feature_data, smr_feature_data)
+        result_text = self.strict_comparator.compare(mr_feature_data, smr_feature_data, mr_digests, smr_digests)
         
         # 无论严格对比结果是否一致，都生成智能对比的HTML报告
         output_dir = Path.cwd() / "comparison_reports"
@@ -28,7 +38,9 @@ class FeatureComparator:
             # 使用智能对比算法进行分析
             smart_result = self.smart_comparator.smart_compare(
                 mr_feature_data, 
-                smr_feature_data
+                smr_feature_data,
+                mr_digests,
+                smr_digests
             )
             
             # 生成HTML报告
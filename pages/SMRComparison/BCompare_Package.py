@@ -82,6 +82,20 @@ class PackageComparator:
     
     def compare_files(self, mr_file_path: str, smr_file_path: str) -> PackageComparisonResult:
         """比较两个Package JSON文件，返回结构化结果"""
+        # 计算文件哈希
+        mr_hash = self._calculate_file_hash(mr_file_path)
+        smr_hash = self._calculate_file_hash(smr_file_path)
+        
+        # 加载数据
+        mr_data = self.load_json_file(mr_file_path)
+        smr_data = self.load_json_file(smr_file_path)
+        
+        return self.compare_loaded(mr_file_path, smr_file_path, mr_data, smr_data, mr_hash, smr_hash)
+    
+    def compare_loaded(self, mr_file_path: str, smr_file_path: str, mr_data: Optional[Dict],
+                       smr_data: Optional[Dict], mr_hash: Tuple[str, str, int],
+                       smr_hash: Tuple[str, str, int]) -> PackageComparisonResult:
+        """比较已加载的两个Package JSON数据（load_json_file和_calculate_file_hash的结果），返回结构化结果"""
         # 重置统计
         self.differences_found = False
         self.total_differences = 0
@@ -112,9 +126,8 @@ class PackageComparator:
             "directory": str(new_file_path.parent)
         }
         
-        # 计算文件哈希
-        md5_old, sha256_old, size_old = self._calculate_file_hash(mr_file_path)
-        md5_new, sha256_new, size_new = self._calculate_file_hash(smr_file_path)
+        md5_old, sha256_old, size_old = mr_hash
+        md5_new, sha256_new, size_new = smr_hash
         
         old_file_info.update({
             "size": size_old,
@@ -128,10 +141,6 @@ class PackageComparator:
             "sha256": sha256_new
         })
         
-        # 加载数据
-        mr_data = self.load_json_file(mr_file_path)
-        smr_data = self.load_json_file(smr_file_path)
-        
         if mr_data is None or smr_data is None:
             return PackageComparisonResult(
                 is_identical=False,
@@ -0,0 +1,37 @@
+# SMR_AnalysisThread.py
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from ..common.CancellationToken import CancellationToken, AnalysisCancelled
+
+
+class SMR_AnalysisThread(QThread):
+    """SMR分析线程 - 在后台线程中执行SMR_Analyzer.analyze_directories，避免界面卡顿"""
+
+    # 进度：(阶段序号, 阶段总数, 阶段名称)
+    progress = pyqtSignal(int, int, str)
+    # (完整分析日志, 最终判定结果)，分析失败时日志为空字符串
+    analysis_finished = pyqtSignal(str, str)
+
+    def __init__(self, analyzer, mr_dir, smr_dir):
+        super().__init__()
+        self.analyzer = analyzer
+        self.mr_dir = mr_dir
+        self.smr_dir = smr_dir
+        self.cancel_token = CancellationToken()
+        self.cancelled = False
+
+    def run(self):
+        try:
+            with self.cancel_token.activate():
+                complete_log, final_verdict_text = self.analyzer.analyze_directories(
+                    self.mr_dir, self.smr_dir, progress_callback=self.progress.emit
+                )
+        except AnalysisCancelled:
+            # 已取消，不发射结果信号（线程结束后由finished信号恢复界面）
+            self.cancelled = True
+            return
+        self.analysis_finished.emit(complete_log or "", final_verdict_text or "")
+
+    def cancel(self):
+        """请求取消分析（可在任意线程调用），分析线程会在下一个阶段开始前退出"""
+        self.cancel_token.cancel()
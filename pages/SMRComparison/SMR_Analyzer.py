@@ -1,6 +1,9 @@
 import os
-import sys
+import contextlib
 from datetime import datetime
+from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from typing import Optional
 from .SMR_FileUtils import SMR_FileUtils
 from .BCompare_Feature import FeatureComparator
 from .BCompare_Package import PackageComparator
@@ -8,15 +11,57 @@ from .SMR_InfoExtractor import SMR_InfoExtractor
 from .SMR_Comparator import SMR_Comparator
 from .SMR_ReportGenerator import SMR_ReportGenerator
 from .SMR_PatchChecker import SMR_PatchChecker
+from .feature_digest import load_feature_document
+from ..common.CancellationToken import check_cancelled, current_token
+
+# 收集MR/SMR目录信息的线程数（两侧的提取任务、Feature/Package JSON解析和文件哈希）
+DEFAULT_IO_WORKERS = 6
+
+# 分析阶段（按执行顺序，用于进度显示）
+STAGE_COLLECT = "读取MR/SMR报告"
+STAGE_PATCH = "安全补丁"
+STAGE_GMS = "GMS包版本"
+STAGE_MAINLINE = "Mainline版本"
+STAGE_FINGERPRINT = "Fingerprint"
+STAGE_FEATURE = "Feature对比"
+STAGE_PACKAGE = "Package对比"
+STAGE_REPORT = "生成报告"
+ANALYSIS_STAGES = [STAGE_COLLECT, STAGE_PATCH, STAGE_GMS, STAGE_MAINLINE, STAGE_FINGERPRINT,
+                   STAGE_FEATURE, STAGE_PACKAGE, STAGE_REPORT]
+
+
+@dataclass
+class DirectoryInfo:
+    """对比所需的单个报告目录信息（MR和SMR两侧并发收集）"""
+    directory: str
+    security_patch: str = "未找到"
+    # HTML报告中的Fingerprint（MR侧使用）
+    fingerprint: str = "未找到"
+    # GenericDeviceInfo中的信息（SMR侧使用）
+    generic_info: dict = field(default_factory=dict)
+    gms_version: str = "未找到"
+    mainline_info: dict = field(default_factory=dict)
+    feature_file: Optional[str] = None
+    package_file: Optional[str] = None
+    # 在后台解析的Feature JSON及其摘要（(数据, FeatureDigests)）、Package JSON和Package文件哈希（Future），对比时才取结果，
+    # 解析中的异常在取结果时抛出，与原先在对比阶段读取文件的行为一致
+    feature_data: Optional[Future] = None
+    package_data: Optional[Future] = None
+    package_hash: Optional[Future] = None
 
 
 class SMR_Analyzer:
     """SMR对比分析器 - 主控制器"""
     
-    def __init__(self):
+    def __init__(self, parse_workers=0):
         """
         初始化分析器（不再使用网络时间参数）
+        
+        Args:
+            parse_workers: 大于0时在该数量的子进程中解析Feature/Package JSON（文件很大时可避免与提取线程争用GIL），
+                0为在线程池中解析
         """
+        self.parse_workers = parse_workers
         self.file_utils = SMR_FileUtils()
         self.feature_comparator = FeatureComparator()
         self.package_comparator = PackageComparator()
@@ -24,9 +69,23 @@ class SMR_Analyzer:
         self.comparator = SMR_Comparator(self.file_utils)
         self.report_generator = SMR_ReportGenerator()
         self.patch_checker = SMR_PatchChecker()  # 不再传递参数
+        self.progress_callback = None
     
-    def analyze_directories(self, mr_dir, smr_dir):
-        """分析两个目录中的JSON文件"""
+    def _report_stage(self, stage):
+        """进入新的分析阶段：检查是否已取消，并报告进度"""
+        check_cancelled()
+        if self.progress_callback is not None:
+            self.progress_callback(ANALYSIS_STAGES.index(stage), len(ANALYSIS_STAGES), stage)
+    
+    def analyze_directories(self, mr_dir, smr_dir, progress_callback=None):
+        """分析两个目录中的JSON文件
+        
+        Args:
+            progress_callback: 进度回调 progress_callback(阶段序号, 阶段总数, 阶段名称)，在每个阶段开始时调用
+        
+        在激活的CancellationToken下调用时，于各阶段之间检查取消，已取消时抛出AnalysisCancelled。
+        """
+        self.progress_callback = progress_callback
         # 检查目录是否存在
         if not os.path.exists(mr_dir):
             return None, f"错误: MR报告目录不存在\n目录: {mr_dir}"
@@ -34,42 +93,44 @@ class SMR_Analyzer:
         if not os.path.exists(smr_dir):
             return None, f"错误: SMR报告目录不存在\n目录: {smr_dir}"
         
+        io_pool = ThreadPoolExecutor(max_workers=DEFAULT_IO_WORKERS, thread_name_prefix="smr-collect")
+        parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers) if self.parse_workers > 0 else io_pool
         try:
             # 开始分析
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            # 获取安全补丁日期
-            mr_security_patch = self.info_extractor.extract_security_patch(mr_dir)
-            smr_security_patch = self.info_extractor.extract_security_patch(smr_dir)
+            # 并发收集两侧目录的信息（两侧在对比之前互不依赖）
+            self._report_stage(STAGE_COLLECT)
+            mr_future = io_pool.submit(self._collect_directory_info, mr_dir, io_pool, parse_pool, current_token())
+            smr_future = io_pool.submit(self._collect_directory_info, smr_dir, io_pool, parse_pool, current_token())
+            mr_info = self._wait_result(mr_future)
+            smr_info = self._wait_result(smr_future)
             
             # 获取详细的验证结果
+            self._report_stage(STAGE_PATCH)
             strict_patch_result = self.patch_checker.compare_patches(
-                mr_security_patch, smr_security_patch
+                mr_info.security_patch, smr_info.security_patch
             )
             
-            # 获取MR报告的Fingerprint和SMR的GenericDeviceInfo信息
-            mr_fingerprint = self.info_extractor.extract_fingerprint_from_html(mr_dir)
-            smr_generic_info = self.info_extractor.extract_generic_info(smr_dir)
-            
             # 分析MR报告文件（用于日志记录，不在GUI显示）
             mr_report_info = self.info_extractor.analyze_report_files(
-                "MR报告", mr_dir, "MR", mr_security_patch, mr_fingerprint
+                "MR报告", mr_dir, "MR", mr_info.security_patch, mr_info.fingerprint,
+                (mr_info.feature_file, mr_info.package_file)
             )
             
             # 分析SMR报告文件（用于日志记录，不在GUI显示）
             smr_report_info = self.info_extractor.analyze_report_files(
-                "SMR报告", smr_dir, "SMR", smr_security_patch, smr_generic_info
+                "SMR报告", smr_dir, "SMR", smr_info.security_patch, smr_info.generic_info,
+                (smr_info.feature_file, smr_info.package_file)
             )
             
             # 执行对比分析，返回三个值：对比文本、所有检查结果、警告字典
             comparison_text, all_check_results, warnings_dict = self._perform_comparison_analysis(
-                mr_dir, smr_dir, 
-                mr_security_patch, smr_security_patch,
-                mr_fingerprint, smr_generic_info,
-                strict_patch_result
+                mr_info, smr_info, strict_patch_result
             )
             
             # 生成最终综合判定结果
+            self._report_stage(STAGE_REPORT)
             final_verdict_text = self._add_final_comprehensive_verdict(strict_patch_result, all_check_results, warnings_dict)
             
             # 创建完整的分析日志（不包含final_verdict_text，只包含分析过程的详细信息）
@@ -90,11 +151,49 @@ class SMR_Analyzer:
             error_details = traceback.format_exc()
             print(f"详细错误信息:\n{error_details}")  # 调试信息
             return None, error_msg
+        finally:
+            # 取消或出错时不等待尚未完成的后台任务
+            io_pool.shutdown(wait=False, cancel_futures=True)
+            if parse_pool is not io_pool:
+                parse_pool.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _wait_result(future, timeout=0.1):
+        """等待后台任务结果，等待期间检查是否已取消"""
+        while True:
+            check_cancelled()
+            done, _ = wait([future], timeout=timeout)
+            if done:
+                return future.result()
+    
+    def _collect_directory_info(self, directory, io_pool, parse_pool, cancel_token=None):
+        """收集单个目录中对比所需的全部信息（在线程池中执行）
+        
+        先找到Feature/Package JSON并交给后台解析，再提取安全补丁、Fingerprint、GMS和Mainline等小文件信息，
+        两者同时进行。
+        """
+        with cancel_token.activate() if cancel_token is not None else contextlib.nullcontext():
+            info = DirectoryInfo(directory)
+            info.feature_file, info.package_file = self.file_utils.find_json_files_in_directory(directory)
+            if info.feature_file:
+                info.feature_data = parse_pool.submit(load_feature_document, info.feature_file)
+            if info.package_file:
+                info.package_data = parse_pool.submit(PackageComparator.load_json_file,
+                                                      self.package_comparator, info.package_file)
+                info.package_hash = io_pool.submit(self.package_comparator._calculate_file_hash, info.package_file)
+            check_cancelled()
+            info.security_patch = self.info_extractor.extract_security_patch(directory)
+            info.fingerprint = self.info_extractor.extract_fingerprint_from_html(directory)
+            check_cancelled()
+            info.generic_info = self.info_extractor.extract_generic_info(directory)
+            info.gms_version = self.info_extractor.extract_gms_version(directory)
+            info.mainline_info = self.info_extractor.extract_mainline_version(directory)
+            return info
     
-    def _perform_comparison_analysis(self, mr_dir, smr_dir, mr_security_patch, 
-                                    smr_security_patch, mr_fingerprint, smr_generic_info,
-                                    strict_patch_result):
+    def _perform_comparison_analysis(self, mr_info, smr_info, strict_patch_result):
         """执行对比分析，返回分析文本、所有检查结果和警告字典"""
+        mr_security_patch, smr_security_patch = mr_info.security_patch, smr_info.security_patch
+        mr_fingerprint, smr_generic_info = mr_info.fingerprint, smr_info.generic_info
         result_text = "对比分析结果:\n"
         result_text += "-" * 30 + "\n"
         
@@ -145,8 +244,9 @@ class SMR_Analyzer:
         result_text += "\n"
         
         # GMS包版本对比
-        mr_gms_version = self.info_extractor.extract_gms_version(mr_dir)
-        smr_gms_version = self.info_extractor.extract_gms_version(smr_dir)
+        self._report_stage(STAGE_GMS)
+        mr_gms_version = mr_info.gms_version
+        smr_gms_version = smr_info.gms_version
         gms_result = "PASS" if mr_gms_version == smr_gms_version else "FAIL"
         
         result_text += "GMS包版本对比:\n"
@@ -160,8 +260,9 @@ class SMR_Analyzer:
         result_text += "\n"
         
         # Mainline版本对比
-        mr_mainline_info = self.info_extractor.extract_mainline_version(mr_dir)
-        smr_mainline_info = self.info_extractor.extract_mainline_version(smr_dir)
+        self._report_stage(STAGE_MAINLINE)
+        mr_mainline_info = mr_info.mainline_info
+        smr_mainline_info = smr_info.mainline_info
         
         mainline_result = "PASS"
         if mr_mainline_info["type"] != smr_mainline_info["type"]:
@@ -186,6 +287,7 @@ class SMR_Analyzer:
         result_text += "\n"
         
         # 对比Fingerprint信息
+        self._report_stage(STAGE_FINGERPRINT)
         fingerprint_result_text, fingerprint_result = self.comparator.compare_fingerprint_info(
             mr_fingerprint, smr_generic_info
         )
@@ -203,7 +305,11 @@ class SMR_Analyzer:
         package_result_status = "PASS"
         
         # 检查文件是否存在
-        file_check = self.comparator.check_file_existence(mr_dir, smr_dir)
+        self._report_stage(STAGE_FEATURE)
+        file_check = self.comparator.check_file_existence(
+            mr_info.directory, smr_info.directory,
+            (mr_info.feature_file, mr_info.package_file), (smr_info.feature_file, smr_info.package_file)
+        )
         
         if file_check["missing_files"]:
             result_text += "警告: 以下文件未找到:\n"
@@ -220,14 +326,13 @@ class SMR_Analyzer:
             
             # 对比Feature文件
             feature_result_status, feature_result_text = self._compare_feature_files(
-                file_check["mr_feature_file"], file_check["smr_feature_file"]
+                mr_info.feature_data, smr_info.feature_data
             )
             result_text += feature_result_text + "\n" + "=" * 50 + "\n\n"
             
             # 对比Package文件
-            package_result_status, package_summary_text = self._compare_package_files(
-                file_check["mr_package_file"], file_check["smr_package_file"]
-            )
+            self._report_stage(STAGE_PACKAGE)
+            package_result_status, package_summary_text = self._compare_package_files(mr_info, smr_info)
             result_text += package_summary_text + "\n" + "=" * 50 + "\n\n"
         
         # 添加Feature和Package结果到检查结果中
@@ -325,16 +430,18 @@ class SMR_Analyzer:
         result += "=" * 50
         return result
     
-    def _compare_feature_files(self, mr_feature_file, smr_feature_file):
-        """对比Feature文件"""
+    def _compare_feature_files(self, mr_feature_future, smr_feature_future):
+        """对比Feature文件（JSON及其摘要已在收集阶段交给后台计算）"""
         feature_result_status = "未知"
         
-        # 读取JSON数据
-        mr_feature_data = self.file_utils.read_json_file(mr_feature_file)
-        smr_feature_data = self.file_utils.read_json_file(smr_feature_file)
+        # 取得JSON数据和摘要
+        mr_feature_data, mr_digests = self._wait_result(mr_feature_future)
+        smr_feature_data, smr_digests = self._wait_result(smr_feature_future)
         
         if mr_feature_data and smr_feature_data:
-            feature_result_text = self.feature_comparator.compare(mr_feature_data, smr_feature_data)
+            feature_result_text = self.feature_comparator.compare(
+                mr_feature_data, smr_feature_data, mr_digests, smr_digests
+            )
             
             # 从Feature对比结果中提取状态
             if "失败" in feature_result_text or "FAIL" in feature_result_text:
@@ -349,11 +456,14 @@ class SMR_Analyzer:
         
         return feature_result_status, feature_result_text
     
-    def _compare_package_files(self, mr_package_file, smr_package_file):
-        """对比Package文件"""
+    def _compare_package_files(self, mr_info, smr_info):
+        """对比Package文件（JSON和文件哈希已在收集阶段交给后台处理）"""
         try:
-            # 使用新的compare_files方法
-            package_result_obj = self.package_comparator.compare_files(mr_package_file, smr_package_file)
+            package_result_obj = self.package_comparator.compare_loaded(
+                mr_info.package_file, smr_info.package_file,
+                self._wait_result(mr_info.package_data), self._wait_result(smr_info.package_data),
+                self._wait_result(mr_info.package_hash), self._wait_result(smr_info.package_hash)
+            )
             
             # 生成详细的差异包列表
             package_summary_text, package_overall_result = self._generate_detailed_package_summary(package_result_obj)
@@ -102,10 +102,17 @@ class SMR_Comparator:
         
         return result_text, fingerprint_result
     
-    def check_file_existence(self, mr_dir, smr_dir):
-        """检查必要的JSON文件是否存在"""
-        mr_feature_file, mr_package_file = self.file_utils.find_json_files_in_directory(mr_dir)
-        smr_feature_file, smr_package_file = self.file_utils.find_json_files_in_directory(smr_dir)
+    def check_file_existence(self, mr_dir, smr_dir, mr_files=None, smr_files=None):
+        """检查必要的JSON文件是否存在
+        
+        mr_files/smr_files为已查找到的(Feature文件, Package文件)，提供时不再重新遍历目录
+        """
+        if mr_files is None:
+            mr_files = self.file_utils.find_json_files_in_directory(mr_dir)
+        if smr_files is None:
+            smr_files = self.file_utils.find_json_files_in_directory(smr_dir)
+        mr_feature_file, mr_package_file = mr_files
+        smr_feature_file, smr_package_file = smr_files
         
         missing_files = []
         
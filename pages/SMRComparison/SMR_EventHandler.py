@@ -1,5 +1,6 @@
 # SMR_EventHandler.py
 from datetime import datetime
+from .SMR_AnalysisThread import SMR_AnalysisThread
 
 # Pre-computed stylesheets — built once, reused everywhere
 _STYLE_ACTIVE = """
@@ -28,6 +29,8 @@ class SMR_EventHandler:
         self.ui = ui
         self.analyzer = analyzer
         self.select_directory = select_directory_func
+        # 正在运行的分析线程（同一时间只运行一个，分析器实例由各次分析共用）
+        self.analysis_thread = None
         # Track current button states to avoid redundant setStyleSheet calls
         self._btn_state = {"select_mr": False, "select_smr": False, "analyze": False, "clear": False}
 
@@ -86,6 +89,11 @@ class SMR_EventHandler:
             self.update_button_styles()
 
     def start_analysis(self):
+        # 分析进行中时，按钮作为"取消分析"使用
+        if self.analysis_thread is not None:
+            self.cancel_analysis()
+            return
+
         print("开始分析...")
         self.ui.analysis_result_display.clear()
         self.ui.error_info_display.clear()
@@ -101,8 +109,54 @@ class SMR_EventHandler:
 
         self.update_button_styles()
 
-        complete_log, final_verdict_text = self.analyzer.analyze_directories(mr_dir, smr_dir)
-
+        # 在后台线程中分析，界面线程只接收进度和结果
+        self.analysis_thread = SMR_AnalysisThread(self.analyzer, mr_dir, smr_dir)
+        self.analysis_thread.progress.connect(self.on_analysis_progress)
+        self.analysis_thread.analysis_finished.connect(self.on_analysis_finished)
+        self.analysis_thread.finished.connect(self.on_thread_finished)
+        self.set_running_state(True)
+        self.analysis_thread.start()
+
+    def cancel_analysis(self):
+        """请求取消正在进行的分析，线程在下一个阶段开始前退出"""
+        print("取消分析...")
+        self.analysis_thread.cancel()
+        self.ui.analyze_btn.setEnabled(False)
+        self.ui.analyze_btn.setText("正在取消...")
+
+    def set_running_state(self, running):
+        """分析期间禁止修改目录和清除记录，分析按钮变为取消按钮"""
+        self.ui.select_mr_btn.setEnabled(not running)
+        self.ui.select_smr_btn.setEnabled(not running)
+        self.ui.mr_directory_input.setReadOnly(running)
+        self.ui.smr_directory_input.setReadOnly(running)
+        self.ui.clear_btn.setEnabled(not running)
+        self.ui.analyze_btn.setEnabled(True)
+        self.ui.analyze_btn.setText("取消分析" if running else "开始分析")
+        if running:
+            self.ui.progress_bar.setRange(0, 0)
+            self.ui.progress_bar.setFormat("准备分析...")
+        self.ui.progress_bar.setVisible(running)
+
+    def on_analysis_progress(self, stage_index, stage_total, stage_name):
+        """更新进度条：显示正在进行的阶段"""
+        self.ui.progress_bar.setRange(0, stage_total)
+        self.ui.progress_bar.setValue(stage_index)
+        self.ui.progress_bar.setFormat(f"{stage_index + 1}/{stage_total} {stage_name}...")
+
+    def on_thread_finished(self):
+        """分析线程结束（完成或已取消）后恢复界面"""
+        thread = self.analysis_thread
+        self.analysis_thread = None
+        self.set_running_state(False)
+        if thread is not None:
+            if thread.cancelled:
+                self.ui.error_info_display.setPlainText("分析已取消。")
+                self.update_button_styles()
+            thread.deleteLater()
+
+    def on_analysis_finished(self, complete_log, final_verdict_text):
+        """显示分析日志和最终判定结果"""
         if complete_log:
             self.ui.analysis_result_display.setPlainText(complete_log)
 
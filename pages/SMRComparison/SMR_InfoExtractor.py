@@ -3,6 +3,28 @@ import os
 import re
 from datetime import datetime
 from .SMR_FileUtils import SMR_FileUtils
+from ..common.MarkerSearch import read_text_prefix
+
+# HTML报告摘要表中的一行：<td class="rowtitle">字段名</td><td>值</td>
+# 以rowtitle单元格为锚点，只使用否定字符类，不会跨越标签回溯
+SUMMARY_ROW_PATTERN = re.compile(
+    r'<td[^>]*class="rowtitle"[^>]*>([^<]+)</td>\s*<td[^>]*>([^<]*)</td>', re.IGNORECASE)
+SUMMARY_TABLE_END = "</table>"
+# 默认从HTML报告摘要表中提取的设备属性（MR/SMR对比使用的字段）
+HTML_SUMMARY_FIELDS = ("Fingerprint", "Security Patch")
+# 摘要表行匹配不到时对全文依次尝试的宽松写法（非标准格式的报告），仅在该报告缺少对应字段时使用
+SUMMARY_FALLBACK_PATTERNS = {
+    "Fingerprint": [
+        re.compile(r'Fingerprint.*?</td>\s*<td[^>]*>([^<]+)</td>', re.IGNORECASE | re.DOTALL),
+        re.compile(r'<td[^>]*>Fingerprint</td>\s*<td[^>]*>([^<]+)</td>', re.IGNORECASE | re.DOTALL),
+    ],
+    "Security Patch": [
+        re.compile(r'Security Patch.*?</td>\s*<td[^>]*>([^<]+)</td>', re.IGNORECASE | re.DOTALL),
+        re.compile(r'Security.*?Patch.*?</td>\s*<td[^>]*>([^<]+)</td>', re.IGNORECASE | re.DOTALL),
+        re.compile(r'<td[^>]*>Security Patch</td>\s*<td[^>]*>([^<]+)</td>', re.IGNORECASE | re.DOTALL),
+    ],
+}
+NOT_FOUND = "未找到"
 
 class SMR_InfoExtractor:
     """SMR信息提取器，专门负责从文件中提取各种信息"""
@@ -10,6 +32,7 @@ class SMR_InfoExtractor:
     def __init__(self, file_utils=None):
         self.file_utils = file_utils or SMR_FileUtils()
         self._walk_cache = {}  # directory -> {".html": [...], "genericdeviceinfo...": [...], ...}
+        self._summary_cache = {}  # directory -> {字段名: 值}，只包含已提取过的字段
 
     def _get_dir_files(self, directory):
         """Walk directory once and cache categorized file lists."""
@@ -38,50 +61,84 @@ class SMR_InfoExtractor:
         self._walk_cache[directory] = categorized
         return categorized
 
-    def extract_fingerprint_from_html(self, directory):
-        """从HTML报告中提取Fingerprint"""
-        fingerprint = "未找到"
-
+    def _get_sorted_html_files(self, directory):
+        """HTML报告文件列表，按常见报告文件名排序，优先检查标准报告"""
         html_files = self._get_dir_files(directory)["html"][:]
-        
-        # 按常见报告文件名排序，优先检查标准报告
         html_files.sort(key=lambda x: (
             0 if 'test_result' in x.lower() else
             1 if 'compatibility' in x.lower() else
             2 if 'gts' in x.lower() else
             3 if 'cts' in x.lower() else 4
         ))
-        
-        # 从HTML文件中提取Fingerprint
-        for html_file in html_files:
-            try:
-                with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    # 精确匹配格式: <td class="rowtitle">Fingerprint</td><td>指纹值</td>
-                    pattern = r'<td[^>]*class="rowtitle"[^>]*>Fingerprint</td>\s*<td[^>]*>([^<]+)</td>'
-                    match = re.search(pattern, content, re.IGNORECASE)
-                    
-                    if match:
-                        fingerprint = match.group(1).strip()
-                        return fingerprint
-                    
-                    # 尝试其他可能的格式
-                    alternative_patterns = [
-                        r'Fingerprint.*?</td>\s*<td[^>]*>([^<]+)</td>',
-                        r'<td[^>]*>Fingerprint</td>\s*<td[^>]*>([^<]+)</td>',
-                    ]
-                    
-                    for pattern in alternative_patterns:
-                        match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
-                        if match:
-                            fingerprint = match.group(1).strip()
-                            return fingerprint
-            
-            except Exception as e:
-                print(f"读取HTML文件 {html_file} 时出错: {e}")
-        
-        return fingerprint
+        return html_files
+
+    @staticmethod
+    def _scan_summary_rows(content):
+        """扫描摘要表各行，返回 {小写字段名: 值}，每个字段保留第一次出现的值"""
+        rows = {}
+        for match in SUMMARY_ROW_PATTERN.finditer(content):
+            rows.setdefault(match.group(1).strip().lower(), match.group(2).strip())
+        return rows
+
+    def _read_html_summary(self, html_file, wanted_fields):
+        """读取单个HTML报告的摘要表
+
+        摘要表位于页面开头，先只读取文件开头；开头部分没有完整的摘要表时才读取全文。
+        wanted_fields中仍未找到且有宽松写法的字段，再对全文依次尝试SUMMARY_FALLBACK_PATTERNS。
+        """
+        content, complete = read_text_prefix(html_file)
+        rows = self._scan_summary_rows(content)
+        if not complete:
+            first_row = SUMMARY_ROW_PATTERN.search(content)
+            if first_row is None or content.find(SUMMARY_TABLE_END, first_row.end()) == -1:
+                content, complete = read_text_prefix(html_file, None)
+                rows = self._scan_summary_rows(content)
+
+        fallback_fields = [field for field in wanted_fields
+                           if field in SUMMARY_FALLBACK_PATTERNS and not rows.get(field.lower())]
+        if fallback_fields and not complete:
+            content, _ = read_text_prefix(html_file, None)
+        for field in fallback_fields:
+            for pattern in SUMMARY_FALLBACK_PATTERNS[field]:
+                match = pattern.search(content)
+                if match:
+                    rows[field.lower()] = match.group(1).strip()
+                    break
+        return rows
+
+    def extract_html_summary(self, directory, fields=HTML_SUMMARY_FIELDS):
+        """从HTML报告摘要表中一次提取指定字段（默认Fingerprint和Security Patch）
+
+        按优先级依次读取各HTML报告，每个字段取第一个包含该字段的报告中的值，请求的字段都找到后即停止，
+        不再读取其余报告；结果按目录、字段缓存，已提取过的字段不再读取报告。
+
+        Returns:
+            dict: {字段名: 值}，未找到的字段为"未找到"
+        """
+        cached = self._summary_cache.setdefault(directory, {})
+        missing_fields = [field for field in fields if field not in cached]
+        if missing_fields:
+            summary = {}
+            for html_file in self._get_sorted_html_files(directory):
+                try:
+                    rows = self._read_html_summary(
+                        html_file, [field for field in missing_fields if field not in summary])
+                except Exception as e:
+                    print(f"读取HTML文件 {html_file} 时出错: {e}")
+                    continue
+                for field in missing_fields:
+                    value = rows.get(field.lower())
+                    if field not in summary and value:
+                        summary[field] = value
+                if len(summary) == len(missing_fields):
+                    break
+            for field in missing_fields:
+                cached[field] = summary.get(field, NOT_FOUND)
+        return {field: cached[field] for field in fields}
+
+    def extract_fingerprint_from_html(self, directory):
+        """从HTML报告中提取Fingerprint"""
+        return self.extract_html_summary(directory)["Fingerprint"]
     
     def extract_generic_info(self, directory):
         """从目录中提取GenericDeviceInfo.deviceinfo.json中的信息"""
@@ -107,59 +164,10 @@ class SMR_InfoExtractor:
     
     def extract_security_patch(self, directory):
         """从目录中提取安全补丁日期"""
-        security_patch = "未找到"
-
-        html_files = self._get_dir_files(directory)["html"][:]
-        
-        # 按常见报告文件名排序，优先检查标准报告
-        html_files.sort(key=lambda x: (
-            0 if 'test_result' in x.lower() else
-            1 if 'compatibility' in x.lower() else
-            2 if 'gts' in x.lower() else
-            3 if 'cts' in x.lower() else 4
-        ))
-        
-        # 从HTML文件中提取安全补丁日期
-        for html_file in html_files:
-            try:
-                with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    # 精确匹配格式: <td class="rowtitle">Security Patch</td><td>日期</td>
-                    pattern = r'<td[^>]*class="rowtitle"[^>]*>Security Patch</td>\s*<td[^>]*>([^<]+)</td>'
-                    match = re.search(pattern, content, re.IGNORECASE)
-                    
-                    if match:
-                        security_patch = match.group(1).strip()
-                        # 验证日期格式是否为YYYY-MM-DD
-                        date_pattern = r'^\d{4}-\d{2}-\d{2}$'
-                        if re.match(date_pattern, security_patch):
-                            return security_patch
-                        else:
-                            print(f"警告: 提取的安全补丁日期格式不正确: {security_patch}")
-                            return security_patch
-                    
-                    # 尝试其他可能的格式
-                    alternative_patterns = [
-                        r'Security Patch.*?</td>\s*<td[^>]*>([^<]+)</td>',
-                        r'Security.*?Patch.*?</td>\s*<td[^>]*>([^<]+)</td>',
-                        r'<td[^>]*>Security Patch</td>\s*<td[^>]*>([^<]+)</td>',
-                    ]
-                    
-                    for pattern in alternative_patterns:
-                        match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
-                        if match:
-                            security_patch = match.group(1).strip()
-                            date_pattern = r'^\d{4}-\d{2}-\d{2}$'
-                            if re.match(date_pattern, security_patch):
-                                return security_patch
-                            else:
-                                print(f"警告: 提取的安全补丁日期格式不正确: {security_patch}")
-                                return security_patch
-            
-            except Exception as e:
-                print(f"读取HTML文件 {html_file} 时出错: {e}")
-        
+        security_patch = self.extract_html_summary(directory)["Security Patch"]
+        # 验证日期格式是否为YYYY-MM-DD
+        if security_patch != NOT_FOUND and not re.match(r'^\d{4}-\d{2}-\d{2}$', security_patch):
+            print(f"警告: 提取的安全补丁日期格式不正确: {security_patch}")
         return security_patch
     
     def extract_gms_version(self, directory):
@@ -228,8 +236,8 @@ class SMR_InfoExtractor:
         
         return mainline_info
     
-    def analyze_report_files(self, report_name, directory, prefix, security_patch, extra_info):
-        """分析单个报告目录的文件"""
+    def analyze_report_files(self, report_name, directory, prefix, security_patch, extra_info, json_files=None):
+        """分析单个报告目录的文件（json_files为已查找到的(Feature文件, Package文件)，提供时不再重新遍历目录）"""
         result = f"{report_name}分析:\n"
         result += "-" * 30 + "\n"
         
@@ -251,7 +259,9 @@ class SMR_InfoExtractor:
                 result += "Build Version Base OS: 未找到 (SMR应该有此值)\n"
         
         # 查找JSON文件
-        feature_file, package_file = self.file_utils.find_json_files_in_directory(directory)
+        if json_files is None:
+            json_files = self.file_utils.find_json_files_in_directory(directory)
+        feature_file, package_file = json_files
         
         # 记录文件信息
         if feature_file:
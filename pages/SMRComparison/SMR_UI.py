@@ -1,5 +1,5 @@
 # SMR_UI.py
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QTextEdit
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QTextEdit, QProgressBar
 from PyQt6.QtCore import Qt
 
 class SMR_UI:
@@ -15,6 +15,9 @@ class SMR_UI:
         # 创建三行控制按钮
         self.create_control_rows(main_layout)
         
+        # 创建分析进度条（分析时显示当前阶段）
+        self.create_progress_bar(main_layout)
+        
         # 创建结果显示区域
         self.create_result_displays(main_layout)
         
@@ -149,6 +152,25 @@ class SMR_UI:
         
         return container
     
+    def create_progress_bar(self, main_layout):
+        """创建分析进度条"""
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        self.progress_bar.setFixedHeight(20)
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                border: 1px solid #bdc3c7;
+                border-radius: 4px;
+                text-align: center;
+                color: #2c3e50;
+            }
+            QProgressBar::chunk {
+                background-color: #39C5BB;
+                border-radius: 3px;
+            }
+        """)
+        main_layout.addWidget(self.progress_bar, 0)
+    
     def create_result_displays(self, main_layout):
         """创建结果显示区域"""
         # 创建分析结果显示框
@@ -6,9 +6,11 @@ from .SMR_UI import SMR_UI
 from .SMR_FileUtils import SMR_FileUtils
 from .SMR_Analyzer import SMR_Analyzer
 from .SMR_EventHandler import SMR_EventHandler  
+from .SMR_AnalysisThread import SMR_AnalysisThread
 from .data_models import data_modelsChangeType, FeatureItem, FeatureChange, ComparisonResult
 from .smart_comparator import SmartFeatureComparator
 from .strict_comparator import StrictFeatureComparator
+from .feature_digest import FeatureDigests
 from .html_generator import HTMLReportGenerator
 from .usage_example import usage_example
 from .Package_models import PackageChangeType, PackageChange, PackageComparisonResult
@@ -22,4 +24,4 @@ from .SMR_PatchChecker import SMR_PatchChecker
 from .SMR_InfoExtractor import SMR_InfoExtractor
 from .SMR_Comparator import SMR_Comparator
 
-__all__ = ['SMRComparison', 'FeatureComparator', 'PackageComparator', 'Select_directory', 'SMR_UI', 'SMR_FileUtils', 'SMR_Analyzer', 'SMR_EventHandler', 'data_modelsChangeType', 'FeatureItem', 'FeatureChange', 'ComparisonResult','SmartFeatureComparator','StrictFeatureComparator','HTMLReportGenerator','usage_example', 'PackageChangeType', 'PackageChange', 'PackageComparisonResult', 'PackageComparator', 'HTMLReporter', 'FileUtils','SMR_PatchChecker','SMR_ReportGenerator','SMR_TimeUtils','SMR_InfoExtractor','SMR_Comparator']
\ No newline at end of file
+__all__ = ['SMRComparison', 'FeatureComparator', 'PackageComparator', 'Select_directory', 'SMR_UI', 'SMR_FileUtils', 'SMR_Analyzer', 'SMR_EventHandler', 'SMR_AnalysisThread', 'data_modelsChangeType', 'FeatureItem', 'FeatureChange', 'ComparisonResult','SmartFeatureComparator','StrictFeatureComparator','FeatureDigests','HTMLReportGenerator','usage_example', 'PackageChangeType', 'PackageChange', 'PackageComparisonResult', 'PackageComparator', 'HTMLReporter', 'FileUtils','SMR_PatchChecker','SMR_ReportGenerator','SMR_TimeUtils','SMR_InfoExtractor','SMR_Comparator']
\ No newline at end of file
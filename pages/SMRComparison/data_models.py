@@ -18,6 +18,8 @@ class FeatureItem:
     index: int
     name: str
     data: Dict[str, Any]
+    # feature对象的摘要（FeatureDigests），摘要相同的两项内容完全一致
+    digest: Optional[bytes] = None
     
     def get(self, key: str, default=None):
         """获取字段值"""
@@ -0,0 +1,55 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, List
+
+from .SMR_FileUtils import SMR_FileUtils
+
+# 摘要字节数（blake2b）
+DIGEST_SIZE = 16
+
+
+def json_digest(value: Any) -> bytes:
+    """JSON值的稳定摘要：两个值的摘要相同当且仅当json.dumps(sort_keys=False)结果相同
+
+    基于repr计算：repr与json.dumps一样保留字典键顺序、区分1/1.0/true，且在C中实现，比json.dumps快。
+    摘要不依赖hash()，跨进程稳定（可在进程池中计算）。
+    """
+    return hashlib.blake2b(repr(value).encode("utf-8", "surrogatepass"), digest_size=DIGEST_SIZE).digest()
+
+
+@dataclass
+class FeatureDigests:
+    """Feature文件的摘要：每个feature对象的摘要和整个文档的摘要，加载时计算一次，严格对比和智能对比共用"""
+    # 各feature的摘要（与feature列表一一对应），文档中没有feature列表时为空
+    features: List[bytes] = field(default_factory=list)
+    # 整个文档的摘要（feature列表部分由各feature的摘要组成，不再重复计算）
+    document: bytes = b""
+
+    @classmethod
+    def from_data(cls, data: Any) -> "FeatureDigests":
+        feature_list = data.get("feature") if isinstance(data, dict) else None
+        if not isinstance(feature_list, list):
+            return cls(document=json_digest(data))
+
+        features = [json_digest(feature) for feature in feature_list]
+        document = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        for key, value in data.items():
+            document.update(repr(key).encode("utf-8", "surrogatepass") + b":")
+            if value is feature_list:
+                document.update(b"L%d:" % len(features))
+                document.update(b"".join(features))
+            else:
+                document.update(b"V" + json_digest(value))
+        return cls(features, document.digest())
+
+
+def load_feature_document(file_path):
+    """读取Feature JSON并计算摘要 - 可在线程池或进程池中执行
+
+    Returns:
+        tuple: (JSON数据, FeatureDigests)，读取失败时为 (None, None)
+    """
+    data = SMR_FileUtils.read_json_file(file_path)
+    if data is None:
+        return None, None
+    return data, FeatureDigests.from_data(data)
@@ -2,6 +2,75 @@ import json
 import difflib
 from typing import Dict, List, Any, Tuple, Optional, Set
 from .data_models import data_modelsChangeType, FeatureItem, FeatureChange, ComparisonResult
+from .feature_digest import FeatureDigests
+
+# 相似度超过该值才视为同一功能项（修改）
+SIMILARITY_THRESHOLD = 0.5
+# 单独计分的字段，其余共有字段每个相同值加0.1分
+SIMILARITY_FIXED_KEYS = ('name', 'type', 'available')
+# 类型/可用性值无法作为字典键（如列表）时的分桶标记，按可能相同估算上界
+_UNKNOWN = object()
+
+
+class _CandidateIndex:
+    """未匹配新项的索引：名称→序号列表，以及按（类型，可用性）分桶的序号列表
+    
+    序号列表均按升序排列，已匹配的序号在查找时跳过（matched_new_indices只增不减，名称索引顺带前移）。
+    每个新项的SequenceMatcher按需创建并复用（difflib缓存第二个序列的统计信息，新项名称作为第二个序列）。
+    """
+    
+    def __init__(self, new_items: List[FeatureItem], matched_new_indices: Set[int]):
+        self._names = {}
+        self._buckets = {}
+        self._matchers = {}
+        self._new_items = new_items
+        for j, new_item in enumerate(new_items):
+            if j in matched_new_indices:
+                continue
+            self._names.setdefault(new_item.name, []).append(j)
+            self._buckets.setdefault(self._bucket_key(new_item), []).append(j)
+        self._name_positions = dict.fromkeys(self._names, 0)
+    
+    @staticmethod
+    def _bucket_key(item: FeatureItem):
+        key = []
+        for field in ('type', 'available'):
+            value = item.get(field)
+            try:
+                hash(value)
+            except TypeError:
+                value = _UNKNOWN
+            key.append(value)
+        return tuple(key)
+    
+    def first_by_name(self, name: str, matched_new_indices: Set[int]) -> Optional[int]:
+        """名称相同且未匹配的序号最小的新项"""
+        indices = self._names.get(name)
+        if indices is None:
+            return None
+        position = self._name_positions[name]
+        while position < len(indices) and indices[position] in matched_new_indices:
+            position += 1
+        self._name_positions[name] = position
+        return indices[position] if position < len(indices) else None
+    
+    def buckets(self, matched_new_indices: Set[int]):
+        """[((类型, 可用性), 未匹配的序号列表), ...]，同时从桶中移除已匹配的序号"""
+        for key, indices in list(self._buckets.items()):
+            indices = [j for j in indices if j not in matched_new_indices]
+            if indices:
+                self._buckets[key] = indices
+            else:
+                del self._buckets[key]
+        return list(self._buckets.items())
+    
+    def matcher(self, j: int, old_name: str) -> difflib.SequenceMatcher:
+        """旧项名称与第j个新项名称的SequenceMatcher（与SequenceMatcher(None, 旧名称, 新名称)相同）"""
+        matcher = self._matchers.get(j)
+        if matcher is None:
+            matcher = self._matchers[j] = difflib.SequenceMatcher(None, b=self._new_items[j].name)
+        matcher.set_seq1(old_name)
+        return matcher
 
 
 class SmartFeatureComparator:
@@ -10,8 +79,11 @@ class SmartFeatureComparator:
     def __init__(self):
         pass
     
-    def smart_compare(self, mr_feature_data, smr_feature_data):
-        """使用BCompare算法进行智能对比，返回ComparisonResult对象"""
+    def smart_compare(self, mr_feature_data, smr_feature_data, mr_digests=None, smr_digests=None):
+        """使用BCompare算法进行智能对比，返回ComparisonResult对象
+        
+        mr_digests/smr_digests为加载时计算的FeatureDigests，未提供时在此计算
+        """
         
         # 获取features列表
         mr_features = self._get_features_list(mr_feature_data)
@@ -20,16 +92,21 @@ class SmartFeatureComparator:
         if not mr_features or not smr_features:
             raise ValueError("无法获取feature列表")
         
+        if mr_digests is None:
+            mr_digests = FeatureDigests.from_data(mr_feature_data)
+        if smr_digests is None:
+            smr_digests = FeatureDigests.from_data(smr_feature_data)
+        
         # 创建FeatureItem列表
         mr_items = []
         for i, feature in enumerate(mr_features):
             name = feature.get('name', f'未知_{i}')
-            mr_items.append(FeatureItem(index=i, name=name, data=feature))
+            mr_items.append(FeatureItem(index=i, name=name, data=feature, digest=mr_digests.features[i]))
         
         smr_items = []
         for i, feature in enumerate(smr_features):
             name = feature.get('name', f'未知_{i}')
-            smr_items.append(FeatureItem(index=i, name=name, data=feature))
+            smr_items.append(FeatureItem(index=i, name=name, data=feature, digest=smr_digests.features[i]))
         
         # 使用BCompare算法构建映射
         changes = self._build_mapping(mr_items, smr_items)
@@ -104,63 +181,104 @@ class SmartFeatureComparator:
         return changes
     
     def _find_best_match(self, old_item: FeatureItem, new_items: List[FeatureItem], 
-                        matched_new_indices: Set[int]) -> Optional[Tuple[int, List[Tuple[str, Any, Any]]]]:
-        """为旧项在新列表中寻找最佳匹配"""
-        best_match = None
-        best_score = -1
+                        matched_new_indices: Set[int],
+                        candidate_index: Optional["_CandidateIndex"] = None) -> Optional[Tuple[int, List[Tuple[str, Any, Any]]]]:
+        """为旧项在新列表中寻找最佳匹配
         
-        for j, new_item in enumerate(new_items):
-            if j in matched_new_indices:
-                continue
-            
-            # 如果名称相同，直接匹配
-            if old_item.name == new_item.name:
-                changes = self._compare_items(old_item, new_item)
-                return (j, changes)
-            
-            # 计算相似度得分
-            score = self._calculate_similarity(old_item, new_item)
-            if score > best_score:
-                best_score = score
-                best_match = (j, self._compare_items(old_item, new_item))
+        名称相同的未匹配新项优先（取序号最小的）；否则取相似度最高的新项（同分取序号最小的），
+        相似度超过阈值才匹配。candidate_index为未匹配新项的索引，未提供时临时建立。
+        相似度按上界剪枝：先按类型/可用性分桶估算整桶上界，再逐项用字符数上界
+        （real_quick_ratio/quick_ratio）排除不可能胜出的候选，只对剩余候选计算difflib相似度，
+        差异只对最终胜出的候选计算。
+        """
+        if candidate_index is None:
+            candidate_index = _CandidateIndex(new_items, matched_new_indices)
         
-        # 如果相似度足够高，则匹配
-        if best_score > 0.5:  # 阈值可以根据需要调整
-            return best_match
+        # 如果名称相同，直接匹配
+        j = candidate_index.first_by_name(old_item.name, matched_new_indices)
+        if j is not None:
+            return (j, self._compare_items(old_item, new_items[j]))
+        
+        best_j = None
+        best_score = SIMILARITY_THRESHOLD
+        
+        def can_win(bound, j):
+            # 超过当前最高分，或同分但序号更小；尚无候选时必须超过阈值
+            return bound > best_score or (best_j is not None and bound == best_score and j < best_j)
+        
+        other_keys = [key for key in old_item.data if key not in SIMILARITY_FIXED_KEYS]
+        buckets = []
+        for (type_value, available_value), indices in candidate_index.buckets(matched_new_indices):
+            same_type = type_value is _UNKNOWN or old_item.get('type') == type_value
+            same_available = available_value is _UNKNOWN or old_item.get('available') == available_value
+            bound = self._similarity_score(1.0, same_type, same_available, len(other_keys))
+            buckets.append((bound, indices))
+        # 上界高的桶先处理，尽快提高当前最高分以剪掉其余的桶
+        buckets.sort(key=lambda bucket: bucket[0], reverse=True)
+        
+        for bucket_bound, indices in buckets:
+            if not can_win(bucket_bound, -1):
+                break
+            for j in indices:
+                new_item = new_items[j]
+                same_type = old_item.get('type') == new_item.get('type')
+                same_available = old_item.get('available') == new_item.get('available')
+                equal_fields = self._count_equal_fields(old_item, new_item)
+                if not can_win(self._similarity_score(1.0, same_type, same_available, equal_fields), j):
+                    continue
+                matcher = candidate_index.matcher(j, old_item.name)
+                if not can_win(self._similarity_score(matcher.real_quick_ratio(), same_type, same_available, equal_fields), j):
+                    continue
+                if not can_win(self._similarity_score(matcher.quick_ratio(), same_type, same_available, equal_fields), j):
+                    continue
+                score = self._similarity_score(matcher.ratio(), same_type, same_available, equal_fields)
+                if can_win(score, j):
+                    best_j, best_score = j, score
         
-        return None
+        # 如果相似度足够高，则匹配
+        if best_j is None:
+            return None
+        return (best_j, self._compare_items(old_item, new_items[best_j]))
     
-    def _calculate_similarity(self, item1: FeatureItem, item2: FeatureItem) -> float:
-        """计算两个功能项的相似度"""
+    def _similarity_score(self, name_similarity: float, same_type: bool, same_available: bool,
+                          equal_fields: int) -> float:
+        """按各部分计算相似度得分（求和顺序固定，名称相似度或相等字段数取上界时得到的也是得分的上界）"""
         score = 0.0
-        
-        # 名称相似度（使用difflib的序列匹配器）
-        name_similarity = difflib.SequenceMatcher(None, item1.name, item2.name).ratio()
         score += name_similarity * 0.3
-        
-        # 类型相似度
-        type1 = item1.get('type')
-        type2 = item2.get('type')
-        if type1 == type2:
+        if same_type:
             score += 0.2
-        
-        # 可用性相似度
-        available1 = item1.get('available')
-        available2 = item2.get('available')
-        if available1 == available2:
+        if same_available:
             score += 0.2
-        
-        # 其他字段相似度
-        common_keys = set(item1.data.keys()) & set(item2.data.keys())
-        for key in common_keys:
-            if key not in ['name', 'type', 'available']:
-                if self._compare_values(item1.data[key], item2.data[key]):
-                    score += 0.1
-        
+        for _ in range(equal_fields):
+            score += 0.1
         return min(score, 1.0)
     
+    def _count_equal_fields(self, item1: FeatureItem, item2: FeatureItem) -> int:
+        """名称、类型、可用性以外值相同的共有字段数"""
+        count = 0
+        data2 = item2.data
+        for key, value in item1.data.items():
+            if key not in SIMILARITY_FIXED_KEYS and key in data2:
+                if self._compare_values(value, data2[key]):
+                    count += 1
+        return count
+    
+    def _calculate_similarity(self, item1: FeatureItem, item2: FeatureItem) -> float:
+        """计算两个功能项的相似度"""
+        # 名称相似度（使用difflib的序列匹配器）
+        name_similarity = difflib.SequenceMatcher(None, item1.name, item2.name).ratio()
+        return self._similarity_score(
+            name_similarity,
+            item1.get('type') == item2.get('type'),        # 类型相似度
+            item1.get('available') == item2.get('available'),    # 可用性相似度
+            self._count_equal_fields(item1, item2)           # 其他字段相似度
+        )
+    
     def _build_mapping(self, old_items: List[FeatureItem], new_items: List[FeatureItem]) -> List[FeatureChange]:
-        """构建新旧文件的映射关系（BCompare算法）"""
+        """构建新旧文件的映射关系（BCompare算法）
+        
+        名称到新项序号的索引用于第二、三阶段按名称查找，不再逐项扫描新列表。
+        """
         changes = []
         
         # 已经匹配的索引
@@ -173,7 +291,11 @@ class SmartFeatureComparator:
             new_item = new_items[i]
             
             if old_item.name == new_item.name:
-                diff = self._compare_items(old_item, new_item)
+                # 摘要相同则内容完全一致，无需逐字段对比
+                if old_item.digest is not None and old_item.digest == new_item.digest:
+                    diff = []
+                else:
+                    diff = self._compare_items(old_item, new_item)
                 if not diff:
                     changes.append(FeatureChange(
                         change_type=data_modelsChangeType.SAME,
@@ -183,40 +305,39 @@ class SmartFeatureComparator:
                     matched_old_indices.add(i)
                     matched_new_indices.add(i)
         
+        candidate_index = _CandidateIndex(new_items, matched_new_indices)
+        
         # 第二阶段：匹配名称相同但位置不同的项
         for i, old_item in enumerate(old_items):
             if i in matched_old_indices:
                 continue
             
             # 查找名称相同的新项
-            for j, new_item in enumerate(new_items):
-                if j in matched_new_indices:
-                    continue
+            j = candidate_index.first_by_name(old_item.name, matched_new_indices)
+            if j is not None:
+                new_item = new_items[j]
+                diff = self._compare_items(old_item, new_item)
                 
-                if old_item.name == new_item.name:
-                    diff = self._compare_items(old_item, new_item)
-                    
-                    if not diff:
-                        change_type = data_modelsChangeType.MOVED
-                    else:
-                        change_type = data_modelsChangeType.MODIFIED
-                    
-                    changes.append(FeatureChange(
-                        change_type=change_type,
-                        old_item=old_item,
-                        new_item=new_item,
-                        changes=diff
-                    ))
-                    matched_old_indices.add(i)
-                    matched_new_indices.add(j)
-                    break
+                if not diff:
+                    change_type = data_modelsChangeType.MOVED
+                else:
+                    change_type = data_modelsChangeType.MODIFIED
+                
+                changes.append(FeatureChange(
+                    change_type=change_type,
+                    old_item=old_item,
+                    new_item=new_item,
+                    changes=diff
+                ))
+                matched_old_indices.add(i)
+                matched_new_indices.add(j)
         
         # 第三阶段：匹配相似的项（BCompare的智能匹配）
         for i, old_item in enumerate(old_items):
             if i in matched_old_indices:
                 continue
             
-            best_match = self._find_best_match(old_item, new_items, matched_new_indices)
+            best_match = self._find_best_match(old_item, new_items, matched_new_indices, candidate_index)
             if best_match:
                 j, diff = best_match
                 new_item = new_items[j]
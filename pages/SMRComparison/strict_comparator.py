@@ -1,15 +1,25 @@
 import json
 from typing import Dict, List, Any
 
+from .feature_digest import FeatureDigests
+
 
 class StrictFeatureComparator:
     """严格Feature JSON文件对比器 - 完全一致才PASS"""
     
-    def compare(self, mr_feature_data, smr_feature_data):
-        """严格比较两个Feature JSON文件的差异"""
+    def compare(self, mr_feature_data, smr_feature_data, mr_digests=None, smr_digests=None):
+        """严格比较两个Feature JSON文件的差异
+        
+        mr_digests/smr_digests为加载时计算的FeatureDigests，未提供时在此计算
+        """
         if mr_feature_data is None or smr_feature_data is None:
             return "无法比较：其中一个文件为空\n"
         
+        if mr_digests is None:
+            mr_digests = FeatureDigests.from_data(mr_feature_data)
+        if smr_digests is None:
+            smr_digests = FeatureDigests.from_data(smr_feature_data)
+        
         result_text = "Feature DeviceInfo 严格对比结果:\n"
         result_text += "=" * 70 + "\n"
         
@@ -24,8 +34,8 @@ class StrictFeatureComparator:
         result_text += f"MR Feature总数: {mr_total}\n"
         result_text += f"SMR Feature总数: {smr_total}\n\n"
         
-        # 首先检查整个JSON是否完全一致
-        if self._are_json_identical(mr_feature_data, smr_feature_data):
+        # 首先检查整个JSON是否完全一致（比较文档摘要）
+        if mr_digests.document == smr_digests.document:
             result_text += "✅ PASS - 两个Feature文件完全相同\n"
             result_text += "请详细查看comparison_reports中生成的html文件\n"
             return result_text
@@ -177,5 +187,6 @@ class StrictFeatureComparator:
         if value is None:
             return "null"
         if isinstance(value, (dict, list)):
-            return json.dumps(value, ensure_ascii=False)[:100] + ("..." if len(json.dumps(value, ensure_ascii=False)) > 100 else "")
+            text = json.dumps(value, ensure_ascii=False)
+            return text[:100] + ("..." if len(text) > 100 else "")
         return str(value)
\ No newline at end of file
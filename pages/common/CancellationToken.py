@@ -0,0 +1,50 @@
+import threading
+import contextlib
+
+_current = threading.local()
+
+
+class AnalysisCancelled(BaseException):
+    """分析已被取消
+
+    继承BaseException，避免被分析器中逐文件的 except Exception 当作普通解析错误吞掉。
+    """
+
+
+class CancellationToken:
+    """协作式取消令牌 - 由UI线程置位，分析线程在文件之间及流式解析内部检查"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def is_cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise AnalysisCancelled()
+
+    @contextlib.contextmanager
+    def activate(self):
+        """在当前线程中激活令牌，使解析函数内的check_cancelled()能感知取消"""
+        previous = getattr(_current, "token", None)
+        _current.token = self
+        try:
+            yield self
+        finally:
+            _current.token = previous
+
+
+def current_token():
+    """当前线程激活的令牌（未激活时为None），用于在工作线程中重新激活同一令牌"""
+    return getattr(_current, "token", None)
+
+
+def check_cancelled():
+    """检查当前线程激活的令牌，已取消时抛出AnalysisCancelled（未激活时不做任何事）"""
+    token = getattr(_current, "token", None)
+    if token is not None:
+        token.raise_if_cancelled()
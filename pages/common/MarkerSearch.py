@@ -0,0 +1,76 @@
+import mmap
+
+from .CancellationToken import check_cancelled
+
+# 默认只读取文件开头的字节数（报告摘要表位于页面开头，通常不足10KB）
+DEFAULT_MARKER_PREFIX_SIZE = 64 * 1024
+# 回退到全文查找时每次读取的字节数（无法mmap时使用，如压缩包成员）
+MARKER_READ_CHUNK_SIZE = 1024 * 1024
+
+
+def _to_bytes(value, encoding="utf-8"):
+    return value.encode(encoding) if isinstance(value, str) else value
+
+
+def _section_complete(prefix, section):
+    """前缀中是否已包含完整的区段（起始标记及其后的结束标记）"""
+    start, end = section
+    start_pos = prefix.find(start)
+    return start_pos != -1 and prefix.find(end, start_pos + len(start)) != -1
+
+
+def _find_in_rest(f, marker, prefix):
+    """在前缀之后的内容中查找标记（与前缀结尾拼接，避免标记恰好跨越边界）"""
+    try:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped.find(marker, max(0, len(prefix) - len(marker) + 1)) != -1
+    except (OSError, ValueError):
+        # 压缩包成员、内存中的文档或空文件无法mmap，改为分块读取
+        pass
+    tail = prefix[-(len(marker) - 1):] if len(marker) > 1 else b""
+    while True:
+        check_cancelled()
+        chunk = f.read(MARKER_READ_CHUNK_SIZE)
+        if not chunk:
+            return False
+        window = tail + chunk
+        if marker in window:
+            return True
+        tail = window[-(len(marker) - 1):] if len(marker) > 1 else b""
+
+
+def contains_marker(path, marker, section=None, prefix_size=DEFAULT_MARKER_PREFIX_SIZE, encoding="utf-8",
+                    opener=open):
+    """文件中是否包含标记字符串，只读取文件开头prefix_size字节，必要时才查找全文
+
+    按字节比较，不解码文件内容，因此不会因个别无法解码的字节而失败。
+    以下情况不再读取全文：前缀中已找到标记；文件不超过prefix_size；
+    或者给定了section=(起始标记, 结束标记)（标记只会出现在该区段内），且前缀中已包含完整区段。
+    其余情况回退为查找全文（本地文件使用mmap，压缩包成员分块读取）。
+    opener用于打开文件（以二进制模式调用），报告检查传入支持压缩包成员和文档缓存的open_document。
+    """
+    marker = _to_bytes(marker, encoding)
+    if section is not None:
+        section = (_to_bytes(section[0], encoding), _to_bytes(section[1], encoding))
+    with opener(path, 'rb') as f:
+        prefix = f.read(prefix_size)
+        if marker in prefix:
+            return True
+        if len(prefix) < prefix_size:
+            return False
+        if section is not None and _section_complete(prefix, section):
+            return False
+        return _find_in_rest(f, marker, prefix)
+
+
+def read_text_prefix(path, prefix_size=DEFAULT_MARKER_PREFIX_SIZE, encoding="utf-8", opener=open):
+    """读取文件开头prefix_size字节的文本（按errors='ignore'解码），prefix_size为None时读取全文（opener同contains_marker）
+
+    Returns:
+        tuple: (文本, 是否已读到文件末尾)
+    """
+    with opener(path, 'rb') as f:
+        if prefix_size is None:
+            return f.read().decode(encoding, errors="ignore"), True
+        prefix = f.read(prefix_size)
+        return prefix.decode(encoding, errors="ignore"), len(prefix) < prefix_size
@@ -0,0 +1,4 @@
+from .CancellationToken import CancellationToken, AnalysisCancelled, check_cancelled, current_token
+from .MarkerSearch import contains_marker, read_text_prefix
+
+__all__ = ['CancellationToken', 'AnalysisCancelled', 'check_cancelled', 'current_token', 'contains_marker', 'read_text_prefix']
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# 在仓库根目录外运行pytest时也能导入pages；界面模块在无显示器的环境中使用offscreen平台
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -0,0 +1,64 @@
+import json
+import itertools
+
+import pytest
+
+from pages.SMRComparison.feature_digest import FeatureDigests, json_digest
+from pages.SMRComparison.strict_comparator import StrictFeatureComparator
+
+VALUES = [
+    1, 1.0, True, "1", None, 0.0, -0.0, float("nan"), float("inf"), 1e16, 10000000000000000,
+    "", "中文", 'quote"d', [], {}, [1, 2], [2, 1], [[1], 2], [1, [2]],
+    {"a": 1, "b": 2}, {"b": 2, "a": 1}, {"a": 1.0, "b": 2}, {"a": True, "b": 2}, {"a": [1]}, {"a": [1.0]},
+]
+
+FEATURE = {"name": "android.hardware.camera", "available": True}
+DOCUMENTS = [
+    {"feature": [FEATURE]},
+    {"feature": [dict(FEATURE, version=1)]},
+    {"feature": [dict(FEATURE, version=1.0)]},
+    {"feature": [{"available": True, "name": "android.hardware.camera"}]},
+    {"feature": [FEATURE, FEATURE]},
+    {"feature": []},
+    {"feature": [FEATURE], "count": 1},
+    {"count": 1, "feature": [FEATURE]},
+    {"count": 1.0, "feature": [FEATURE]},
+    {"feature": "none"},
+    {"feature": [[FEATURE]]},
+    {"features": [FEATURE]},
+    [FEATURE],
+]
+
+
+def dumps(value):
+    return json.dumps(value, sort_keys=False, indent=None, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("value1, value2", list(itertools.product(VALUES, repeat=2)))
+def test_json_digest_equal_iff_json_dumps_equal(value1, value2):
+    assert (json_digest(value1) == json_digest(value2)) == (dumps(value1) == dumps(value2))
+
+
+@pytest.mark.parametrize("data1, data2", list(itertools.product(DOCUMENTS, repeat=2)))
+def test_document_digest_equal_iff_json_dumps_equal(data1, data2):
+    # 严格对比的整体PASS依赖该等价关系（与原实现_are_json_identical一致）
+    identical = StrictFeatureComparator()._are_json_identical(data1, data2)
+
+    assert (FeatureDigests.from_data(data1).document == FeatureDigests.from_data(data2).document) == identical
+
+
+def test_feature_digests_follow_feature_list():
+    features = [FEATURE, dict(FEATURE, version=1), FEATURE]
+
+    digests = FeatureDigests.from_data({"feature": features, "count": 3})
+
+    assert digests.features == [json_digest(feature) for feature in features]
+    assert digests.features[0] == digests.features[2] != digests.features[1]
+
+
+@pytest.mark.parametrize("data", [{"feature": "none"}, {"features": [FEATURE]}, [FEATURE]])
+def test_document_without_feature_list_uses_whole_document_digest(data):
+    digests = FeatureDigests.from_data(data)
+
+    assert digests.features == []
+    assert digests.document == json_digest(data)
@@ -0,0 +1,96 @@
+import io
+import json
+
+import pytest
+
+from pages.CheckupReport.JsonStreamScanner import JsonStreamScanner, scan_package_versions
+from pages.CheckupReport.ReportAnalyzerCore import ReportAnalyzerCore, GO_PACKAGE_NAME, MAINLINE_PACKAGE_NAME
+
+DOCUMENT = {
+    "package": [
+        {"name": "com.android.a", "version_name": "1.0", "shared": [1, 23, 456, 7.5e3, True, None]},
+        {"name": MAINLINE_PACKAGE_NAME, "version_name": "340000000", "text": "中文 \"quoted\" \\ slash"},
+        {"name": GO_PACKAGE_NAME, "version_name": "350000000"},
+    ],
+    "count": 1234567,
+}
+PACKAGE_NAMES = (GO_PACKAGE_NAME, MAINLINE_PACKAGE_NAME)
+
+
+def read_object(scanner):
+    """用扫描器按成员逐个读出整个对象（数组成员逐元素读取）"""
+    data = {}
+    for key in scanner.iter_object_keys():
+        if scanner.peek() == "[":
+            data[key] = list(scanner.iter_array_items())
+        else:
+            data[key] = scanner.read_value()
+    scanner.finish()
+    return data
+
+
+@pytest.mark.parametrize("chunk_size", range(1, 40))
+def test_scanner_matches_json_loads_for_any_chunk_boundary(chunk_size):
+    text = json.dumps(DOCUMENT, ensure_ascii=False, indent=1)
+
+    scanner = JsonStreamScanner(io.StringIO(text), chunk_size=chunk_size)
+
+    assert read_object(scanner) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5])
+def test_numbers_at_chunk_end_are_not_truncated(chunk_size):
+    scanner = JsonStreamScanner(io.StringIO("[1, 23, 456, 7890, -1.5e10]"), chunk_size=chunk_size)
+
+    assert list(scanner.iter_array_items()) == [1, 23, 456, 7890, -1.5e10]
+
+
+@pytest.mark.parametrize("text", ['{"package": [{"name": "a"}', '{"package": [1 2]}', '[1, 2] 3'])
+def test_invalid_documents_raise_decode_error(text):
+    scanner = JsonStreamScanner(io.StringIO(text), chunk_size=4)
+
+    with pytest.raises(json.JSONDecodeError):
+        if scanner.peek() == "[":
+            list(scanner.iter_array_items())
+            scanner.finish()
+        else:
+            read_object(scanner)
+
+
+@pytest.mark.parametrize("text", [
+    json.dumps(DOCUMENT),
+    json.dumps(DOCUMENT["package"]),
+    # 没有"package"成员时使用名称中含"package"的列表
+    json.dumps({"installed_packages": [{"name": MAINLINE_PACKAGE_NAME, "version_name": "4"}],
+                "PackageList": [{"name": GO_PACKAGE_NAME, "version_name": "5"}]}),
+    json.dumps({"package": "none", "installed_packages": [{"name": GO_PACKAGE_NAME, "version_name": "6"}]}),
+    json.dumps({"package": [{"name": GO_PACKAGE_NAME, "version_name": "7"}]}),
+])
+def test_scan_package_versions_matches_full_parse(text):
+    versions = scan_package_versions(io.StringIO(text), PACKAGE_NAMES)
+
+    expected = ReportAnalyzerCore._extract_device_info_versions_from_content("PackageDeviceInfo.deviceinfo.json", text)
+    assert (versions.get(GO_PACKAGE_NAME), versions.get(MAINLINE_PACKAGE_NAME)) == expected
+
+
+@pytest.mark.parametrize("document", [DOCUMENT, DOCUMENT["package"]])
+def test_scan_package_versions_stops_after_all_packages_found(document):
+    # 找齐目标包后不再读取剩余部分：后面即使是无效内容也不影响结果
+    text = json.dumps(document)
+    end = text.index(GO_PACKAGE_NAME) + text[text.index(GO_PACKAGE_NAME):].index("}") + 1
+    f = io.StringIO(text[:end] + ", {broken")
+
+    versions = scan_package_versions(f, PACKAGE_NAMES)
+
+    assert versions == {MAINLINE_PACKAGE_NAME: "340000000", GO_PACKAGE_NAME: "350000000"}
+
+
+def test_scan_package_versions_keeps_first_occurrence():
+    text = json.dumps({"package": [{"name": GO_PACKAGE_NAME, "version_name": "1"},
+                                   {"name": GO_PACKAGE_NAME, "version_name": "2"}]})
+
+    assert scan_package_versions(io.StringIO(text), PACKAGE_NAMES) == {GO_PACKAGE_NAME: "1"}
+
+
+def test_scan_package_versions_rejects_other_structures():
+    assert scan_package_versions(io.StringIO('"text"'), PACKAGE_NAMES) is None
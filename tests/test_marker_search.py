@@ -0,0 +1,45 @@
+import io
+import sys
+
+import pytest
+
+from pages.common.MarkerSearch import contains_marker, read_text_prefix
+
+
+def in_memory_opener(content):
+    """返回内存文档（不能mmap，查找全文时走分块读取）"""
+    return lambda path, mode: io.BytesIO(content)
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_marker_found_across_prefix_and_chunk_boundaries(tmp_path, monkeypatch, use_mmap):
+    monkeypatch.setattr(sys.modules[contains_marker.__module__], "MARKER_READ_CHUNK_SIZE", 7)
+    marker = b"GTS / apts"
+    prefix_size = 16
+    for position in range(0, 40):
+        content = b"x" * position + marker + b"y" * 20
+        path = tmp_path / f"report_{position}.html"
+        path.write_bytes(content)
+        opener = open if use_mmap else in_memory_opener(content)
+
+        assert contains_marker(str(path), marker, prefix_size=prefix_size, opener=opener), position
+        assert not contains_marker(str(path), b"GTS / other", prefix_size=prefix_size, opener=opener)
+
+
+def test_complete_section_in_prefix_stops_search(tmp_path):
+    # 标记只会出现在摘要区段内：前缀中已有完整区段时不再查找后面的内容
+    content = b"<table>Suite / Plan CTS / cts</table>" + b"z" * 64 + b"GTS / apts"
+    path = tmp_path / "test_result_failures_suite.html"
+    path.write_bytes(content)
+
+    assert not contains_marker(str(path), "GTS / apts", ("Suite / Plan", "</table>"), prefix_size=48)
+    assert contains_marker(str(path), "GTS / apts", prefix_size=48)
+
+
+def test_read_text_prefix_reports_completeness(tmp_path):
+    path = tmp_path / "report.html"
+    path.write_bytes("摘要".encode("utf-8") + b"a" * 10)
+
+    assert read_text_prefix(str(path), prefix_size=8) == ("摘要aa", False)
+    assert read_text_prefix(str(path), prefix_size=64) == ("摘要" + "a" * 10, True)
+    assert read_text_prefix(str(path), prefix_size=None) == ("摘要" + "a" * 10, True)
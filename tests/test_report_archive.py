@@ -0,0 +1,93 @@
+import io
+import zipfile
+
+from pages.CheckupReport.ReportIndex import ReportIndex, KIND_FAILURES_HTML, KIND_RESULT_XML
+from pages.CheckupReport.ReportArchive import ArchiveCache, open_report, report_signature
+
+RESULT_XML = b"<Result/>"
+
+
+def write(root, relative, content=""):
+    path = root.joinpath(*relative.split("/"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def make_upload_zip(tmp_path):
+    """送测压缩包：android-cts/results下的结果zip（嵌套），以及应跳过的logs目录"""
+    inner = make_zip({
+        "test_result.xml": RESULT_XML,
+        "logs/module/test_result.xml": "",
+    })
+    outer = tmp_path / "upload.zip"
+    outer.write_bytes(make_zip({
+        "android-cts/results/r1.zip": inner,
+        "android-cts/logs/r1/test_result_failures_suite.html": "",
+        "android-cts/results/other/test_result_failures_suite.html": "",
+    }))
+    return outer
+
+
+def test_directory_archives_are_indexed_only_when_requested(tmp_path):
+    archive = tmp_path / "CTS" / "2026.10.14_01.02.03.zip"
+    archive.parent.mkdir()
+    archive.write_bytes(make_zip({"2026.10.14_01.02.03/test_result.xml": RESULT_XML}))
+
+    assert ReportIndex(str(tmp_path)).get_files(KIND_RESULT_XML) == []
+    assert ReportIndex(str(tmp_path), scan_archives=True).get_files(KIND_RESULT_XML) == [
+        f"{archive}!/2026.10.14_01.02.03/test_result.xml"
+    ]
+
+
+def test_archive_next_to_extracted_directory_is_skipped(tmp_path):
+    extracted = write(tmp_path, "results/r1/test_result.xml")
+    (tmp_path / "results" / "r1.zip").write_bytes(make_zip({"r1/test_result.xml": RESULT_XML}))
+
+    assert ReportIndex(str(tmp_path), scan_archives=True).get_files(KIND_RESULT_XML) == [extracted]
+
+
+def test_root_archive_expands_nested_archives(tmp_path):
+    outer = make_upload_zip(tmp_path)
+
+    index = ReportIndex(str(outer))
+
+    location = f"{outer}!/android-cts/results/r1.zip!/test_result.xml"
+    assert index.get_files(KIND_RESULT_XML) == [location]
+    assert index.get_files(KIND_FAILURES_HTML) == [f"{outer}!/android-cts/results/other/test_result_failures_suite.html"]
+    with open_report(location) as f:
+        assert f.read() == RESULT_XML
+
+
+def test_archive_cache_opens_nested_archive_once(tmp_path, monkeypatch):
+    outer = make_upload_zip(tmp_path)
+    location = f"{outer}!/android-cts/results/r1.zip!/test_result.xml"
+    opened = []
+    original_zipfile = zipfile.ZipFile
+
+    class CountingZipFile(original_zipfile):
+        def __init__(self, file, *args, **kwargs):
+            opened.append(file)
+            super().__init__(file, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile, "ZipFile", CountingZipFile)
+    cache = ArchiveCache()
+    try:
+        with cache.activate():
+            for _ in range(3):
+                assert report_signature(location) == (len(RESULT_XML), outer.stat().st_mtime_ns)
+                with open_report(location) as f:
+                    assert f.read() == RESULT_XML
+    finally:
+        cache.close()
+
+    # 外层压缩包和内层结果zip各打开一次
+    assert len(opened) == 2
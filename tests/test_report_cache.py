@@ -0,0 +1,77 @@
+import os
+import sys
+
+from pages.CheckupReport.ReportCache import ReportCache
+from pages.CheckupReport.ReportIndex import KIND_FAILURES_HTML
+
+SUMMARY = {"Suite / Plan": "CTS / cts", "Tests Failed": "0"}
+
+
+def cache_report(tmp_path, content="summary"):
+    report = tmp_path / "test_result_failures_suite.html"
+    report.write_text(content, encoding="utf-8")
+    cache = ReportCache(str(tmp_path / "cache.db"))
+    key = (KIND_FAILURES_HTML, str(report))
+    tasks = [(KIND_FAILURES_HTML, str(report), None)]
+    hits, signatures = cache.load_records(tasks)
+    assert hits == {}
+    cache.save_records({key: {"data": SUMMARY}}, signatures)
+    return cache, report, key, tasks
+
+
+def test_unchanged_report_hits_cache(tmp_path):
+    cache, _, key, tasks = cache_report(tmp_path)
+
+    hits, _ = cache.load_records(tasks)
+
+    assert hits == {key: {"data": SUMMARY}}
+
+
+def test_size_change_invalidates_record(tmp_path):
+    cache, report, _, tasks = cache_report(tmp_path)
+    report.write_text("summary with more rows", encoding="utf-8")
+
+    hits, _ = cache.load_records(tasks)
+
+    assert hits == {}
+
+
+def test_mtime_change_invalidates_record(tmp_path):
+    cache, report, _, tasks = cache_report(tmp_path)
+    stat = report.stat()
+    os.utime(report, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    hits, _ = cache.load_records(tasks)
+
+    assert hits == {}
+
+
+def test_parser_version_change_invalidates_record(tmp_path, monkeypatch):
+    cache, _, _, tasks = cache_report(tmp_path)
+    module = sys.modules[ReportCache.__module__]
+    monkeypatch.setattr(module, "PARSER_VERSION", module.PARSER_VERSION + 1)
+
+    hits, _ = cache.load_records(tasks)
+
+    assert hits == {}
+
+
+def test_error_records_are_not_cached(tmp_path):
+    report = tmp_path / "test_result_failures_suite.html"
+    report.write_text("broken", encoding="utf-8")
+    cache = ReportCache(str(tmp_path / "cache.db"))
+    tasks = [(KIND_FAILURES_HTML, str(report), None)]
+    _, signatures = cache.load_records(tasks)
+
+    cache.save_records({(KIND_FAILURES_HTML, str(report)): {"error": "ValueError"}}, signatures)
+    hits, _ = cache.load_records(tasks)
+
+    assert hits == {}
+
+
+def test_missing_report_has_no_signature(tmp_path):
+    cache = ReportCache(str(tmp_path / "cache.db"))
+
+    hits, signatures = cache.load_records([(KIND_FAILURES_HTML, str(tmp_path / "missing.html"), None)])
+
+    assert hits == {} and signatures == {}
@@ -0,0 +1,52 @@
+import pytest
+
+from pages.CheckupReport.ReportIndex import (ReportIndex, KIND_APTS_XML, KIND_CV_XML, KIND_FAILURES_HTML,
+                                             KIND_PACKAGE_DEVICE_INFO, KIND_CTS_DEVICE_INFO, KIND_RESULT_XML)
+from pages.common.CancellationToken import CancellationToken, AnalysisCancelled
+
+
+def write(root, relative, content=""):
+    path = root.joinpath(*relative.split("/"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_classify_report_kinds_and_suites(tmp_path):
+    apts = write(tmp_path, "APTS/test_approval/results/r1/test_result.xml")
+    cv = write(tmp_path, "CV/2026.10.15-CTS_VERIFIER-abc/test_result.xml")
+    cts = write(tmp_path, "CTS/android-cts/results/r1/test_result.xml")
+    html = write(tmp_path, "GTS/android-gts/results/r1/test_result_failures_suite.html")
+    package = write(tmp_path, "CTS/android-cts/results/r1/device-info-files/PackageDeviceInfo.deviceinfo.json")
+    generic = write(tmp_path, "CTS/android-cts/results/r1/device-info-files/GenericDeviceInfo.deviceinfo.json")
+
+    index = ReportIndex(str(tmp_path))
+
+    assert sorted(index.get_files(KIND_RESULT_XML)) == sorted([apts, cv, cts])
+    assert index.get_files(KIND_APTS_XML) == [apts]
+    assert index.get_files(KIND_CV_XML) == [cv]
+    assert index.get_files(KIND_RESULT_XML, "CTS") == [cts]
+    assert index.get_files(KIND_FAILURES_HTML, "GTS") == [html]
+    assert index.get_files(KIND_PACKAGE_DEVICE_INFO) == [package]
+    assert index.get_files(KIND_CTS_DEVICE_INFO) == [generic]
+
+
+def test_skip_dirs_only_inside_tradefed_directories(tmp_path):
+    outside = write(tmp_path, "tools/reports/test_result_failures_suite.html")
+    result = write(tmp_path, "android-cts/results/r1/test_result_failures_suite.html")
+    write(tmp_path, "android-cts/logs/r1/test_result_failures_suite.html")
+    write(tmp_path, "android-cts/tools/test_result_failures_suite.html")
+    write(tmp_path, ".git/test_result_failures_suite.html")
+
+    index = ReportIndex(str(tmp_path))
+
+    assert sorted(index.get_files(KIND_FAILURES_HTML)) == sorted([outside, result])
+
+
+def test_build_stops_when_cancelled(tmp_path):
+    write(tmp_path, "android-cts/results/r1/test_result.xml")
+    token = CancellationToken()
+    token.cancel()
+
+    with token.activate(), pytest.raises(AnalysisCancelled):
+        ReportIndex(str(tmp_path))
@@ -0,0 +1,88 @@
+import os
+import sys
+
+import pytest
+
+from pages.CheckupReport.ReportParsePool import ReportParsePool, ReportParseError, get_record_data
+
+KIND_NAME = "name"
+KIND_SIZE = "size"
+
+
+def make_tasks(tmp_path, count):
+    """每个文件两个任务（同一文件的任务在并行解析时分为一组），最后一个文件不存在"""
+    tasks = []
+    for i in range(count):
+        path = tmp_path / f"report_{i}.html"
+        if i < count - 1:
+            path.write_text("x" * i, encoding="utf-8")
+        # 解析函数须可pickle，使用标准库的模块级函数
+        tasks.append((KIND_NAME, str(path), os.path.basename))
+        tasks.append((KIND_SIZE, str(path), os.path.getsize))
+    return tasks
+
+
+def expected_records(tasks):
+    records = {}
+    for kind, path, extractor in tasks:
+        try:
+            records[(kind, path)] = {"data": extractor(path)}
+        except OSError as e:
+            records[(kind, path)] = {"error": str(e)}
+    return records
+
+
+def test_parallel_parse_matches_serial_order_and_records(tmp_path, monkeypatch):
+    tasks = make_tasks(tmp_path, 6)
+    pool = ReportParsePool(max_workers=3)
+
+    def no_serial(*args, **kwargs):
+        raise AssertionError("应使用进程池解析")
+
+    monkeypatch.setattr(pool, "_parse_serial", no_serial)
+    progress = []
+
+    records = pool.parse_all(tasks, progress_callback=lambda kind, path: progress.append((kind, path)))
+
+    assert records == expected_records(tasks)
+    assert list(records) == [(kind, path) for kind, path, _ in tasks]
+    assert sorted(progress) == sorted(records)
+
+
+def test_unavailable_process_pool_falls_back_to_serial(tmp_path, monkeypatch):
+    tasks = make_tasks(tmp_path, 6)
+
+    def unavailable(*args, **kwargs):
+        raise OSError("进程池不可用")
+
+    monkeypatch.setattr(sys.modules[ReportParsePool.__module__], "ProcessPoolExecutor", unavailable)
+    progress = []
+
+    records = ReportParsePool(max_workers=3).parse_all(
+        tasks, progress_callback=lambda kind, path: progress.append((kind, path)))
+
+    assert records == expected_records(tasks)
+    assert progress == list(records)
+
+
+@pytest.mark.parametrize("max_workers, count", [(1, 6), (4, 1)])
+def test_single_worker_or_few_tasks_parse_serially(tmp_path, monkeypatch, max_workers, count):
+    tasks = make_tasks(tmp_path, count)
+    pool = ReportParsePool(max_workers=max_workers)
+
+    def no_parallel(*args, **kwargs):
+        raise AssertionError("应串行解析")
+
+    monkeypatch.setattr(pool, "_parse_parallel", no_parallel)
+
+    assert pool.parse_all(tasks) == expected_records(tasks)
+
+
+def test_get_record_data_uses_records_or_parses_in_place(tmp_path):
+    path = str(tmp_path / "report.html")
+    records = {(KIND_NAME, path): {"data": "cached"}, (KIND_SIZE, path): {"error": "broken"}}
+
+    assert get_record_data(records, KIND_NAME, path, os.path.basename) == "cached"
+    assert get_record_data({}, KIND_NAME, path, os.path.basename) == "report.html"
+    with pytest.raises(ReportParseError):
+        get_record_data(records, KIND_SIZE, path, os.path.getsize)
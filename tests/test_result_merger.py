@@ -0,0 +1,111 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from pages.CheckupReport.OtherReportAnalyzer import OtherReportAnalyzer
+from pages.CheckupReport.ReportIndex import ReportIndex
+from pages.CheckupReport.ResultMerger import (MergedSuiteResult, merge_suite_results, result_group_key,
+                                              result_start_time)
+
+
+def write_result(path, start, fingerprint, modules):
+    """modules: {(模块名, ABI): {TestCase名称: [(用例名, 结果), ...]}}"""
+    parts = [f'<Result start="{start}" suite_name="CTS" suite_plan="cts">',
+             f'<Build build_fingerprint="{fingerprint}" build_version_security_patch="2026-09-05"/>']
+    for (module, abi), testcases in modules.items():
+        parts.append(f'<Module name="{module}" abi="{abi}">')
+        for testcase, tests in testcases.items():
+            parts.append(f'<TestCase name="{testcase}">')
+            parts.extend(f'<Test result="{result}" name="{name}"/>' for name, result in tests)
+            parts.append('</TestCase>')
+        parts.append('</Module>')
+    parts.append('</Result>')
+    path.write_text("".join(parts), encoding="utf-8")
+    return str(path)
+
+
+def write_failures_page(root, attempt, fingerprint, security_patch):
+    """CTS某次执行的test_result_failures_suite.html（只有摘要表）"""
+    rows = {"Suite / Plan": "CTS / cts", "Suite / Build": "14_r1 / 100", "Tests Passed": "10",
+            "Tests Failed": "1", "Modules Done": "1", "Modules Total": "1",
+            "Fingerprint": fingerprint, "Security Patch": security_patch}
+    path = root / "CTS" / "android-cts" / "results" / attempt / "test_result_failures_suite.html"
+    path.parent.mkdir(parents=True)
+    path.write_text("<table>" + "".join(f"<tr><td>{key}</td><td>{value}</td></tr>" for key, value in rows.items())
+                    + "</table>", encoding="utf-8")
+
+
+def test_retry_overrides_earlier_outcome(tmp_path):
+    first = write_result(tmp_path / "first.xml", 100, "fp/1", {
+        ("CtsA", "arm64-v8a"): {"com.a.C": [("t1", "pass"), ("t2", "fail"), ("t3", "fail")]},
+    })
+    retry = write_result(tmp_path / "retry.xml", 200, "fp/2", {
+        ("CtsA", "arm64-v8a"): {"com.a.C": [("t2", "pass"), ("t3", "fail")]},
+    })
+
+    merged = merge_suite_results(("CTS / cts", (first, retry)))
+
+    assert (merged.attempts, merged.tests, merged.passed, merged.failed, merged.recovered) == (2, 3, 2, 1, 1)
+    assert merged.fingerprint == "fp/2"
+    assert merged.security_patch == "2026-09-05"
+
+
+def test_shards_are_combined_and_abis_kept_apart(tmp_path):
+    shard1 = write_result(tmp_path / "shard1.xml", 100, "fp/1", {
+        ("CtsA", "arm64-v8a"): {"com.a.C": [("t1", "pass")]},
+    })
+    shard2 = write_result(tmp_path / "shard2.xml", 100, "fp/1", {
+        ("CtsA", "armeabi-v7a"): {"com.a.C": [("t1", "fail")]},
+        ("CtsB", "arm64-v8a"): {"com.b.C": [("t1", "pass"), ("t2", "IGNORED")]},
+    })
+
+    merged = merge_suite_results(("CTS / cts", (shard1, shard2)))
+
+    assert (merged.tests, merged.passed, merged.failed, merged.other, merged.recovered) == (4, 2, 1, 1, 0)
+
+
+def test_failure_after_pass_is_final(tmp_path):
+    first = write_result(tmp_path / "first.xml", 100, "fp/1", {("CtsA", "x86"): {"C": [("t1", "pass")]}})
+    second = write_result(tmp_path / "second.xml", 200, "fp/1", {("CtsA", "x86"): {"C": [("t1", "fail")]}})
+
+    merged = merge_suite_results(("CTS / cts", (first, second)))
+
+    assert (merged.passed, merged.failed, merged.recovered) == (0, 1, 0)
+
+
+def test_malformed_result_raises_parse_error(tmp_path):
+    broken = tmp_path / "broken.xml"
+    broken.write_text('<Result><Module name="CtsA">', encoding="utf-8")
+
+    with pytest.raises(ET.ParseError):
+        merge_suite_results(("CTS / cts", (str(broken),)))
+
+
+def test_group_key_and_start_time():
+    header = {"Result": {"suite_name": "CTS", "suite_plan": "cts", "start": "1700000000000"}}
+
+    assert result_group_key(header) == "CTS / cts"
+    assert result_start_time(header) == 1700000000000
+    assert result_group_key({"Result": {}}) is None
+    assert result_start_time({"Result": {"start": "n/a"}}) == 0
+
+
+@pytest.mark.parametrize("merged_suites, fingerprints, security_patches", [
+    (None, ["fp/1", "fp/2", "fp/2"], ["2026-08-05", "2026-09-05", "2026-09-05"]),
+    # 合并的套件只按最后一次执行的值参与一致性检查，每个套件一次
+    ({"CTS / cts": MergedSuiteResult("CTS / cts", 3, failed=0, fingerprint="fp/2", security_patch="2026-09-05")},
+     ["fp/2"], ["2026-09-05"]),
+])
+def test_merged_suite_compares_last_attempt_fingerprint_once(tmp_path, merged_suites, fingerprints,
+                                                              security_patches):
+    write_failures_page(tmp_path, "r1", "fp/1", "2026-08-05")
+    write_failures_page(tmp_path, "r2", "fp/2", "2026-09-05")
+    write_failures_page(tmp_path, "r3", "fp/2", "2026-09-05")
+    analyzer = OtherReportAnalyzer()
+
+    analyzer.analyze_other_reports(ReportIndex(str(tmp_path)), [], [], merged_suites=merged_suites)
+
+    assert sorted(analyzer.Fingerprint_comparison) == fingerprints
+    assert sorted(analyzer.Security_Patch_comparison) == security_patches
+    assert len(analyzer.Suite_Plan_comparison) == len(fingerprints)
+    assert len(analyzer.suite_summaries) == 3
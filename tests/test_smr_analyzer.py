@@ -0,0 +1,37 @@
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from pages.SMRComparison.SMR_Analyzer import SMR_Analyzer
+from pages.common.CancellationToken import CancellationToken, AnalysisCancelled
+
+
+def slow_value(value, delay):
+    time.sleep(delay)
+    return value
+
+
+def test_wait_result_returns_slow_future_result():
+    # 超过单次等待间隔（0.1秒）的任务不能被当作超时错误
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(slow_value, "done", 0.35)
+        assert SMR_Analyzer._wait_result(future) == "done"
+
+
+def test_wait_result_reraises_task_exception():
+    future = Future()
+    future.set_exception(ValueError("bad json"))
+    with pytest.raises(ValueError):
+        SMR_Analyzer._wait_result(future)
+
+
+def test_wait_result_stops_when_cancelled():
+    token = CancellationToken()
+    future = Future()
+    threading.Timer(0.2, token.cancel).start()
+    start = time.perf_counter()
+    with token.activate(), pytest.raises(AnalysisCancelled):
+        SMR_Analyzer._wait_result(future)
+    assert time.perf_counter() - start < 2
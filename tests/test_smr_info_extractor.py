@@ -0,0 +1,106 @@
+import re
+import sys
+
+import pytest
+
+from pages.SMRComparison.SMR_InfoExtractor import SMR_InfoExtractor
+
+FINGERPRINT = "google/product/device:14/UP1A.231005.007/10001:user/release-keys"
+STANDARD_PAGE = (
+    '<html><body><table class="summary">'
+    '<tr><td class="rowtitle">Suite / Plan</td><td>CTS / cts</td></tr>'
+    f'<tr><td class="rowtitle">Fingerprint</td><td>{FINGERPRINT}</td></tr>'
+    '<tr><td class="rowtitle">Security Patch</td><td>2026-09-05</td></tr>'
+    '</table>' + '<div>failure details</div>' * 2000 + '</body></html>'
+)
+# 非标准格式：没有rowtitle单元格，只能用宽松写法匹配
+NONSTANDARD_PAGE = (
+    '<html><body><table>'
+    f'<tr><td><b>Build Fingerprint</b></td>\n<td class="value">{FINGERPRINT}</td></tr>'
+    '<tr><td>Security</td><td>Level</td></tr>'
+    '<tr><td>Patch Date</td>\n<td>2026-08-05</td></tr>'
+    '</table></body></html>'
+)
+NO_SUMMARY_PAGE = "<html><body>no summary</body></html>"
+
+
+def legacy_extract(html_files, exact, alternatives):
+    """原实现（逐个读取完整报告，先精确匹配rowtitle行，再依次尝试其他写法）"""
+    for html_file in html_files:
+        with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        match = re.search(exact, content, re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+        for pattern in alternatives:
+            match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
+            if match:
+                return match.group(1).strip()
+    return "未找到"
+
+
+def legacy_fingerprint(extractor, directory):
+    return legacy_extract(extractor._get_sorted_html_files(directory),
+                          r'<td[^>]*class="rowtitle"[^>]*>Fingerprint</td>\s*<td[^>]*>([^<]+)</td>', [
+                              r'Fingerprint.*?</td>\s*<td[^>]*>([^<]+)</td>',
+                              r'<td[^>]*>Fingerprint</td>\s*<td[^>]*>([^<]+)</td>',
+                          ])
+
+
+def legacy_security_patch(extractor, directory):
+    return legacy_extract(extractor._get_sorted_html_files(directory),
+                          r'<td[^>]*class="rowtitle"[^>]*>Security Patch</td>\s*<td[^>]*>([^<]+)</td>', [
+                              r'Security Patch.*?</td>\s*<td[^>]*>([^<]+)</td>',
+                              r'Security.*?Patch.*?</td>\s*<td[^>]*>([^<]+)</td>',
+                              r'<td[^>]*>Security Patch</td>\s*<td[^>]*>([^<]+)</td>',
+                          ])
+
+
+def write_pages(directory, pages):
+    for name, content in pages.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    return str(directory)
+
+
+@pytest.mark.parametrize("pages", [
+    {"results/test_result_failures_suite.html": STANDARD_PAGE, "logs/cts_log.html": NO_SUMMARY_PAGE},
+    {"results/test_result_failures_suite.html": NONSTANDARD_PAGE},
+    # 优先级高的报告没有摘要时使用后面的报告
+    {"results/test_result_failures_suite.html": NO_SUMMARY_PAGE, "gts/report.html": STANDARD_PAGE},
+    {"cts/compatibility_result.html": NONSTANDARD_PAGE, "other/report.html": STANDARD_PAGE},
+    {"other/report.html": NO_SUMMARY_PAGE},
+])
+def test_fingerprint_and_security_patch_match_legacy_extraction(tmp_path, pages):
+    directory = write_pages(tmp_path, pages)
+    extractor = SMR_InfoExtractor()
+
+    assert extractor.extract_fingerprint_from_html(directory) == legacy_fingerprint(extractor, directory)
+    assert extractor.extract_security_patch(directory) == legacy_security_patch(extractor, directory)
+
+
+def test_stops_reading_once_requested_fields_are_found(tmp_path, monkeypatch):
+    directory = write_pages(tmp_path, {
+        "results/test_result_failures_suite.html": STANDARD_PAGE,
+        "gts/report.html": STANDARD_PAGE,
+        "other/report.html": STANDARD_PAGE,
+    })
+    module = sys.modules[SMR_InfoExtractor.__module__]
+    read_files = []
+    original_read_text_prefix = module.read_text_prefix
+
+    def recording_read_text_prefix(path, *args, **kwargs):
+        read_files.append(path)
+        return original_read_text_prefix(path, *args, **kwargs)
+
+    monkeypatch.setattr(module, "read_text_prefix", recording_read_text_prefix)
+    extractor = SMR_InfoExtractor()
+
+    assert extractor.extract_fingerprint_from_html(directory) == FINGERPRINT
+    assert extractor.extract_security_patch(directory) == "2026-09-05"
+    # 只读取第一个报告的开头部分，第二次提取使用缓存
+    assert read_files == [str(tmp_path / "results" / "test_result_failures_suite.html")]
+
+    assert extractor.extract_html_summary(directory, ("Suite / Plan",)) == {"Suite / Plan": "CTS / cts"}
+    assert len(read_files) == 2